@@ -5,35 +5,120 @@ from __future__ import annotations
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.device_registry import async_get as async_get_device_registry
+from homeassistant.helpers.typing import ConfigType
 
 from .ble import RenogyActiveBluetoothCoordinator, RenogyBLEDevice
 from .const import (
+    CONF_ADAPTIVE_SCAN_INTERVAL,
     CONF_DEVICE_TYPE,
+    CONF_EXPORT_FLUSH_INTERVAL,
+    CONF_EXPORT_FORMAT,
+    CONF_EXPORT_RETENTION_DAYS,
+    CONF_HISTORY_DEPTH,
+    CONF_PERSISTENT_SESSION,
+    CONF_PUBLISH_DEADBAND,
+    CONF_PUBLISH_HEARTBEAT,
+    CONF_PUBLISH_MIN_INTERVAL,
     CONF_SCAN_INTERVAL,
+    CONF_SCAN_INTERVAL_MAX,
+    CONF_SCAN_INTERVAL_MIN,
+    CONF_UNAVAILABLE_AFTER_FAILURES,
+    CONF_UNAVAILABLE_AFTER_SECONDS,
+    DATA_CONNECTION_SCHEDULER,
+    DATA_IDENTITY_CACHE,
+    DATA_SERVICE_CACHE,
+    DEFAULT_ADAPTIVE_SCAN_INTERVAL,
     DEFAULT_DEVICE_TYPE,
+    DEFAULT_EXPORT_FLUSH_INTERVAL,
+    DEFAULT_EXPORT_FORMAT,
+    DEFAULT_EXPORT_RETENTION_DAYS,
+    DEFAULT_HISTORY_DEPTH,
+    DEFAULT_PERSISTENT_SESSION,
+    DEFAULT_PUBLISH_DEADBAND,
+    DEFAULT_PUBLISH_HEARTBEAT,
+    DEFAULT_PUBLISH_MIN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    DEFAULT_SCAN_INTERVAL_MIN,
+    DEFAULT_UNAVAILABLE_AFTER_FAILURES,
+    DEFAULT_UNAVAILABLE_AFTER_SECONDS,
     DOMAIN,
+    EXPORT_FORMAT_OFF,
     LOGGER,
 )
+from .export import RenogyExportSink
+from .identity import RenogyIdentityCache
+from .publishing import RenogyPublishSettings
+from .scheduler import RenogyConnectionScheduler
+from .service_cache import RenogyGattServiceCache
+from .services import async_setup_services
+from .settings import async_get_settings
+from .snapshot import RenogyDataSnapshot
 
 # List of platforms this integration supports
 PLATFORMS = [Platform.SENSOR, Platform.NUMBER, Platform.SELECT, Platform.SWITCH]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Renogy BLE services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Renogy BLE from a config entry."""
     LOGGER.info("Setting up Renogy BLE integration with entry %s", entry.entry_id)
 
-    # Get configuration from entry
-    scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    # Get configuration from entry, options take precedence over the values
+    # chosen when the device was added
+    config = {**entry.data, **entry.options}
+    scan_interval = config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     device_address = entry.data.get(CONF_ADDRESS)
     device_type = entry.data.get(CONF_DEVICE_TYPE, DEFAULT_DEVICE_TYPE)
+    persistent_session = config.get(CONF_PERSISTENT_SESSION, DEFAULT_PERSISTENT_SESSION)
+    adaptive_scan_interval = config.get(
+        CONF_ADAPTIVE_SCAN_INTERVAL, DEFAULT_ADAPTIVE_SCAN_INTERVAL
+    )
+    scan_interval_min = config.get(CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN)
+    scan_interval_max = config.get(CONF_SCAN_INTERVAL_MAX, DEFAULT_SCAN_INTERVAL_MAX)
+    unavailable_after_failures = config.get(
+        CONF_UNAVAILABLE_AFTER_FAILURES, DEFAULT_UNAVAILABLE_AFTER_FAILURES
+    )
+    unavailable_after_seconds = config.get(
+        CONF_UNAVAILABLE_AFTER_SECONDS, DEFAULT_UNAVAILABLE_AFTER_SECONDS
+    )
+    publish_settings = RenogyPublishSettings(
+        deadband=config.get(CONF_PUBLISH_DEADBAND, DEFAULT_PUBLISH_DEADBAND),
+        min_interval=config.get(
+            CONF_PUBLISH_MIN_INTERVAL, DEFAULT_PUBLISH_MIN_INTERVAL
+        ),
+        heartbeat=config.get(CONF_PUBLISH_HEARTBEAT, DEFAULT_PUBLISH_HEARTBEAT),
+    )
+    history_depth = config.get(CONF_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH)
+    export_format = config.get(CONF_EXPORT_FORMAT, DEFAULT_EXPORT_FORMAT)
 
     if not device_address:
         LOGGER.error("No device address provided in config entry")
         return False
 
+    export_sink = None
+    if export_format != EXPORT_FORMAT_OFF:
+        export_sink = RenogyExportSink(
+            hass,
+            device_address,
+            export_format,
+            flush_interval=config.get(
+                CONF_EXPORT_FLUSH_INTERVAL, DEFAULT_EXPORT_FLUSH_INTERVAL
+            ),
+            retention_days=config.get(
+                CONF_EXPORT_RETENTION_DAYS, DEFAULT_EXPORT_RETENTION_DAYS
+            ),
+        )
+
     LOGGER.info(
         "Configuring Renogy BLE device %s as %s with scan interval %ss",
         device_address,
@@ -41,6 +126,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         scan_interval,
     )
 
+    # All entries share one scheduler that arbitrates adapter connection
+    # slots, limited by the integration-wide connection setting
+    settings = await async_get_settings(hass)
+    scheduler = hass.data[DOMAIN].get(DATA_CONNECTION_SCHEDULER)
+    if scheduler is None:
+        scheduler = RenogyConnectionScheduler(settings.max_connections)
+        hass.data[DOMAIN][DATA_CONNECTION_SCHEDULER] = scheduler
+
+    # Resolved GATT services are shared too, and persisted across restarts.
+    # The library client connects on its own and cannot reuse them, so only
+    # entries with a persistent session load the cache.
+    service_cache: RenogyGattServiceCache | None = None
+    if persistent_session:
+        service_cache = hass.data[DOMAIN].get(DATA_SERVICE_CACHE)
+        if service_cache is None:
+            service_cache = RenogyGattServiceCache(hass)
+            hass.data[DOMAIN][DATA_SERVICE_CACHE] = service_cache
+        await service_cache.async_load()
+
+    # So are the device identities, to name entities without waiting for them
+    identity_cache = hass.data[DOMAIN].get(DATA_IDENTITY_CACHE)
+    if identity_cache is None:
+        identity_cache = RenogyIdentityCache(hass)
+        hass.data[DOMAIN][DATA_IDENTITY_CACHE] = identity_cache
+    await identity_cache.async_load()
+
+    # The last data of the previous run, shown until the first poll lands
+    data_snapshot = RenogyDataSnapshot(hass, entry.entry_id)
+    restored = await data_snapshot.async_load()
+
     # Create a coordinator for this entry
     coordinator = RenogyActiveBluetoothCoordinator(
         hass=hass,
@@ -49,10 +164,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         scan_interval=scan_interval,
         device_type=device_type,
         device_data_callback=lambda device: _handle_device_update(hass, entry, device),
+        persistent_session=persistent_session,
+        connection_scheduler=scheduler,
+        service_cache=service_cache,
+        identity_cache=identity_cache,
+        adaptive_scan_interval=adaptive_scan_interval,
+        scan_interval_min=scan_interval_min,
+        scan_interval_max=scan_interval_max,
+        unavailable_after_failures=unavailable_after_failures,
+        unavailable_after_seconds=unavailable_after_seconds,
+        data_snapshot=data_snapshot,
+        publish_settings=publish_settings,
+        history_depth=history_depth,
+        export_sink=export_sink,
     )
+    if restored is not None:
+        coordinator.async_restore_data(*restored)
+    if coordinator.async_restore_identity():
+        LOGGER.debug("Using cached identity for %s", device_address)
 
     # Store coordinator and devices in hass.data
-    hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "devices": [],  # Will be populated as devices are discovered
@@ -63,6 +194,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     LOGGER.info("Setting up sensor platform for Renogy BLE device %s", device_address)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Changed options take effect by setting the entry up again
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     # Start the coordinator after all platforms are set up
     # This ensures all entities have had a chance to subscribe to the coordinator
     LOGGER.info("Starting coordinator for Renogy BLE device %s", device_address)
@@ -72,13 +206,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except Exception as e:
         LOGGER.error("Error starting coordinator for %s: %s", device_address, e)
 
-    # Force an immediate refresh
-    LOGGER.info("Requesting initial refresh for Renogy BLE device %s", device_address)
-    hass.async_create_task(coordinator.async_request_refresh())
-
+    # The initial refresh is started by the coordinator (or by a platform that
+    # waited for the device) and shared by everyone, so don't request another
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def _handle_device_update(
     hass: HomeAssistant, entry: ConfigEntry, device: RenogyBLEDevice
 ) -> None:
@@ -155,3 +292,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the persisted data of a removed config entry."""
+    await RenogyDataSnapshot(hass, entry.entry_id).async_remove()
+    identity_cache = hass.data.get(DOMAIN, {}).get(DATA_IDENTITY_CACHE)
+    address = entry.data.get(CONF_ADDRESS)
+    if identity_cache is not None and address:
+        identity_cache.async_remove(address)
@@ -4,13 +4,23 @@ import asyncio
 import importlib
 import logging
 import traceback
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from types import ModuleType
-from typing import Any, Awaitable, Callable, Optional, cast
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Mapping,
+    Optional,
+    cast,
+)
 
 from bleak import BleakError
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth import (
+    BluetoothCallbackMatcher,
     BluetoothChange,
     BluetoothScanningMode,
     BluetoothServiceInfoBleak,
@@ -38,13 +48,105 @@ else:
     create_modbus_write_request = None
     HAS_WRITE_SUPPORT = False
 
-from .const import DEFAULT_DEVICE_TYPE, DEFAULT_SCAN_INTERVAL
+# The register map lets us tell which parsed keys come from which command.
+try:
+    renogy_register_map: ModuleType | None = importlib.import_module(
+        "renogy_ble.register_map"
+    )
+except ImportError:
+    renogy_register_map = None
+
+from .const import (
+    DEFAULT_ADAPTIVE_SCAN_INTERVAL,
+    DEFAULT_CONNECTION_SOURCE,
+    DEFAULT_DEVICE_TYPE,
+    DEFAULT_HISTORY_DEPTH,
+    DEFAULT_PERSISTENT_SESSION,
+    DEFAULT_READY_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    DEFAULT_SCAN_INTERVAL_MIN,
+    DEFAULT_SESSION_IDLE_TIMEOUT,
+    DEFAULT_SETTINGS_REFRESH_POLLS,
+    DEFAULT_UNAVAILABLE_AFTER_FAILURES,
+    DEFAULT_UNAVAILABLE_AFTER_SECONDS,
+    DEFAULT_WRITE_BATCH_WINDOW,
+    POLL_TIER_DYNAMIC,
+    POLL_TIER_SETTINGS,
+    POLL_TIER_STATIC,
+)
+from .export import RenogyExportSink
+from .history import RenogySampleHistory
+from .identity import FIRMWARE_KEYS, RenogyIdentityCache
+from .interval import RenogyAdaptiveInterval
+from .plans import RenogyValuePlans
+from .presence import RenogyPresenceTracker
+from .publishing import RenogyPublishSettings
+from .records import RenogyDataRecord, RenogyFieldIndex
+from .scheduler import (
+    OPERATION_POLL,
+    OPERATION_WRITE,
+    RenogyConnectionScheduler,
+    RenogyOperationQueue,
+)
+from .service_cache import RenogyGattServiceCache
+from .session import RenogyBleSession
+from .snapshot import RenogyDataSnapshot
+from .timing import (
+    PHASE_FAN_OUT,
+    PHASE_READ,
+    PHASE_SLOT_WAIT,
+    PHASE_TOTAL,
+    RenogyPollTimings,
+)
 
 LOAD_CONTROL_REGISTER = getattr(renogy_ble_module, "LOAD_CONTROL_REGISTER", 0x010A)
 
+# Register ranges used to sort read commands into polling tiers
+DYNAMIC_REGISTER_START = 0x0100
+SETTINGS_REGISTER_START = 0xE000
+STATIC_COMMAND_NAMES = ("device_info", "device_id")
+
+ModbusCommands = dict[str, tuple[int, int, int]]
+
+
+def _listener_keys(context: Any) -> Optional[frozenset[str]]:
+    """Return the data keys a listener subscribed to, or None for all keys."""
+    if context is None:
+        return None
+    if isinstance(context, str):
+        return frozenset((context,))
+    try:
+        return frozenset(context)
+    except TypeError:
+        return None
+
+
+def contiguous_register_runs(
+    writes: dict[int, int],
+) -> list[tuple[int, list[int]]]:
+    """Group register writes into runs of consecutive registers."""
+    runs: list[tuple[int, list[int]]] = []
+    for register in sorted(writes):
+        if runs and runs[-1][0] + len(runs[-1][1]) == register:
+            runs[-1][1].append(writes[register])
+        else:
+            runs.append((register, [writes[register]]))
+    return runs
+
+
+def command_tier(name: str, command: tuple[int, int, int]) -> str:
+    """Return the polling tier of a Modbus read command."""
+    register = command[1]
+    if name in STATIC_COMMAND_NAMES or register < DYNAMIC_REGISTER_START:
+        return POLL_TIER_STATIC
+    if register >= SETTINGS_REGISTER_START:
+        return POLL_TIER_SETTINGS
+    return POLL_TIER_DYNAMIC
+
 
 class RenogyActiveBluetoothCoordinator(
-    ActiveBluetoothDataUpdateCoordinator[dict[str, Any]]
+    ActiveBluetoothDataUpdateCoordinator[Mapping[str, Any]]
 ):
     """Class to manage fetching Renogy BLE data via active connections."""
 
@@ -57,6 +159,20 @@ class RenogyActiveBluetoothCoordinator(
         scan_interval: int = DEFAULT_SCAN_INTERVAL,
         device_type: str = DEFAULT_DEVICE_TYPE,
         device_data_callback: Optional[Callable[[RenogyBLEDevice], None]] = None,
+        persistent_session: bool = DEFAULT_PERSISTENT_SESSION,
+        connection_scheduler: Optional[RenogyConnectionScheduler] = None,
+        settings_refresh_polls: int = DEFAULT_SETTINGS_REFRESH_POLLS,
+        service_cache: Optional[RenogyGattServiceCache] = None,
+        identity_cache: Optional[RenogyIdentityCache] = None,
+        adaptive_scan_interval: bool = DEFAULT_ADAPTIVE_SCAN_INTERVAL,
+        scan_interval_min: int = DEFAULT_SCAN_INTERVAL_MIN,
+        scan_interval_max: int = DEFAULT_SCAN_INTERVAL_MAX,
+        unavailable_after_failures: int = DEFAULT_UNAVAILABLE_AFTER_FAILURES,
+        unavailable_after_seconds: int = DEFAULT_UNAVAILABLE_AFTER_SECONDS,
+        data_snapshot: Optional[RenogyDataSnapshot] = None,
+        publish_settings: Optional[RenogyPublishSettings] = None,
+        history_depth: int = DEFAULT_HISTORY_DEPTH,
+        export_sink: Optional[RenogyExportSink] = None,
     ):
         """Initialize the coordinator."""
         super().__init__(
@@ -73,26 +189,125 @@ class RenogyActiveBluetoothCoordinator(
         self.device_type = device_type
         self.last_poll_time: Optional[datetime] = None
         self.device_data_callback = device_data_callback
+        self.persistent_session = persistent_session
+        self.connection_scheduler = connection_scheduler
+        self.service_cache = service_cache
+        self.identity_cache = identity_cache
+        self.connection_source: Optional[str] = None
+        self.last_connection_wait: Optional[float] = None
+        # Number of sensor state writes skipped because nothing changed
+        self.suppressed_state_writes = 0
+        # Rolling per-phase durations of the polls of this device
+        self.poll_timings = RenogyPollTimings()
+        # When the device was last heard advertising, to skip polls while it
+        # is out of range
+        self.presence = RenogyPresenceTracker()
+        self._unsub_presence: Optional[Callable[[], None]] = None
+        # In adaptive mode the scan interval follows how busy the device is
+        self.adaptive_interval: Optional[RenogyAdaptiveInterval] = None
+        if adaptive_scan_interval:
+            self.adaptive_interval = RenogyAdaptiveInterval(
+                scan_interval, scan_interval_min, scan_interval_max
+            )
+            self.scan_interval = self.adaptive_interval.interval
         self.logger.debug(
-            "Initialized coordinator for %s as %s with %ss interval",
+            "Initialized coordinator for %s as %s with %ss interval%s",
             address,
             device_type,
             scan_interval,
+            " (persistent session)" if persistent_session else "",
         )
 
-        self._ble_client = RenogyBleClient(scanner=bluetooth.async_get_scanner(hass))
+        # Tiered polling: the client reads whichever commands we leave in
+        # _poll_commands, so each poll only transfers the tiers that are due.
+        self.settings_refresh_polls = settings_refresh_polls
+        all_commands = getattr(renogy_ble_module, "COMMANDS", {})
+        self._device_commands: ModbusCommands = dict(all_commands.get(device_type, {}))
+        self._poll_commands: dict[str, ModbusCommands] = (
+            {device_type: dict(self._device_commands)} if self._device_commands else {}
+        )
+        self._field_tier_map: Optional[dict[str, str]] = None
+        self._loaded_tiers: set[str] = set()
+        self._polls_since_settings = 0
+        self._settings_stale = True
+
+        # A persistent session keeps one connection open for polls and writes
+        # and reuses the GATT services resolved on earlier connects, otherwise
+        # the library client connects and disconnects for every operation.
+        scanner = bluetooth.async_get_scanner(hass)
+        self._session: Optional[RenogyBleSession] = None
+        self._ble_client: RenogyBleClient | RenogyBleSession
+        if persistent_session:
+            self._session = RenogyBleSession(
+                hass,
+                logger,
+                scanner=scanner,
+                idle_timeout=DEFAULT_SESSION_IDLE_TIMEOUT,
+                commands=self._poll_commands,
+                service_cache=service_cache,
+                on_close=self._async_handle_session_closed,
+            )
+            self._ble_client = self._session
+        else:
+            self._ble_client = RenogyBleClient(
+                scanner=scanner, commands=self._poll_commands
+            )
+        # Adapter whose slot the open persistent connection holds, if any
+        self._held_slot_source: Optional[str] = None
+        self._slot_in_use = False
 
         # Add required properties for Home Assistant CoordinatorEntity compatibility
         self.last_update_success = True
-        self._update_listeners: list[Callable[[], None]] = []
-        self.update_interval = timedelta(seconds=scan_interval)
+        # Failed polls keep the last data available until either limit is hit,
+        # meanwhile the data is only reported as stale
+        self.unavailable_after_failures = max(1, unavailable_after_failures)
+        self.unavailable_after_seconds = unavailable_after_seconds
+        self.consecutive_failures = 0
+        self.failing_since: Optional[datetime] = None
+        # Data restored from the last run is shown until a live poll lands
+        self.data_snapshot = data_snapshot
+        # When the sensors of the device write their states
+        self.publish_settings = publish_settings or RenogyPublishSettings()
+        # The last polled samples, kept in memory for troubleshooting
+        self.history: Optional[RenogySampleHistory] = (
+            RenogySampleHistory(history_depth) if history_depth > 0 else None
+        )
+        # Optional export of every polled sample to files
+        self.export_sink = export_sink
+        self.restored_at: Optional[datetime] = None
+        # Listeners map to the data keys they read (None means every update),
+        # and _key_listeners indexes them by key for changed-key dispatch.
+        self._update_listeners: dict[Callable[[], None], Optional[frozenset[str]]] = {}
+        self._key_listeners: dict[str, list[Callable[[], None]]] = {}
+        self._notified_data: Mapping[str, Any] = {}
+        # Value plans of the sensors, evaluated once per data change
+        self.value_plans = RenogyValuePlans()
+        # Positions of the data fields in the records of this device
+        self._field_index: Optional[RenogyFieldIndex] = None
+        self._notified_availability: Optional[tuple[bool, bool]] = None
+        self.update_interval = timedelta(seconds=self.scan_interval)
         self._unsub_refresh = None
-        self._request_refresh_task = None
+        # In-flight refresh and poll, joined by concurrent callers
+        self._request_refresh_task: Optional[asyncio.Task[bool]] = None
+        self._poll_task: Optional[asyncio.Task[Mapping[str, Any]]] = None
 
-        # Add connection lock to prevent multiple concurrent connections
-        self._connection_lock = asyncio.Lock()
+        # Polls and writes take turns through the operation queue, writes first,
+        # so only one transaction talks to the device at a time
+        self.operation_queue = RenogyOperationQueue()
         self._connection_in_progress = False
 
+        # Register writes waiting for the batch window to close, and the future
+        # their callers wait on for the per-register results
+        self.write_batch_window = DEFAULT_WRITE_BATCH_WINDOW
+        self._pending_writes: dict[int, int] = {}
+        self._write_batch: Optional[asyncio.Future[dict[int, bool]]] = None
+        self._write_flush_task: Optional[asyncio.Task[None]] = None
+
+        # Set once the first refresh attempt finished, so platforms can wait
+        # for the device identity instead of sleeping
+        self._ready_event = asyncio.Event()
+        self._initial_refresh_task: Optional[asyncio.Task[None]] = None
+
     @property
     def device_type(self) -> str:
         """Get the device type from configuration."""
@@ -103,17 +318,58 @@ class RenogyActiveBluetoothCoordinator(
         """Set the device type."""
         self._device_type = value
 
-    async def async_request_refresh(self) -> None:
-        """Request a refresh."""
-        self.logger.debug("Manual refresh requested for device %s", self.address)
+    @property
+    def is_ready(self) -> bool:
+        """Return True once the first refresh attempt has finished."""
+        return self._ready_event.is_set()
 
-        # If a connection is already in progress, don't start another one
-        if self._connection_in_progress:
+    @callback
+    def async_request_initial_refresh(self) -> None:
+        """Start the initial refresh shared by all platforms, only once."""
+        if self._initial_refresh_task is None and not self.is_ready:
+            self._initial_refresh_task = self.hass.async_create_task(
+                self.async_request_refresh()
+            )
+
+    async def async_wait_ready(self, timeout: float = DEFAULT_READY_TIMEOUT) -> bool:
+        """Wait until the first refresh attempt finished or ``timeout`` passed.
+
+        The shared initial refresh is started if nothing requested it yet.
+        Returns True if the coordinator became ready in time.
+        """
+        if self.is_ready:
+            return True
+        self.async_request_initial_refresh()
+        try:
+            await asyncio.wait_for(self._ready_event.wait(), timeout)
+        except asyncio.TimeoutError:
             self.logger.debug(
-                "Connection already in progress, skipping refresh request"
+                "Device %s not ready after %ss, continuing", self.address, timeout
             )
-            return
+            return False
+        return True
 
+    async def async_request_refresh(self) -> bool:
+        """Request a refresh and return whether it succeeded.
+
+        Callers that arrive while a refresh is in flight join it and get its
+        result instead of starting another connection.
+        """
+        task = self._request_refresh_task
+        if task is None or task.done():
+            self.logger.debug("Manual refresh requested for device %s", self.address)
+            task = asyncio.get_running_loop().create_task(self._async_refresh())
+            self._request_refresh_task = task
+        else:
+            self.logger.debug("Joining in-flight refresh for device %s", self.address)
+
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._ready_event.set()
+
+    async def _async_refresh(self) -> bool:
+        """Poll the device using its last known service info."""
         # Get the last available service info for this device
         service_info = bluetooth.async_last_service_info(self.hass, self.address)
         if not service_info:
@@ -122,14 +378,14 @@ class RenogyActiveBluetoothCoordinator(
                 "range and powered on.",
                 self.address,
             )
-            self.last_update_success = False
-            return
+            self._async_record_result(False)
+            return False
 
         try:
             await self._async_poll_device(service_info)
-            self.async_update_listeners()
+            self._async_handle_bluetooth_poll()
         except Exception as err:
-            self.last_update_success = False
+            self._async_record_result(False)
             error_traceback = traceback.format_exc()
             self.logger.debug(
                 "Error refreshing device %s: %s\n%s",
@@ -139,26 +395,176 @@ class RenogyActiveBluetoothCoordinator(
             )
             if self.device:
                 self.device.update_availability(False, err)
+        return self.last_update_success
+
+    @callback
+    def _async_handle_bluetooth_poll(self) -> None:
+        """Publish the result of a poll, however it was started.
+
+        The base coordinator calls this after polls it starts itself, where it
+        would otherwise notify every listener.
+        """
+        with self.poll_timings.measure(PHASE_FAN_OUT):
+            self._async_notify_data_changes()
+        self._async_adapt_scan_interval()
+
+    @property
+    def is_restored(self) -> bool:
+        """Return True while the data is the snapshot of the last run."""
+        return self.restored_at is not None
+
+    @property
+    def is_stale(self) -> bool:
+        """Return True if the data is outdated, restored or after failures."""
+        return self.consecutive_failures > 0 or self.is_restored
+
+    @callback
+    def async_restore_data(self, data: Mapping[str, Any], polled_at: datetime) -> None:
+        """Seed the coordinator with the data of the last run."""
+        if isinstance(getattr(self, "data", None), Mapping) and self.data:
+            # A poll already delivered live data
+            return
+        self.data = self._data_record(data)
+        self.restored_at = polled_at
+        self.logger.debug(
+            "Restored %s values of %s polled at %s",
+            len(data),
+            self.address,
+            polled_at.isoformat(),
+        )
+
+    @callback
+    def _async_record_result(self, success: bool) -> None:
+        """Update availability from a poll or write, riding out short glitches.
+
+        The device only becomes unavailable after ``unavailable_after_failures``
+        failed polls in a row or ``unavailable_after_seconds`` of failures,
+        whichever comes first.
+        """
+        if success:
+            if self.consecutive_failures:
+                self.logger.debug(
+                    "Device %s recovered after %s failed polls",
+                    self.address,
+                    self.consecutive_failures,
+                )
+            self.consecutive_failures = 0
+            self.failing_since = None
+            self.last_update_success = True
+            return
+
+        now = datetime.now()
+        self.consecutive_failures += 1
+        if self.failing_since is None:
+            self.failing_since = now
+        failing_for = (now - self.failing_since).total_seconds()
+        available = (
+            self.consecutive_failures < self.unavailable_after_failures
+            and failing_for < self.unavailable_after_seconds
+        )
+        if available:
+            self.logger.debug(
+                "Keeping stale data of %s available after %s failed polls",
+                self.address,
+                self.consecutive_failures,
+            )
+        self.last_update_success = available
+
+    @callback
+    def _async_adapt_scan_interval(self) -> None:
+        """Move the scan interval after a successful poll in adaptive mode."""
+        if self.adaptive_interval is None or self.is_stale:
+            return
+        if not isinstance(self.data, Mapping):
+            return
+        interval = self.adaptive_interval.async_update(self.data)
+        if interval == self.scan_interval:
+            return
+        self.logger.debug(
+            "Adapting scan interval of %s from %ss to %ss",
+            self.address,
+            self.scan_interval,
+            interval,
+        )
+        self.scan_interval = interval
+        self.update_interval = timedelta(seconds=interval)
+        if self._unsub_refresh:
+            self._schedule_refresh()
 
     def async_add_listener(
         self, update_callback: Callable[[], None], context: Any = None
     ) -> Callable[[], None]:
-        """Listen for data updates."""
+        """Listen for data updates.
+
+        ``context`` may be a data key or an iterable of data keys. The callback
+        is then only called when one of those keys changes, or when the
+        availability of the device changes. Without a context the callback is
+        called on every update.
+        """
         if update_callback not in self._update_listeners:
-            self._update_listeners.append(update_callback)
+            keys = _listener_keys(context)
+            self._update_listeners[update_callback] = keys
+            for key in keys or ():
+                self._key_listeners.setdefault(key, []).append(update_callback)
 
         def remove_listener() -> None:
             """Remove update callback."""
-            if update_callback in self._update_listeners:
-                self._update_listeners.remove(update_callback)
+            keys = self._update_listeners.pop(update_callback, None)
+            for key in keys or ():
+                key_listeners = self._key_listeners.get(key)
+                if key_listeners and update_callback in key_listeners:
+                    key_listeners.remove(update_callback)
+                    if not key_listeners:
+                        del self._key_listeners[key]
 
         return remove_listener
 
-    def async_update_listeners(self) -> None:
-        """Update all registered listeners."""
-        for update_callback in self._update_listeners:
+    def async_update_listeners(self, changed_keys: Iterable[str] | None = None) -> None:
+        """Update registered listeners.
+
+        Without ``changed_keys`` every listener is called. Otherwise only the
+        listeners subscribed to one of the changed keys are called, plus the
+        listeners that did not subscribe to specific keys.
+        """
+        if changed_keys is None:
+            for update_callback in list(self._update_listeners):
+                update_callback()
+            return
+
+        callbacks = dict.fromkeys(
+            update_callback
+            for update_callback, keys in self._update_listeners.items()
+            if keys is None
+        )
+        for key in changed_keys:
+            callbacks.update(dict.fromkeys(self._key_listeners.get(key, ())))
+        for update_callback in callbacks:
             update_callback()
 
+    @callback
+    def _async_notify_data_changes(self) -> None:
+        """Notify listeners of the keys that changed since the last update."""
+        data = self._data_record(self.data if isinstance(self.data, Mapping) else {})
+        changed_keys = data.changed_keys(self._notified_data)
+        # Records are immutable, so the baseline needs no copy
+        self._notified_data = data
+        self.value_plans.evaluate(data, changed_keys)
+
+        # Availability affects every entity, so it is not diffed by key
+        device_available = bool(getattr(self.device, "is_available", True))
+        availability = (bool(self.last_update_success), device_available)
+        if availability != self._notified_availability:
+            self._notified_availability = availability
+            self.async_update_listeners()
+            return
+
+        self.logger.debug(
+            "Notifying listeners of %s changed keys for %s",
+            len(changed_keys),
+            self.address,
+        )
+        self.async_update_listeners(changed_keys)
+
     def _schedule_refresh(self) -> None:
         """Schedule a refresh with the update interval."""
         if self._unsub_refresh:
@@ -173,6 +579,16 @@ class RenogyActiveBluetoothCoordinator(
 
     async def _handle_refresh_interval(self, _now=None):
         """Handle a refresh interval occurring."""
+        if not self.presence.is_present:
+            # Out of range, wait for an advertisement instead of a connect
+            # timeout
+            self.presence.skipped_polls += 1
+            self.logger.debug(
+                "Skipping interval refresh for %s, not heard for over %ss",
+                self.address,
+                self.presence.window,
+            )
+            return
         self.logger.debug("Regular interval refresh for %s", self.address)
         await self.async_request_refresh()
 
@@ -192,11 +608,25 @@ class RenogyActiveBluetoothCoordinator(
         # which already handles the bluetooth subscriptions
         result = super().async_start()
 
+        # Also listen to passive scanners, any advertisement proves presence.
+        # This matcher gets connectable advertisements too, so it is the only
+        # place that records them.
+        self._unsub_presence = bluetooth.async_register_callback(
+            self.hass,
+            self._async_handle_advertisement,
+            BluetoothCallbackMatcher(address=self.address, connectable=False),
+            BluetoothScanningMode.PASSIVE,
+        )
+
         # Schedule regular refreshes at our configured interval
         self._schedule_refresh()
 
-        # Perform an initial refresh to get data as soon as possible
-        self.hass.async_create_task(self.async_request_refresh())
+        if self.export_sink is not None:
+            self.export_sink.async_start()
+
+        # Perform an initial refresh to get data as soon as possible, unless a
+        # platform already started it while waiting for the device
+        self.async_request_initial_refresh()
 
         return result
 
@@ -213,14 +643,201 @@ class RenogyActiveBluetoothCoordinator(
             self._unsub_refresh = None
 
         self._async_cancel_bluetooth_subscription()
+        if self._unsub_presence:
+            self._unsub_presence()
+            self._unsub_presence = None
+
+        # The sensors are gone with the entry, and so are their value plans
+        self.value_plans.clear()
+
+        # Writes still waiting for their batch window fail instead of running
+        # after the entry is gone
+        if self._write_flush_task is not None:
+            self._write_flush_task.cancel()
+            self._write_flush_task = None
+        if self._write_batch is not None:
+            # The flush may not have started yet, fail its writes here
+            self._write_batch.set_result({})
+            self._write_batch = None
+            self._pending_writes = {}
+
+        # Close the persistent connection if we hold one
+        if self._session is not None:
+            self.hass.async_create_task(self._session.async_close())
+
+        # Write the samples the export sink still holds
+        if self.export_sink is not None:
+            self.hass.async_create_task(self.export_sink.async_stop())
 
         # Clean up any other resources that might need to be released
-        self._update_listeners = []
+        self._update_listeners = {}
+        self._key_listeners = {}
+
+    def _select_poll_tiers(self) -> set[str]:
+        """Return the register tiers that are due on this poll."""
+        tiers = {POLL_TIER_DYNAMIC}
+        if POLL_TIER_STATIC not in self._loaded_tiers:
+            tiers.add(POLL_TIER_STATIC)
+        if (
+            self._settings_stale
+            or POLL_TIER_SETTINGS not in self._loaded_tiers
+            or self._polls_since_settings >= self.settings_refresh_polls
+        ):
+            tiers.add(POLL_TIER_SETTINGS)
+        return tiers
+
+    def _prepare_poll_commands(self, tiers: set[str]) -> None:
+        """Limit the client's command set to the given tiers."""
+        if not self._device_commands:
+            return
+        commands = {
+            name: command
+            for name, command in self._device_commands.items()
+            if command_tier(name, command) in tiers
+        }
+        self._poll_commands[self.device_type] = commands or dict(self._device_commands)
+
+    def _field_tiers(self) -> dict[str, str]:
+        """Map parsed data keys to the tier of the command they come from."""
+        if self._field_tier_map is None:
+            self._field_tier_map = {}
+            fields = {}
+            if renogy_register_map is not None:
+                register_map = getattr(renogy_register_map, "REGISTER_MAP", {})
+                fields = register_map.get(self.device_type, {})
+            start_tiers = {
+                command[1]: command_tier(name, command)
+                for name, command in self._device_commands.items()
+            }
+            for key, info in fields.items():
+                tier = start_tiers.get(info.get("register"))
+                if tier is not None:
+                    self._field_tier_map[key] = tier
+        return self._field_tier_map
+
+    def _data_record(self, data: Mapping[str, Any]) -> RenogyDataRecord:
+        """Return ``data`` as a record laid out by the device type's fields."""
+        if self._field_index is None:
+            fields: Iterable[str] = ()
+            if renogy_register_map is not None:
+                register_map = getattr(renogy_register_map, "REGISTER_MAP", {})
+                fields = register_map.get(self.device_type, {})
+            self._field_index = RenogyFieldIndex(self.device_type, fields)
+        return RenogyDataRecord.from_mapping(self._field_index, data)
+
+    def _merge_cached_tiers(
+        self,
+        device: RenogyBLEDevice,
+        tiers: set[str],
+        previous: Mapping[str, Any],
+    ) -> None:
+        """Carry over values from tiers that were not read on this poll."""
+        field_tiers = self._field_tiers()
+        skipped_any = len(tiers) < 3
+        for key, value in previous.items():
+            if key in device.parsed_data:
+                continue
+            tier = field_tiers.get(key)
+            if (tier is not None and tier not in tiers) or (
+                tier is None and skipped_any
+            ):
+                device.parsed_data[key] = value
+
+        for tier in tiers:
+            tier_keys = [key for key, value in field_tiers.items() if value == tier]
+            if not tier_keys or any(key in device.parsed_data for key in tier_keys):
+                self._loaded_tiers.add(tier)
+
+        if POLL_TIER_SETTINGS in tiers and POLL_TIER_SETTINGS in self._loaded_tiers:
+            self._polls_since_settings = 0
+            self._settings_stale = False
+        else:
+            self._polls_since_settings += 1
+
+    @asynccontextmanager
+    async def _async_connection_slot(self) -> AsyncIterator[None]:
+        """Hold a connection slot on the device's adapter, if scheduled.
+
+        With a persistent session the slot stays held for as long as the
+        connection is open, so it counts against the adapter's limit.
+        """
+        scheduler = self.connection_scheduler
+        if scheduler is None:
+            yield
+            return
+
+        source = self.connection_source or DEFAULT_CONNECTION_SOURCE
+        session = self._session
+        if session is None:
+            async with scheduler.async_slot(source, self.address) as wait_time:
+                self._async_record_slot_wait(source, wait_time)
+                yield
+            return
+
+        if self._held_slot_source not in (None, source):
+            # The device moved to another adapter, leave the old one
+            await session.async_close()
+            self._async_release_slot()
+        if self._held_slot_source is None:
+            wait_time = await scheduler.async_acquire(source, self.address)
+            self._held_slot_source = source
+        else:
+            wait_time = 0.0
+            scheduler.async_set_busy(source, self.address)
+        self._slot_in_use = True
+        self._async_record_slot_wait(source, wait_time)
+        try:
+            yield
+        finally:
+            self._slot_in_use = False
+            if session.is_connected:
+                scheduler.async_set_idle(
+                    source, self.address, self._async_close_idle_session
+                )
+            else:
+                self._async_release_slot()
+
+    @callback
+    def _async_record_slot_wait(self, source: str, wait_time: float) -> None:
+        """Record how long the device waited for its connection slot."""
+        self.last_connection_wait = wait_time
+        self.poll_timings.record(PHASE_SLOT_WAIT, wait_time)
+        self.logger.debug(
+            "Got connection slot on %s for %s after %.2fs",
+            source,
+            self.address,
+            wait_time,
+        )
+
+    @callback
+    def _async_release_slot(self) -> None:
+        """Release the slot held for the persistent connection."""
+        source = self._held_slot_source
+        if source is None or self.connection_scheduler is None:
+            return
+        self._held_slot_source = None
+        self.connection_scheduler.async_release(source, self.address)
+
+    @callback
+    def _async_handle_session_closed(self) -> None:
+        """Release the held slot once the persistent connection closed."""
+        if not self._slot_in_use:
+            self._async_release_slot()
+
+    @callback
+    def _async_close_idle_session(self) -> None:
+        """Close the idle persistent connection for a device waiting for a slot."""
+        if self._session is not None:
+            self.hass.async_create_task(self._session.async_close())
 
     def _update_device_from_service_info(
         self, service_info: BluetoothServiceInfoBleak
     ) -> RenogyBLEDevice:
         """Ensure the device instance is updated from Bluetooth service info."""
+        source = getattr(service_info, "source", None)
+        if isinstance(source, str) and source:
+            self.connection_source = source
+
         if not self.device:
             self.logger.debug(
                 "Creating new RenogyBLEDevice for %s as %s",
@@ -232,6 +849,8 @@ class RenogyActiveBluetoothCoordinator(
                 service_info.advertisement.rssi,
                 device_type=self.device_type,
             )
+            # The device counts failures too, keep both limits in line
+            self.device.max_failures = self.unavailable_after_failures
         else:
             old_name = self.device.name
             self.device.ble_device = service_info.device
@@ -239,6 +858,7 @@ class RenogyActiveBluetoothCoordinator(
                 cleaned_name = clean_device_name(service_info.name)
                 if old_name != cleaned_name:
                     self.device.name = cleaned_name
+                    self._async_update_identity()
                     self.logger.debug(
                         "Updated device name from '%s' to '%s'",
                         old_name,
@@ -262,6 +882,68 @@ class RenogyActiveBluetoothCoordinator(
 
         return self.device
 
+    @callback
+    def _async_update_identity(self) -> None:
+        """Tell the service and identity caches who the device reports to be."""
+        if self.device is None:
+            return
+        name = self.device.name
+        if not name or name.startswith("Unknown"):
+            name = None
+        data = self.data if isinstance(self.data, Mapping) else {}
+        model = data.get("model")
+        if self.service_cache is not None:
+            self.service_cache.async_set_identity(self.address, name, model)
+        if self.identity_cache is not None:
+            self.identity_cache.async_update(
+                self.address,
+                name=name,
+                model=model,
+                device_id=data.get("device_id"),
+                device_type=self.device_type,
+                firmware=next(
+                    (data[key] for key in FIRMWARE_KEYS if data.get(key) is not None),
+                    None,
+                ),
+            )
+
+    @callback
+    def async_restore_identity(self) -> bool:
+        """Create the device from its cached identity, without a BLE round trip.
+
+        This needs the BLE device Home Assistant already knows for the address,
+        the cached name then stands in until the device advertises its own.
+        """
+        if self.device is not None or self.identity_cache is None:
+            return False
+        identity = self.identity_cache.get(self.address)
+        if not identity or not identity.get("name"):
+            return False
+        ble_device = bluetooth.async_ble_device_from_address(
+            self.hass, self.address, connectable=True
+        )
+        if ble_device is None:
+            return False
+
+        self.device = RenogyBLEDevice(ble_device, None, device_type=self.device_type)
+        self.device.max_failures = self.unavailable_after_failures
+        self.device.name = identity["name"]
+        data = self.data if isinstance(getattr(self, "data", None), Mapping) else {}
+        self.data = self._data_record(data).replace(
+            {
+                key: identity[key]
+                for key in ("model", "device_id")
+                if identity.get(key) is not None and key not in data
+            }
+        )
+        self.logger.debug(
+            "Restored identity of %s as %s (%s)",
+            self.address,
+            self.device.name,
+            identity.get("model"),
+        )
+        return True
+
     @callback
     def _needs_poll(
         self,
@@ -273,6 +955,25 @@ class RenogyActiveBluetoothCoordinator(
         if self.hass.state != CoreState.running:
             return False
 
+        # A poll that is already queued or running would only be joined
+        if self._poll_task is not None and not self._poll_task.done():
+            self.logger.debug("Poll already pending, skipping poll")
+            return False
+
+        # This runs on every advertisement, so check whether a poll is due
+        # before looking up the connectable device. Home Assistant passes the
+        # seconds since the last poll, not its timestamp.
+        if last_poll is not None:
+            if last_poll < self.scan_interval:
+                return False
+            self.logger.debug(
+                "Time to poll device %s after %.1fs",
+                service_info.address,
+                last_poll,
+            )
+        else:
+            self.logger.debug("First poll for device %s", service_info.address)
+
         # Check if we have a connectable device
         connectable_device = bluetooth.async_ble_device_from_address(
             self.hass, service_info.device.address, connectable=True
@@ -283,46 +984,36 @@ class RenogyActiveBluetoothCoordinator(
             )
             return False
 
-        # If a connection is already in progress, don't start another one
-        if self._connection_in_progress:
-            self.logger.debug("Connection already in progress, skipping poll")
-            return False
-
-        # If we've never polled or it's been longer than the scan interval, poll
-        if last_poll is None:
-            self.logger.debug("First poll for device %s", service_info.address)
-            return True
-
-        # Check if enough time has elapsed since the last poll
-        time_since_poll = datetime.now().timestamp() - last_poll
-        should_poll = time_since_poll >= self.scan_interval
-
-        if should_poll:
-            self.logger.debug(
-                "Time to poll device %s after %.1fs",
-                service_info.address,
-                time_since_poll,
-            )
-
-        return should_poll
+        return True
 
     async def _read_device_data(self, service_info: BluetoothServiceInfoBleak) -> bool:
         """Read data from a Renogy BLE device using active connection."""
-        async with self._connection_lock:
+        async with self.operation_queue.async_run(OPERATION_POLL):
             try:
                 self._connection_in_progress = True
                 success = False
                 error: Exception | None = None
                 device = self._update_device_from_service_info(service_info)
+                tiers = self._select_poll_tiers()
+                self._prepare_poll_commands(tiers)
+                previous = self.data if isinstance(self.data, Mapping) else {}
                 self.logger.debug(
-                    "Polling %s device: %s (%s)",
+                    "Polling %s device: %s (%s), tiers: %s",
                     device.device_type,
                     device.name,
                     device.address,
+                    ", ".join(sorted(tiers)),
                 )
 
                 try:
-                    read_result = await self._ble_client.read_device(device)
+                    async with self._async_connection_slot():
+                        with self.poll_timings.measure(PHASE_READ):
+                            read_result = await self._ble_client.read_device(device)
+                        # Only the session can tell the phases of a read apart
+                        if self._session is not None:
+                            self.poll_timings.record_phases(
+                                self._session.last_phase_timings
+                            )
                 except (BleakError, asyncio.TimeoutError) as err:
                     success = False
                     error = err
@@ -339,21 +1030,39 @@ class RenogyActiveBluetoothCoordinator(
 
                 # Always update the device availability and last_update_success
                 device.update_availability(success, error)
-                self.last_update_success = success
+                self._async_record_result(success)
 
                 # Update coordinator data if successful
+                if success:
+                    self._merge_cached_tiers(device, tiers, previous)
                 if success and device.parsed_data:
-                    self.data = dict(device.parsed_data)
+                    # One immutable record per poll, shared with the listeners
+                    # and the snapshot instead of copies of the parsed data
+                    self.data = self._data_record(device.parsed_data)
+                    self.restored_at = None
                     self.logger.debug("Updated coordinator data: %s", self.data)
+                    if self.data_snapshot is not None:
+                        self.data_snapshot.async_update(self.data)
+                    if self.history is not None:
+                        self.history.record(self.data)
+                if success:
+                    self._async_update_identity()
 
                 return success
             finally:
                 self._connection_in_progress = False
 
     async def async_set_load_state(self, state: bool) -> bool:
-        """Set the DC load on/off."""
-        if self._connection_in_progress:
-            self.logger.debug("Connection already in progress, skipping load write")
+        """Set the DC load on/off.
+
+        The write is queued ahead of waiting polls and runs as soon as the
+        current transaction finishes, instead of failing.
+        """
+        if not HAS_WRITE_SUPPORT:
+            self.logger.error(
+                "Write support not available in renogy-ble library. "
+                "Please update to a version with write_register support."
+            )
             return False
 
         service_info = bluetooth.async_last_service_info(self.hass, self.address)
@@ -365,7 +1074,7 @@ class RenogyActiveBluetoothCoordinator(
             )
             return False
 
-        async with self._connection_lock:
+        async with self.operation_queue.async_run(OPERATION_WRITE):
             self._connection_in_progress = True
             try:
                 device = self._update_device_from_service_info(service_info)
@@ -378,24 +1087,26 @@ class RenogyActiveBluetoothCoordinator(
                         "Renogy BLE library does not support write_single_register"
                     )
                     device.update_availability(False, None)
-                    self.last_update_success = False
+                    self._async_record_result(False)
                     return False
 
-                write_result = await write_single_register(
-                    device, LOAD_CONTROL_REGISTER, value
-                )
+                async with self._async_connection_slot():
+                    write_result = await write_single_register(
+                        device, LOAD_CONTROL_REGISTER, value
+                    )
                 device.update_availability(write_result.success, write_result.error)
-                self.last_update_success = write_result.success
+                self._async_record_result(write_result.success)
 
                 if write_result.success:
+                    self._settings_stale = True
                     load_state = "on" if state else "off"
                     if device.parsed_data is not None:
                         device.parsed_data["load_status"] = load_state
-                    if isinstance(self.data, dict):
-                        self.data["load_status"] = load_state
-                    else:
-                        self.data = {"load_status": load_state}
-                    self.async_update_listeners()
+                    data = self.data if isinstance(self.data, Mapping) else {}
+                    self.data = self._data_record(data).replace(
+                        {"load_status": load_state}
+                    )
+                    self._async_notify_data_changes()
 
                 return write_result.success
             finally:
@@ -403,13 +1114,32 @@ class RenogyActiveBluetoothCoordinator(
 
     async def _async_poll_device(
         self, service_info: BluetoothServiceInfoBleak
-    ) -> dict[str, Any]:
-        """Poll the device and return parsed data."""
-        # If a connection is already in progress, don't start another one
-        if self._connection_in_progress:
-            self.logger.debug("Connection already in progress, skipping poll")
-            return self.data if isinstance(self.data, dict) else {}
+    ) -> Mapping[str, Any]:
+        """Poll the device and return parsed data.
+
+        Concurrent callers share the poll that is already in flight.
+        """
+        task = self._poll_task
+        if task is None or task.done():
+            task = asyncio.get_running_loop().create_task(
+                self._async_poll_device_once(service_info)
+            )
+            self._poll_task = task
+        else:
+            self.logger.debug("Joining in-flight poll for device %s", self.address)
+        return await asyncio.shield(task)
+
+    async def _async_poll_device_once(
+        self, service_info: BluetoothServiceInfoBleak
+    ) -> Mapping[str, Any]:
+        """Poll the device once and return parsed data."""
+        with self.poll_timings.measure(PHASE_TOTAL):
+            return await self._async_poll_device_data(service_info)
 
+    async def _async_poll_device_data(
+        self, service_info: BluetoothServiceInfoBleak
+    ) -> Mapping[str, Any]:
+        """Read the device and hand the parsed data to the data callback."""
         self.last_poll_time = datetime.now()
         self.logger.debug(
             "Polling device: %s (%s)", service_info.name, service_info.address
@@ -429,13 +1159,19 @@ class RenogyActiveBluetoothCoordinator(
                 except Exception as e:
                     self.logger.error("Error in device data callback: %s", str(e))
 
-            # Update all listeners after successful data acquisition
-            return dict(self.device.parsed_data)
+            # Only queued here, the sink writes in batches in the executor
+            if self.export_sink is not None:
+                self.export_sink.async_add(self.data)
+
+            # The record published by the read, not another copy
+            return self.data
 
         else:
             self.logger.info("Failed to retrieve data from %s", service_info.address)
-            self.last_update_success = False
-            return self.data if isinstance(self.data, dict) else {}
+            if success:
+                # A read without any data counts as a failed poll too
+                self._async_record_result(False)
+            return self.data if isinstance(self.data, Mapping) else {}
 
     @callback
     def _async_handle_unavailable(
@@ -458,9 +1194,27 @@ class RenogyActiveBluetoothCoordinator(
             self.device.rssi = service_info.advertisement.rssi
             self.device.last_seen = datetime.now()
 
+    @callback
+    def _async_handle_advertisement(
+        self,
+        service_info: BluetoothServiceInfoBleak,
+        change: BluetoothChange,
+    ) -> None:
+        """Record an advertisement and poll a device that came back in range."""
+        if not self.presence.async_seen(service_info):
+            return
+        self.logger.info("Device %s is advertising again, polling it", self.address)
+        if self.hass.state == CoreState.running:
+            self.hass.async_create_task(self.async_request_refresh())
+
     async def async_write_register(self, register: int, value: int) -> bool:
         """Write a single register value to the device.
 
+        Writes requested within ``write_batch_window`` seconds are sent
+        together: consecutive registers go out as one write multiple registers
+        frame. Afterwards only the read commands holding the written registers
+        are read back, over the same connection, and patched into the data.
+
         Args:
             register: Register address to write (e.g., 0xE004 for battery type)
             value: 16-bit value to write
@@ -480,25 +1234,150 @@ class RenogyActiveBluetoothCoordinator(
             )
             return False
 
-        # Try to use the library's write method if available.
-        write_register_fn = getattr(self._ble_client, "write_register", None)
-        if callable(write_register_fn):
-            write_register = cast(
-                Callable[[RenogyBLEDevice, int, int], Awaitable[bool]],
-                write_register_fn,
+        # A later write to the same register within the window wins
+        self._pending_writes[register] = value
+        batch = self._write_batch
+        if batch is None:
+            loop = asyncio.get_running_loop()
+            batch = self._write_batch = loop.create_future()
+            self._write_flush_task = loop.create_task(self._async_flush_writes(batch))
+        results = await asyncio.shield(batch)
+        return results.get(register, False)
+
+    async def _async_flush_writes(self, batch: asyncio.Future[dict[int, bool]]) -> None:
+        """Send the writes collected during the batch window."""
+        results: dict[int, bool] = {}
+        try:
+            await asyncio.sleep(self.write_batch_window)
+            writes, self._pending_writes = self._pending_writes, {}
+            self._write_batch = None
+            runs = contiguous_register_runs(writes)
+            self.logger.debug(
+                "Writing %s registers in %s requests to %s",
+                len(writes),
+                len(runs),
+                self.address,
             )
-            try:
-                success = await write_register(self.device, register, value)
-                if success:
-                    # Trigger a refresh to update the new value
-                    await self.async_request_refresh()
-                return success
-            except Exception as e:
-                self.logger.error("Error writing register %s: %s", hex(register), e)
-                return False
-        else:
-            self.logger.error(
-                "write_register method not available in RenogyBleClient. "
-                "Please update renogy-ble library."
+
+            # Queue behind the running transaction but ahead of waiting polls,
+            # and read the written registers back over the same connection
+            read_back = False
+            async with self.operation_queue.async_run(OPERATION_WRITE):
+                self._connection_in_progress = True
+                try:
+                    async with (
+                        self._async_connection_slot(),
+                        self._async_write_session() as session,
+                    ):
+                        for start, values in runs:
+                            success = await self._async_write_run(
+                                session, start, values
+                            )
+                            for offset in range(len(values)):
+                                results[start + offset] = success
+                        written = [reg for reg, success in results.items() if success]
+                        if written:
+                            read_back = await self._async_read_back(session, written)
+                finally:
+                    self._connection_in_progress = False
+
+            if any(results.values()) and not read_back:
+                # Fall back to re-reading all settings on a full refresh
+                self._settings_stale = True
+                await self.async_request_refresh()
+        except Exception as e:
+            self.logger.error("Error writing registers to %s: %s", self.address, e)
+        finally:
+            if self._write_batch is batch:
+                # Cancelled before the writes were taken, they fail together
+                self._write_batch = None
+                self._pending_writes = {}
+            if self._write_flush_task is asyncio.current_task():
+                self._write_flush_task = None
+            if not batch.done():
+                batch.set_result(results)
+
+    @asynccontextmanager
+    async def _async_write_session(self) -> AsyncIterator[RenogyBleSession]:
+        """Yield a session holding one connection for a batch of writes.
+
+        The library client has no multi-register writes and connects for
+        every request, so without a persistent session a short-lived one is
+        opened for the batch and closed afterwards.
+        """
+        session = self._session
+        if session is None:
+            session = RenogyBleSession(
+                self.hass,
+                self.logger,
+                scanner=bluetooth.async_get_scanner(self.hass),
+                keep_alive=False,
+                commands=self._poll_commands,
+                service_cache=self.service_cache,
             )
+        try:
+            async with session.hold_connection():
+                yield session
+        finally:
+            if session is not self._session:
+                await session.async_close()
+
+    def _read_back_commands(self, registers: Iterable[int]) -> Optional[ModbusCommands]:
+        """Return the read commands covering ``registers``, if all are covered."""
+        commands: ModbusCommands = {}
+        for register in registers:
+            covering = {
+                name: command
+                for name, command in self._device_commands.items()
+                if command[1] <= register < command[1] + command[2]
+            }
+            if not covering:
+                return None
+            commands.update(covering)
+        return commands
+
+    async def _async_read_back(
+        self, session: RenogyBleSession, registers: list[int]
+    ) -> bool:
+        """Re-read only the commands holding ``registers`` and patch the data."""
+        commands = self._read_back_commands(registers)
+        if not commands or self.device is None:
+            return False
+
+        device = self.device
+        result = await session.read_commands(device, commands)
+        if not result.success:
+            self.logger.debug(
+                "Read-back of %s failed for %s: %s",
+                ", ".join(commands),
+                self.address,
+                result.error,
+            )
+            return False
+
+        data = self.data if isinstance(self.data, Mapping) else {}
+        self.data = self._data_record(data).replace(device.parsed_data)
+        self.logger.debug("Read back %s from %s", ", ".join(commands), self.address)
+        self._async_notify_data_changes()
+        return True
+
+    async def _async_write_run(
+        self, session: RenogyBleSession, register: int, values: list[int]
+    ) -> bool:
+        """Write consecutive registers with as few requests as possible."""
+        device = cast(RenogyBLEDevice, self.device)
+        if len(values) > 1:
+            result = await session.write_registers(device, register, values)
+            if not result.success:
+                self.logger.error(
+                    "Error writing registers 0x%04X-0x%04X: %s",
+                    register,
+                    register + len(values) - 1,
+                    result.error,
+                )
+            return result.success
+
+        if not await session.write_register(device, register, values[0]):
+            self.logger.error("Error writing register %s", hex(register))
             return False
+        return True
@@ -9,21 +9,74 @@ from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth import (
     BluetoothServiceInfoBleak,
 )
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_ADDRESS, CONF_SCAN_INTERVAL
+from homeassistant.core import callback
 
 from .const import (
+    CONF_ADAPTIVE_SCAN_INTERVAL,
     CONF_DEVICE_TYPE,
+    CONF_EXPORT_FLUSH_INTERVAL,
+    CONF_EXPORT_FORMAT,
+    CONF_EXPORT_RETENTION_DAYS,
+    CONF_HISTORY_DEPTH,
+    CONF_MAX_CONNECTIONS,
+    CONF_PERSISTENT_SESSION,
+    CONF_PUBLISH_DEADBAND,
+    CONF_PUBLISH_HEARTBEAT,
+    CONF_PUBLISH_MIN_INTERVAL,
+    CONF_SCAN_INTERVAL_MAX,
+    CONF_SCAN_INTERVAL_MIN,
+    CONF_UNAVAILABLE_AFTER_FAILURES,
+    CONF_UNAVAILABLE_AFTER_SECONDS,
+    DATA_CONNECTION_SCHEDULER,
+    DEFAULT_ADAPTIVE_SCAN_INTERVAL,
     DEFAULT_DEVICE_TYPE,
+    DEFAULT_EXPORT_FLUSH_INTERVAL,
+    DEFAULT_EXPORT_FORMAT,
+    DEFAULT_EXPORT_RETENTION_DAYS,
+    DEFAULT_HISTORY_DEPTH,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_PERSISTENT_SESSION,
+    DEFAULT_PUBLISH_DEADBAND,
+    DEFAULT_PUBLISH_HEARTBEAT,
+    DEFAULT_PUBLISH_MIN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    DEFAULT_SCAN_INTERVAL_MIN,
+    DEFAULT_UNAVAILABLE_AFTER_FAILURES,
+    DEFAULT_UNAVAILABLE_AFTER_SECONDS,
     DEVICE_TYPES,
     DOMAIN,
+    EXPORT_FORMATS,
     LOGGER,
+    MAX_EXPORT_FLUSH_INTERVAL,
+    MAX_EXPORT_RETENTION_DAYS,
+    MAX_HISTORY_DEPTH,
+    MAX_MAX_CONNECTIONS,
+    MAX_PUBLISH_HEARTBEAT,
+    MAX_PUBLISH_MIN_INTERVAL,
     MAX_SCAN_INTERVAL,
+    MAX_UNAVAILABLE_AFTER_FAILURES,
+    MAX_UNAVAILABLE_AFTER_SECONDS,
+    MIN_EXPORT_FLUSH_INTERVAL,
+    MIN_EXPORT_RETENTION_DAYS,
+    MIN_HISTORY_DEPTH,
+    MIN_MAX_CONNECTIONS,
+    MIN_PUBLISH_HEARTBEAT,
+    MIN_PUBLISH_MIN_INTERVAL,
     MIN_SCAN_INTERVAL,
+    MIN_UNAVAILABLE_AFTER_FAILURES,
+    MIN_UNAVAILABLE_AFTER_SECONDS,
     RENOGY_DEVICE_PREFIXES,
     SUPPORTED_DEVICE_TYPES,
 )
+from .settings import async_get_settings
 
 # Common schema fields for device configuration
 DEVICE_TYPE_SCHEMA = {
@@ -37,8 +90,120 @@ SCAN_INTERVAL_SCHEMA = {
     ),
 }
 
+ADAPTIVE_SCAN_INTERVAL_SCHEMA = {
+    vol.Optional(
+        CONF_ADAPTIVE_SCAN_INTERVAL, default=DEFAULT_ADAPTIVE_SCAN_INTERVAL
+    ): bool,
+    vol.Optional(CONF_SCAN_INTERVAL_MIN, default=DEFAULT_SCAN_INTERVAL_MIN): vol.All(
+        vol.Coerce(int),
+        vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
+    ),
+    vol.Optional(CONF_SCAN_INTERVAL_MAX, default=DEFAULT_SCAN_INTERVAL_MAX): vol.All(
+        vol.Coerce(int),
+        vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
+    ),
+}
+
+AVAILABILITY_SCHEMA = {
+    vol.Optional(
+        CONF_UNAVAILABLE_AFTER_FAILURES, default=DEFAULT_UNAVAILABLE_AFTER_FAILURES
+    ): vol.All(
+        vol.Coerce(int),
+        vol.Range(
+            min=MIN_UNAVAILABLE_AFTER_FAILURES, max=MAX_UNAVAILABLE_AFTER_FAILURES
+        ),
+    ),
+    vol.Optional(
+        CONF_UNAVAILABLE_AFTER_SECONDS, default=DEFAULT_UNAVAILABLE_AFTER_SECONDS
+    ): vol.All(
+        vol.Coerce(int),
+        vol.Range(min=MIN_UNAVAILABLE_AFTER_SECONDS, max=MAX_UNAVAILABLE_AFTER_SECONDS),
+    ),
+}
+
+PERSISTENT_SESSION_SCHEMA = {
+    vol.Optional(CONF_PERSISTENT_SESSION, default=DEFAULT_PERSISTENT_SESSION): bool,
+}
+
+MAX_CONNECTIONS_SCHEMA = {
+    vol.Optional(CONF_MAX_CONNECTIONS, default=DEFAULT_MAX_CONNECTIONS): vol.All(
+        vol.Coerce(int),
+        vol.Range(min=MIN_MAX_CONNECTIONS, max=MAX_MAX_CONNECTIONS),
+    ),
+}
+
+PUBLISH_SCHEMA = {
+    vol.Optional(CONF_PUBLISH_DEADBAND, default=DEFAULT_PUBLISH_DEADBAND): bool,
+    vol.Optional(
+        CONF_PUBLISH_MIN_INTERVAL, default=DEFAULT_PUBLISH_MIN_INTERVAL
+    ): vol.All(
+        vol.Coerce(int),
+        vol.Range(min=MIN_PUBLISH_MIN_INTERVAL, max=MAX_PUBLISH_MIN_INTERVAL),
+    ),
+    vol.Optional(CONF_PUBLISH_HEARTBEAT, default=DEFAULT_PUBLISH_HEARTBEAT): vol.All(
+        vol.Coerce(int),
+        vol.Range(min=MIN_PUBLISH_HEARTBEAT, max=MAX_PUBLISH_HEARTBEAT),
+    ),
+}
+
+HISTORY_SCHEMA = {
+    vol.Optional(CONF_HISTORY_DEPTH, default=DEFAULT_HISTORY_DEPTH): vol.All(
+        vol.Coerce(int),
+        vol.Range(min=MIN_HISTORY_DEPTH, max=MAX_HISTORY_DEPTH),
+    ),
+}
+
+EXPORT_SCHEMA = {
+    vol.Optional(CONF_EXPORT_FORMAT, default=DEFAULT_EXPORT_FORMAT): vol.In(
+        EXPORT_FORMATS
+    ),
+    vol.Optional(
+        CONF_EXPORT_FLUSH_INTERVAL, default=DEFAULT_EXPORT_FLUSH_INTERVAL
+    ): vol.All(
+        vol.Coerce(int),
+        vol.Range(min=MIN_EXPORT_FLUSH_INTERVAL, max=MAX_EXPORT_FLUSH_INTERVAL),
+    ),
+    vol.Optional(
+        CONF_EXPORT_RETENTION_DAYS, default=DEFAULT_EXPORT_RETENTION_DAYS
+    ): vol.All(
+        vol.Coerce(int),
+        vol.Range(min=MIN_EXPORT_RETENTION_DAYS, max=MAX_EXPORT_RETENTION_DAYS),
+    ),
+}
+
 # Base configuration schema without device selection
-CONFIG_SCHEMA = vol.Schema({**DEVICE_TYPE_SCHEMA, **SCAN_INTERVAL_SCHEMA})
+CONFIG_SCHEMA = vol.Schema(
+    {
+        **DEVICE_TYPE_SCHEMA,
+        **SCAN_INTERVAL_SCHEMA,
+        **ADAPTIVE_SCAN_INTERVAL_SCHEMA,
+        **AVAILABILITY_SCHEMA,
+        **PERSISTENT_SESSION_SCHEMA,
+    }
+)
+
+
+# Everything but the device type can be changed after setup. The connection
+# limit is shared by all devices, so it is saved for the integration instead
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        **SCAN_INTERVAL_SCHEMA,
+        **ADAPTIVE_SCAN_INTERVAL_SCHEMA,
+        **AVAILABILITY_SCHEMA,
+        **PUBLISH_SCHEMA,
+        **HISTORY_SCHEMA,
+        **EXPORT_SCHEMA,
+        **PERSISTENT_SESSION_SCHEMA,
+        **MAX_CONNECTIONS_SCHEMA,
+    }
+)
+
+
+def _scan_interval_bounds_valid(user_input: dict[str, Any]) -> bool:
+    """Return False if the shortest adaptive interval exceeds the longest."""
+    return user_input.get(CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN) <= (
+        user_input.get(CONF_SCAN_INTERVAL_MAX, DEFAULT_SCAN_INTERVAL_MAX)
+    )
 
 
 class RenogyConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -46,6 +211,12 @@ class RenogyConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> RenogyOptionsFlow:
+        """Return the options flow of an entry."""
+        return RenogyOptionsFlow()
+
     def __init__(self) -> None:
         """Initialize the config flow."""
         self._discovered_devices: dict[str, BluetoothServiceInfoBleak] = {}
@@ -108,7 +279,9 @@ class RenogyConfigFlow(ConfigFlow, domain=DOMAIN):
                     description_placeholders={"device_type": device_type},
                 )
 
-            if self._discovered_device:
+            if not _scan_interval_bounds_valid(user_input):
+                errors["base"] = "invalid_scan_interval_bounds"
+            elif self._discovered_device:
                 # Coming from bluetooth discovery with device already selected
                 user_input[CONF_ADDRESS] = self._discovered_device.address
 
@@ -160,6 +333,9 @@ class RenogyConfigFlow(ConfigFlow, domain=DOMAIN):
                 ),
                 **DEVICE_TYPE_SCHEMA,
                 **SCAN_INTERVAL_SCHEMA,
+                **ADAPTIVE_SCAN_INTERVAL_SCHEMA,
+                **AVAILABILITY_SCHEMA,
+                **PERSISTENT_SESSION_SCHEMA,
             }
         )
 
@@ -196,3 +372,39 @@ class RenogyConfigFlow(ConfigFlow, domain=DOMAIN):
         LOGGER.debug(
             "Found %s unconfigured Renogy devices", len(self._discovered_devices)
         )
+
+
+class RenogyOptionsFlow(OptionsFlow):
+    """Handle the options of a Renogy BLE device."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Change the polling, availability and publishing options."""
+        errors: dict[str, str] = {}
+
+        settings = await async_get_settings(self.hass)
+
+        if user_input is not None:
+            if _scan_interval_bounds_valid(user_input):
+                max_connections = user_input.pop(
+                    CONF_MAX_CONNECTIONS, settings.max_connections
+                )
+                settings.async_set_max_connections(max_connections)
+                scheduler = self.hass.data[DOMAIN].get(DATA_CONNECTION_SCHEDULER)
+                if scheduler is not None:
+                    scheduler.async_set_max_connections(max_connections)
+                # The entry is set up again with the new options
+                return self.async_create_entry(data=user_input)
+            errors["base"] = "invalid_scan_interval_bounds"
+
+        current = {
+            **self.config_entry.data,
+            **self.config_entry.options,
+            CONF_MAX_CONNECTIONS: settings.max_connections,
+        }
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(OPTIONS_SCHEMA, current),
+            errors=errors,
+        )
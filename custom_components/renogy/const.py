@@ -12,6 +12,101 @@ DEFAULT_SCAN_INTERVAL = 60  # seconds
 MIN_SCAN_INTERVAL = 10  # seconds
 MAX_SCAN_INTERVAL = 600  # seconds
 
+# Adaptive scan interval constants
+# The interval is halved while the activity values change by more than the
+# threshold between polls, and grows by the backoff factor while they are flat
+DEFAULT_ADAPTIVE_SCAN_INTERVAL = False
+DEFAULT_SCAN_INTERVAL_MIN = 15  # seconds
+DEFAULT_SCAN_INTERVAL_MAX = 300  # seconds
+ADAPTIVE_ACTIVITY_THRESHOLD = 0.1  # relative change
+ADAPTIVE_BACKOFF_FACTOR = 1.5
+
+# Availability hysteresis constants
+# A device stays available with its last data after failed polls until either
+# this many polls failed in a row or they kept failing for this long
+DEFAULT_UNAVAILABLE_AFTER_FAILURES = 3
+MIN_UNAVAILABLE_AFTER_FAILURES = 1
+MAX_UNAVAILABLE_AFTER_FAILURES = 20
+DEFAULT_UNAVAILABLE_AFTER_SECONDS = 300
+MIN_UNAVAILABLE_AFTER_SECONDS = 0
+MAX_UNAVAILABLE_AFTER_SECONDS = 3600
+
+# Sensor state publishing constants
+# With deadbands, changes within a sensor's deadband are not written. States
+# are written at most every min interval, and at least every heartbeat
+# (0 disables either)
+DEFAULT_PUBLISH_DEADBAND = False
+DEFAULT_PUBLISH_MIN_INTERVAL = 0  # seconds
+MIN_PUBLISH_MIN_INTERVAL = 0
+MAX_PUBLISH_MIN_INTERVAL = 3600
+DEFAULT_PUBLISH_HEARTBEAT = 0  # seconds
+MIN_PUBLISH_HEARTBEAT = 0
+MAX_PUBLISH_HEARTBEAT = 86400
+
+# Sample history constants
+# The last samples of every device are kept in memory for the get_history
+# service and the diagnostics (0 disables the history)
+DEFAULT_HISTORY_DEPTH = 120  # samples
+MIN_HISTORY_DEPTH = 0
+MAX_HISTORY_DEPTH = 3600
+SERVICE_GET_HISTORY = "get_history"
+
+# Sample export constants
+# Every polled sample can be appended to a file per device and day under
+# <config>/renogy_export, written in batches every flush interval
+EXPORT_FORMAT_OFF = "off"
+EXPORT_FORMAT_JSONL = "jsonl"
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMATS = [EXPORT_FORMAT_OFF, EXPORT_FORMAT_JSONL, EXPORT_FORMAT_CSV]
+EXPORT_DIRECTORY = "renogy_export"
+DEFAULT_EXPORT_FORMAT = EXPORT_FORMAT_OFF
+DEFAULT_EXPORT_FLUSH_INTERVAL = 60  # seconds
+MIN_EXPORT_FLUSH_INTERVAL = 5
+MAX_EXPORT_FLUSH_INTERVAL = 3600
+DEFAULT_EXPORT_RETENTION_DAYS = 7
+MIN_EXPORT_RETENTION_DAYS = 1
+MAX_EXPORT_RETENTION_DAYS = 365
+
+# Persistent BLE session constants
+DEFAULT_PERSISTENT_SESSION = False
+DEFAULT_SESSION_IDLE_TIMEOUT = 90  # seconds
+
+# Connection scheduling constants
+DEFAULT_MAX_CONNECTIONS = 2  # simultaneous connections per adapter or proxy
+MIN_MAX_CONNECTIONS = 1
+MAX_MAX_CONNECTIONS = 10
+DEFAULT_CONNECTION_SOURCE = "default"
+DATA_CONNECTION_SCHEDULER = "connection_scheduler"
+DATA_SERVICE_CACHE = "service_cache"
+DATA_IDENTITY_CACHE = "identity_cache"
+DATA_SETTINGS = "settings"
+
+# Tiered polling constants
+# Static identity registers are read once, settings registers every N polls or
+# right after a write, and dynamic registers on every poll.
+POLL_TIER_STATIC = "static"
+POLL_TIER_SETTINGS = "settings"
+POLL_TIER_DYNAMIC = "dynamic"
+DEFAULT_SETTINGS_REFRESH_POLLS = 10
+
+# Maximum time platforms wait for the initial refresh before adding entities
+DEFAULT_READY_TIMEOUT = 10
+
+# Register writes requested within this window are sent together, with
+# contiguous registers combined into one write multiple registers frame
+DEFAULT_WRITE_BATCH_WINDOW = 0.25  # seconds
+
+# Devices not heard advertising for this long are considered out of range and
+# are not actively polled until they advertise again
+DEFAULT_PRESENCE_WINDOW = 300  # seconds
+
+# A battery has to report fewer cells or temperature probes for this many
+# polls in a row before their sensors are removed, a single bad read keeps them
+DEFAULT_COUNT_DECREASE_POLLS = 3
+
+# Manufacturer id in the advertisements of Renogy devices, see manifest.json
+RENOGY_MANUFACTURER_ID = 57676
+
 # Renogy BT-1 and BT-2 module identifiers - devices advertise with these prefixes
 RENOGY_BT_PREFIX = "BT-TH-"
 
@@ -21,6 +116,20 @@ RENOGY_DEVICE_PREFIXES = ("BT-TH-", "RNGRBP", "BTRIC", "RBT")
 # Configuration parameters
 CONF_SCAN_INTERVAL = "scan_interval"
 CONF_DEVICE_TYPE = "device_type"  # New constant for device type
+CONF_PERSISTENT_SESSION = "persistent_session"
+CONF_MAX_CONNECTIONS = "max_connections"
+CONF_ADAPTIVE_SCAN_INTERVAL = "adaptive_scan_interval"
+CONF_SCAN_INTERVAL_MIN = "scan_interval_min"
+CONF_SCAN_INTERVAL_MAX = "scan_interval_max"
+CONF_UNAVAILABLE_AFTER_FAILURES = "unavailable_after_failures"
+CONF_UNAVAILABLE_AFTER_SECONDS = "unavailable_after_seconds"
+CONF_PUBLISH_DEADBAND = "publish_deadband"
+CONF_PUBLISH_MIN_INTERVAL = "publish_min_interval"
+CONF_PUBLISH_HEARTBEAT = "publish_heartbeat"
+CONF_HISTORY_DEPTH = "history_depth"
+CONF_EXPORT_FORMAT = "export_format"
+CONF_EXPORT_FLUSH_INTERVAL = "export_flush_interval"
+CONF_EXPORT_RETENTION_DAYS = "export_retention_days"
 
 # Device info
 ATTR_MANUFACTURER = "Renogy"
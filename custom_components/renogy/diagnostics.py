@@ -0,0 +1,84 @@
+"""Diagnostics support for Renogy BLE."""
+
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_CONNECTION_SCHEDULER, DATA_SERVICE_CACHE, DOMAIN
+
+TO_REDACT = {CONF_ADDRESS}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    domain_data = hass.data.get(DOMAIN, {})
+    diagnostics: dict[str, Any] = {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+    }
+
+    entry_data = domain_data.get(entry.entry_id)
+    if entry_data:
+        coordinator = entry_data["coordinator"]
+        last_poll_time = coordinator.last_poll_time
+        diagnostics["coordinator"] = {
+            "device_type": coordinator.device_type,
+            "scan_interval": coordinator.scan_interval,
+            "persistent_session": coordinator.persistent_session,
+            "connection_source": coordinator.connection_source,
+            "last_update_success": coordinator.last_update_success,
+            "last_poll_time": last_poll_time.isoformat() if last_poll_time else None,
+            "last_connection_wait": coordinator.last_connection_wait,
+            "suppressed_state_writes": coordinator.suppressed_state_writes,
+            "stale": coordinator.is_stale,
+            "restored_at": (
+                coordinator.restored_at.isoformat() if coordinator.restored_at else None
+            ),
+            "consecutive_failures": coordinator.consecutive_failures,
+            "failing_since": (
+                coordinator.failing_since.isoformat()
+                if coordinator.failing_since
+                else None
+            ),
+        }
+        if coordinator.adaptive_interval is not None:
+            diagnostics["adaptive_scan_interval"] = (
+                coordinator.adaptive_interval.async_get_stats()
+            )
+        diagnostics["poll_timings"] = coordinator.poll_timings.as_dict()
+        diagnostics["operation_queue"] = coordinator.operation_queue.async_get_stats()
+        diagnostics["presence"] = coordinator.presence.async_get_stats()
+        if coordinator.history is not None:
+            diagnostics["history"] = {
+                **coordinator.history.async_get_stats(),
+                "samples": coordinator.history.samples(),
+            }
+        if coordinator.export_sink is not None:
+            diagnostics["export"] = coordinator.export_sink.async_get_stats()
+        if coordinator.service_cache is not None:
+            diagnostics["gatt_services"] = (
+                coordinator.service_cache.async_get_device_info(coordinator.address)
+            )
+        if coordinator.identity_cache is not None:
+            diagnostics["identity"] = coordinator.identity_cache.get(
+                coordinator.address
+            )
+        diagnostics["data"] = (
+            dict(coordinator.data) if isinstance(coordinator.data, Mapping) else {}
+        )
+
+    scheduler = domain_data.get(DATA_CONNECTION_SCHEDULER)
+    if scheduler is not None:
+        diagnostics["connection_scheduler"] = scheduler.async_get_stats()
+
+    service_cache = domain_data.get(DATA_SERVICE_CACHE)
+    if service_cache is not None:
+        diagnostics["gatt_service_cache"] = service_cache.async_get_stats()
+
+    return diagnostics
@@ -0,0 +1,186 @@
+"""Export of raw poll samples to rotating files."""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DEFAULT_EXPORT_FLUSH_INTERVAL,
+    DEFAULT_EXPORT_RETENTION_DAYS,
+    EXPORT_DIRECTORY,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_JSONL,
+    LOGGER,
+)
+
+# Columns every exported sample starts with
+EXPORT_COLUMNS = ("timestamp", "address")
+
+
+class RenogyExportSink:
+    """Write the poll samples of one device to a file per day.
+
+    Samples are only queued on the event loop. Every ``flush_interval``
+    seconds the queue is written in one batch in the executor, to
+    ``<config>/renogy_export/<address>-<date>.<format>``. A file is started
+    every day, files older than ``retention_days`` are deleted.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        address: str,
+        export_format: str = EXPORT_FORMAT_JSONL,
+        flush_interval: float = DEFAULT_EXPORT_FLUSH_INTERVAL,
+        retention_days: int = DEFAULT_EXPORT_RETENTION_DAYS,
+        directory: Optional[str] = None,
+    ) -> None:
+        """Initialize the sink."""
+        self.hass = hass
+        self.address = address
+        self.export_format = export_format
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        self.directory = directory or hass.config.path(EXPORT_DIRECTORY)
+        self._prefix = address.replace(":", "").lower()
+        self._pending: list[tuple[str, Mapping[str, Any]]] = []
+        self._unsub_flush: Optional[Any] = None
+        self._csv_columns: dict[str, list[str]] = {}
+        self._pruned_on: Optional[date] = None
+        self.written = 0
+        self.flushes = 0
+        self.errors = 0
+
+    @callback
+    def async_add(self, data: Mapping[str, Any]) -> None:
+        """Queue a sample, published data records are not copied."""
+        self._pending.append((datetime.now().isoformat(), data))
+
+    @callback
+    def async_start(self) -> None:
+        """Flush the queued samples every flush interval."""
+        if self._unsub_flush is None:
+            self._unsub_flush = async_track_time_interval(
+                self.hass,
+                self._async_flush_interval,
+                timedelta(seconds=self.flush_interval),
+            )
+
+    async def async_stop(self) -> None:
+        """Stop flushing and write what is still queued."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        await self.async_flush()
+
+    async def _async_flush_interval(self, _now: Any = None) -> None:
+        """Flush the queue on the flush interval."""
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Write the queued samples in the executor."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            await self.hass.async_add_executor_job(self._write_batch, batch)
+        except OSError as err:
+            self.errors += 1
+            LOGGER.warning(
+                "Failed to export %s samples of %s: %s", len(batch), self.address, err
+            )
+            return
+        self.written += len(batch)
+        self.flushes += 1
+
+    def _path(self, day: date) -> str:
+        """Return the file of the samples of ``day``."""
+        return os.path.join(
+            self.directory, f"{self._prefix}-{day.isoformat()}.{self.export_format}"
+        )
+
+    def _write_batch(self, batch: list[tuple[str, Mapping[str, Any]]]) -> None:
+        """Append samples to the files of their day, runs in the executor."""
+        os.makedirs(self.directory, exist_ok=True)
+        by_day: dict[date, list[tuple[str, Mapping[str, Any]]]] = {}
+        for timestamp, data in batch:
+            by_day.setdefault(date.fromisoformat(timestamp[:10]), []).append(
+                (timestamp, data)
+            )
+        for day, samples in by_day.items():
+            if self.export_format == EXPORT_FORMAT_CSV:
+                self._write_csv(self._path(day), samples)
+            else:
+                self._write_jsonl(self._path(day), samples)
+        self._prune(max(by_day))
+
+    def _write_jsonl(
+        self, path: str, samples: list[tuple[str, Mapping[str, Any]]]
+    ) -> None:
+        """Append samples as one JSON object per line."""
+        with open(path, "a", encoding="utf-8") as file:
+            for timestamp, data in samples:
+                row = {"timestamp": timestamp, "address": self.address, **data}
+                file.write(json.dumps(row, default=str) + "\n")
+
+    def _write_csv(
+        self, path: str, samples: list[tuple[str, Mapping[str, Any]]]
+    ) -> None:
+        """Append samples as CSV rows, the header is fixed per file."""
+        columns = self._csv_columns.get(path)
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        if columns is None and not new_file:
+            with open(path, encoding="utf-8", newline="") as file:
+                columns = next(csv.reader(file), None)
+        if columns is None or new_file:
+            keys = dict.fromkeys(key for _, data in samples for key in data)
+            columns = [*EXPORT_COLUMNS, *keys]
+        self._csv_columns[path] = columns
+
+        with open(path, "a", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=columns, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+            for timestamp, data in samples:
+                writer.writerow(
+                    {"timestamp": timestamp, "address": self.address, **data}
+                )
+
+    def _prune(self, today: date) -> None:
+        """Delete the files of this device older than the retention."""
+        if self._pruned_on == today:
+            return
+        self._pruned_on = today
+        oldest = today - timedelta(days=self.retention_days - 1)
+        self._csv_columns.clear()
+        for name in os.listdir(self.directory):
+            if not name.startswith(f"{self._prefix}-"):
+                continue
+            stem = name[len(self._prefix) + 1 :].split(".", 1)[0]
+            try:
+                day = date.fromisoformat(stem)
+            except ValueError:
+                continue
+            if day < oldest:
+                LOGGER.debug("Deleting expired export %s", name)
+                os.remove(os.path.join(self.directory, name))
+
+    def async_get_stats(self) -> dict[str, Any]:
+        """Return the export counters."""
+        return {
+            "format": self.export_format,
+            "flush_interval": self.flush_interval,
+            "retention_days": self.retention_days,
+            "pending": len(self._pending),
+            "written": self.written,
+            "flushes": self.flushes,
+            "errors": self.errors,
+        }
@@ -0,0 +1,108 @@
+"""Bounded in-memory history of the polled values of a Renogy BLE device."""
+
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from collections.abc import Callable, Iterable, Mapping
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from .const import DEFAULT_HISTORY_DEPTH
+
+
+def _is_number(value: Any) -> bool:
+    """Return True for int and float values, but not for booleans."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class RenogySampleHistory:
+    """Ring buffer of the last ``depth`` poll samples of one device.
+
+    Every numeric data key gets a column of doubles and every sample a
+    monotonic timestamp, all allocated up front, so memory stays fixed no
+    matter how often the device is polled. A key missing from a sample is
+    stored as NaN. Non-numeric values such as the model are not kept.
+    """
+
+    def __init__(
+        self,
+        depth: int = DEFAULT_HISTORY_DEPTH,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the history."""
+        self.depth = max(1, depth)
+        self._clock = clock
+        self._times = array("d", bytes(8 * self.depth))
+        self._columns: dict[str, array[float]] = {}
+        self._next = 0
+        self._count = 0
+        self.recorded = 0
+
+    def record(
+        self, data: Mapping[str, Any], timestamp: Optional[float] = None
+    ) -> None:
+        """Append a sample, overwriting the oldest once the buffer is full."""
+        position = self._next
+        self._times[position] = self._clock() if timestamp is None else timestamp
+        for key, value in data.items():
+            if not _is_number(value):
+                continue
+            column = self._columns.get(key)
+            if column is None:
+                column = self._columns[key] = array("d", [math.nan]) * self.depth
+            column[position] = value
+        for key, column in self._columns.items():
+            if key not in data or not _is_number(data[key]):
+                column[position] = math.nan
+        self._next = (position + 1) % self.depth
+        self._count = min(self._count + 1, self.depth)
+        self.recorded += 1
+
+    def _positions(self) -> Iterable[int]:
+        """Return the buffer positions from the oldest to the newest sample."""
+        start = (self._next - self._count) % self.depth
+        return ((start + offset) % self.depth for offset in range(self._count))
+
+    def samples(
+        self,
+        keys: Optional[Iterable[str]] = None,
+        seconds: Optional[float] = None,
+    ) -> list[dict[str, Any]]:
+        """Return the samples, oldest first, optionally filtered.
+
+        ``keys`` limits the values to those keys, ``seconds`` the samples to
+        the most recent ones. Timestamps are converted to wall clock time.
+        """
+        now = self._clock()
+        wall_now = datetime.now()
+        columns = (
+            self._columns
+            if keys is None
+            else {key: self._columns[key] for key in keys if key in self._columns}
+        )
+        samples: list[dict[str, Any]] = []
+        for position in self._positions():
+            age = now - self._times[position]
+            if seconds is not None and age > seconds:
+                continue
+            sample: dict[str, Any] = {
+                "timestamp": (wall_now - timedelta(seconds=age)).isoformat(),
+            }
+            for key, column in columns.items():
+                value = column[position]
+                if not math.isnan(value):
+                    sample[key] = value
+            samples.append(sample)
+        return samples
+
+    def async_get_stats(self) -> dict[str, Any]:
+        """Return the size and memory use of the history."""
+        return {
+            "depth": self.depth,
+            "samples": self._count,
+            "recorded": self.recorded,
+            "keys": sorted(self._columns),
+            "bytes": self._times.itemsize * self.depth * (len(self._columns) + 1),
+        }
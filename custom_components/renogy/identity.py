@@ -0,0 +1,79 @@
+"""Device identity cache shared by all Renogy BLE devices."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.device_identity"
+# Seconds to batch identity changes before writing them to disk
+SAVE_DELAY = 10
+
+# Identity fields remembered per device address
+IDENTITY_FIELDS = ("name", "model", "device_id", "device_type", "firmware")
+# Data keys a firmware version may be reported under
+FIRMWARE_KEYS = ("firmware_version", "software_version")
+
+
+class RenogyIdentityCache:
+    """Remember who every device is once it has been learned.
+
+    The cleaned advertised name, model, Modbus device id, device type and,
+    when the device reports it, the firmware version are persisted per
+    address. At the next start entities get their final names and device
+    info from here instead of waiting for an advertisement and a first poll.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._identities: dict[str, dict[str, Any]] = {}
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the persisted identities, only once."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            data = await self._store.async_load()
+            if isinstance(data, dict):
+                for address, identity in data.get("devices", {}).items():
+                    if isinstance(identity, dict):
+                        self._identities.setdefault(address, identity)
+            self._loaded = True
+
+    def get(self, address: str) -> Optional[dict[str, Any]]:
+        """Return the known identity of a device, if any."""
+        identity = self._identities.get(address)
+        return dict(identity) if identity else None
+
+    @callback
+    def async_update(self, address: str, **fields: Any) -> None:
+        """Merge newly learned identity fields, ignoring unknown values."""
+        identity = self._identities.setdefault(address, {})
+        changed = False
+        for key in IDENTITY_FIELDS:
+            value = fields.get(key)
+            if value is not None and identity.get(key) != value:
+                identity[key] = value
+                changed = True
+        if changed:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, address: str) -> None:
+        """Forget the identity of a removed device."""
+        if self._identities.pop(address, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the identities to persist."""
+        return {"devices": self._identities}
@@ -0,0 +1,97 @@
+"""Adaptive scan interval for Renogy BLE devices."""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Mapping, Optional
+
+from .const import (
+    ADAPTIVE_ACTIVITY_THRESHOLD,
+    ADAPTIVE_BACKOFF_FACTOR,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    DEFAULT_SCAN_INTERVAL_MIN,
+)
+
+# Values that show how busy a device is, with the smallest change that counts
+# as activity even when the value itself is close to zero
+ACTIVITY_KEYS: dict[str, float] = {
+    "pv_power": 5.0,  # W
+    "solar_power": 5.0,  # W
+    "alternator_power": 5.0,  # W
+    "load_power": 5.0,  # W
+    "output_power": 5.0,  # W
+    "battery_current": 0.5,  # A
+}
+
+
+class RenogyAdaptiveInterval:
+    """Pick the scan interval from how fast the activity values change.
+
+    After every successful poll the relative change of the activity values
+    since the previous poll is compared against ``threshold``. A busy device
+    has its interval halved, down to ``minimum``. A flat one backs off by
+    ``backoff`` per poll up to ``maximum``, so an idle installation at night
+    is polled a few times an hour instead of every minute.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        minimum: float = DEFAULT_SCAN_INTERVAL_MIN,
+        maximum: float = DEFAULT_SCAN_INTERVAL_MAX,
+        threshold: float = ADAPTIVE_ACTIVITY_THRESHOLD,
+        backoff: float = ADAPTIVE_BACKOFF_FACTOR,
+    ) -> None:
+        """Initialize the adaptive interval."""
+        self.minimum = int(minimum)
+        self.maximum = max(self.minimum, int(maximum))
+        self.threshold = threshold
+        self.backoff = backoff
+        self.interval = self._clamp(interval)
+        self.last_change: Optional[float] = None
+        self._previous: dict[str, float] = {}
+
+    def async_update(self, data: Mapping[str, Any]) -> int:
+        """Feed the data of a successful poll and return the next interval."""
+        change = self._largest_change(data)
+        self.last_change = change
+        if change is None:
+            return self.interval
+        if change >= self.threshold:
+            self.interval = self._clamp(self.interval / 2)
+        else:
+            self.interval = self._clamp(self.interval * self.backoff)
+        return self.interval
+
+    def async_get_stats(self) -> dict[str, Any]:
+        """Return the bounds and the current state."""
+        return {
+            "interval": self.interval,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "last_change": (
+                None if self.last_change is None else round(self.last_change, 3)
+            ),
+        }
+
+    def _largest_change(self, data: Mapping[str, Any]) -> Optional[float]:
+        """Return the largest relative change of the activity values, if any."""
+        largest: Optional[float] = None
+        for key, floor in ACTIVITY_KEYS.items():
+            value = data.get(key)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            if not math.isfinite(value):
+                continue
+            previous = self._previous.get(key)
+            self._previous[key] = float(value)
+            if previous is None:
+                continue
+            delta = abs(value - previous)
+            change = 0.0 if delta < floor else delta / max(abs(previous), floor)
+            largest = change if largest is None else max(largest, change)
+        return largest
+
+    def _clamp(self, interval: float) -> int:
+        """Round ``interval`` to whole seconds within the bounds."""
+        return min(self.maximum, max(self.minimum, round(interval)))
@@ -427,7 +427,9 @@ class RenogyNumberEntity(NumberEntity):
     async def async_added_to_hass(self) -> None:
         """Run when entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self._handle_coordinator_update)
+            self.coordinator.async_add_listener(
+                self._handle_coordinator_update, (self.entity_description.key,)
+            )
         )
 
     def _handle_coordinator_update(self) -> None:
@@ -0,0 +1,205 @@
+"""Precompiled value extraction for Renogy BLE sensors."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any, Optional
+
+from .const import LOGGER
+from .records import RenogyDataRecord, RenogyFieldIndex
+
+# Digits kept after scaling, drops float noise such as 12.345000000000001
+SCALE_PRECISION = 10
+
+
+class RenogyValuePlan:
+    """How one sensor turns the polled data into its value.
+
+    Built once per sensor description: which field to read (or which
+    function to call for computed values), whether to coerce it to a float,
+    what to scale it by and which range is plausible.
+    """
+
+    __slots__ = (
+        "key",
+        "name",
+        "field",
+        "value_fn",
+        "numeric",
+        "scale",
+        "minimum",
+        "maximum",
+    )
+
+    def __init__(
+        self,
+        key: str,
+        name: Optional[str] = None,
+        field: Optional[str] = None,
+        value_fn: Optional[Callable[[Mapping[str, Any]], Any]] = None,
+        numeric: bool = False,
+        scale: Optional[float] = None,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+    ) -> None:
+        """Initialize the plan."""
+        self.key = key
+        self.name = name or key
+        self.field = field
+        self.value_fn = value_fn
+        self.numeric = numeric or scale is not None
+        self.scale = scale
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @property
+    def has_value(self) -> bool:
+        """Return True if the plan reads anything from the data."""
+        return self.field is not None or self.value_fn is not None
+
+    def extract(self, data: Mapping[str, Any]) -> Any:
+        """Return the validated value of the sensor in ``data``, or None."""
+        try:
+            if self.field is not None:
+                value = data.get(self.field)
+            elif self.value_fn is not None:
+                value = self.value_fn(data)
+            else:
+                return None
+        except Exception as err:
+            LOGGER.warning("Error getting native value for %s: %s", self.name, err)
+            return None
+        return self.validate(value)
+
+    def validate(self, value: Any) -> Any:
+        """Return the field ``value`` converted and range checked, or None."""
+        if value is None or not self.numeric:
+            return value
+
+        try:
+            value = float(value)
+        except (ValueError, TypeError):
+            LOGGER.warning("Invalid numeric value for %s: %s", self.name, value)
+            return None
+        if self.scale is not None:
+            value = round(value * self.scale, SCALE_PRECISION)
+        if (self.minimum is not None and value < self.minimum) or (
+            self.maximum is not None and value > self.maximum
+        ):
+            LOGGER.warning("Value %s out of reasonable range for %s", value, self.name)
+            return None
+        return value
+
+
+class RenogyValuePlans:
+    """The value plans of the sensors of one device, evaluated in one pass.
+
+    The coordinator evaluates every registered plan when it publishes new
+    data, sensors then only read their slot. Plans whose field did not
+    change keep the value of the previous pass. There is one slot per sensor
+    key, so a sensor created again reuses its slot and plan.
+
+    The field of every plan is resolved to its position in the field index
+    of the device once, so records are read by position instead of by key.
+    """
+
+    __slots__ = (
+        "_plans",
+        "_slots",
+        "_values",
+        "_data",
+        "_dirty",
+        "_index",
+        "_positions",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the plans."""
+        self._plans: list[RenogyValuePlan] = []
+        self._slots: dict[str, int] = {}
+        self._values: list[Any] = []
+        self._data: Optional[Mapping[str, Any]] = None
+        self._dirty = False
+        self._index: Optional[RenogyFieldIndex] = None
+        self._positions: list[Optional[int]] = []
+
+    def register(self, plan: RenogyValuePlan) -> int:
+        """Return the slot of the sensor key of ``plan``, adding it if new."""
+        slot = self._slots.get(plan.key)
+        if slot is None:
+            slot = self._slots[plan.key] = len(self._plans)
+            self._plans.append(plan)
+            self._values.append(None)
+            self._positions.append(self._position(plan))
+            self._dirty = True
+        elif self._plans[slot] is not plan:
+            self._plans[slot] = plan
+            self._positions[slot] = self._position(plan)
+            self._dirty = True
+        return slot
+
+    def get(self, key: str) -> Optional[RenogyValuePlan]:
+        """Return the plan registered for the sensor ``key``, if any."""
+        slot = self._slots.get(key)
+        return None if slot is None else self._plans[slot]
+
+    def clear(self) -> None:
+        """Drop every plan, once the sensors of the device are gone."""
+        self._plans.clear()
+        self._slots.clear()
+        self._values.clear()
+        self._positions.clear()
+        self._index = None
+        self._data = None
+        self._dirty = False
+
+    def _bind(self, index: RenogyFieldIndex) -> None:
+        """Resolve the field positions of all plans in ``index``."""
+        self._index = index
+        self._positions = [self._position(plan) for plan in self._plans]
+
+    def _position(self, plan: RenogyValuePlan) -> Optional[int]:
+        """Return the position of the field of ``plan`` in the bound index."""
+        if self._index is None or plan.field is None:
+            return None
+        return self._index.add(plan.field)
+
+    def evaluate(
+        self, data: Mapping[str, Any], changed_keys: Optional[Iterable[str]] = None
+    ) -> None:
+        """Evaluate the plans for ``data``, only changed fields if known."""
+        plans = self._plans
+        values = self._values
+        record = data if isinstance(data, RenogyDataRecord) else None
+        if record is not None and record.index is not self._index:
+            self._bind(record.index)
+        positions = self._positions
+        everything = self._dirty or self._data is None or changed_keys is None
+        changed: set[str] = set()
+        if not everything and changed_keys is not None:
+            changed = (
+                changed_keys if isinstance(changed_keys, set) else set(changed_keys)
+            )
+        for slot, plan in enumerate(plans):
+            field = plan.field
+            if not everything and field is not None and field not in changed:
+                continue
+            position = positions[slot]
+            if record is not None and position is not None:
+                values[slot] = plan.validate(record.value_at(position))
+            else:
+                values[slot] = plan.extract(data)
+        self._data = data
+        self._dirty = False
+
+    def is_current(self, data: Any) -> bool:
+        """Return True if the slots hold the values of ``data``."""
+        return not self._dirty and data is not None and data is self._data
+
+    def value(self, slot: int) -> Any:
+        """Return the value evaluated for ``slot``."""
+        return self._values[slot]
+
+    def __len__(self) -> int:
+        """Return the number of registered plans."""
+        return len(self._plans)
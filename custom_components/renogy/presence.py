@@ -0,0 +1,81 @@
+"""Advertisement presence tracking for Renogy BLE devices."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Mapping, Optional
+
+from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+from homeassistant.core import callback
+
+from .const import DEFAULT_PRESENCE_WINDOW, RENOGY_MANUFACTURER_ID
+
+
+class RenogyPresenceTracker:
+    """Track when a device was last heard advertising.
+
+    Every advertisement of the device marks it present, whether it came from
+    a connectable scanner or a passive one, and whether it carried a name or
+    only the Renogy manufacturer data. A device that stayed silent for longer
+    than ``window`` seconds is out of range: its polls are skipped instead of
+    running into connect timeouts until it advertises again. Right after
+    startup a device gets one window to be heard before it counts as absent.
+    """
+
+    def __init__(
+        self,
+        window: float = DEFAULT_PRESENCE_WINDOW,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the tracker."""
+        self.window = window
+        self._clock = clock
+        self._started = clock()
+        self.last_seen: Optional[float] = None
+        self.last_manufacturer_seen: Optional[float] = None
+        self.last_rssi: Optional[int] = None
+        self.advertisements = 0
+        self.skipped_polls = 0
+
+    @property
+    def is_present(self) -> bool:
+        """Return True if the device advertised within the window."""
+        reference = self._started if self.last_seen is None else self.last_seen
+        return self._clock() - reference <= self.window
+
+    @callback
+    def async_seen(self, service_info: BluetoothServiceInfoBleak) -> bool:
+        """Record an advertisement and return True if the device was absent."""
+        was_present = self.is_present
+        now = self._clock()
+        self.last_seen = now
+        self.advertisements += 1
+        rssi = getattr(service_info, "rssi", None)
+        if isinstance(rssi, int):
+            self.last_rssi = rssi
+        manufacturer_data = getattr(service_info, "manufacturer_data", None)
+        if (
+            isinstance(manufacturer_data, Mapping)
+            and RENOGY_MANUFACTURER_ID in manufacturer_data
+        ):
+            self.last_manufacturer_seen = now
+        return not was_present
+
+    def async_get_stats(self) -> dict[str, Any]:
+        """Return presence and advertisement statistics."""
+        now = self._clock()
+        return {
+            "present": self.is_present,
+            "window": self.window,
+            "seconds_since_seen": (
+                None if self.last_seen is None else round(now - self.last_seen, 1)
+            ),
+            "seconds_since_manufacturer_data": (
+                None
+                if self.last_manufacturer_seen is None
+                else round(now - self.last_manufacturer_seen, 1)
+            ),
+            "last_rssi": self.last_rssi,
+            "advertisements": self.advertisements,
+            "skipped_polls": self.skipped_polls,
+        }
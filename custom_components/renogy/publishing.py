@@ -0,0 +1,88 @@
+"""Sensor state publishing policies for Renogy BLE devices."""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from .const import (
+    DEFAULT_PUBLISH_DEADBAND,
+    DEFAULT_PUBLISH_HEARTBEAT,
+    DEFAULT_PUBLISH_MIN_INTERVAL,
+)
+
+
+def _is_number(value: Any) -> bool:
+    """Return True for int and float values, but not for booleans."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class RenogyPublishPolicy:
+    """Decide when a sensor writes a new state.
+
+    A value within the deadband of the last written one, absolute or
+    relative to it, is not written. Neither is a change sooner than
+    ``min_interval`` seconds after the last write, it is written once the
+    interval has passed instead. ``heartbeat`` forces a write every so many
+    seconds, so values held back by the deadband still get recorded.
+    """
+
+    __slots__ = ("deadband", "deadband_relative", "min_interval", "heartbeat")
+
+    def __init__(
+        self,
+        deadband: Optional[float] = None,
+        deadband_relative: Optional[float] = None,
+        min_interval: float = 0,
+        heartbeat: float = 0,
+    ) -> None:
+        """Initialize the policy."""
+        self.deadband = deadband
+        self.deadband_relative = deadband_relative
+        self.min_interval = min_interval
+        self.heartbeat = heartbeat
+
+    def within_deadband(self, previous: Any, value: Any) -> bool:
+        """Return True if ``value`` is too close to ``previous`` to write."""
+        if not (_is_number(previous) and _is_number(value)):
+            return False
+        delta = abs(value - previous)
+        if self.deadband is not None and delta <= self.deadband:
+            return True
+        return (
+            self.deadband_relative is not None
+            and delta <= abs(previous) * self.deadband_relative
+        )
+
+    def deferral(self, since_last_write: float) -> float:
+        """Return how many seconds a change has to wait for the min interval."""
+        return max(0.0, self.min_interval - since_last_write)
+
+
+class RenogyPublishSettings:
+    """The publishing options of a config entry."""
+
+    __slots__ = ("deadband", "min_interval", "heartbeat")
+
+    def __init__(
+        self,
+        deadband: bool = DEFAULT_PUBLISH_DEADBAND,
+        min_interval: float = DEFAULT_PUBLISH_MIN_INTERVAL,
+        heartbeat: float = DEFAULT_PUBLISH_HEARTBEAT,
+    ) -> None:
+        """Initialize the settings."""
+        self.deadband = deadband
+        self.min_interval = min_interval
+        self.heartbeat = heartbeat
+
+    def policy(
+        self,
+        deadband: Optional[float] = None,
+        deadband_relative: Optional[float] = None,
+    ) -> RenogyPublishPolicy:
+        """Return the policy of a sensor with the given deadbands."""
+        return RenogyPublishPolicy(
+            deadband if self.deadband else None,
+            deadband_relative if self.deadband else None,
+            self.min_interval,
+            self.heartbeat,
+        )
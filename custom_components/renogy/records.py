@@ -0,0 +1,166 @@
+"""Compact, immutable data records of Renogy BLE devices."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, Optional
+
+# Marks a field the record has no value for
+_MISSING: Any = object()
+
+
+class RenogyFieldIndex:
+    """Stable positions of the data fields of one device.
+
+    Register map fields come first, in map order. Fields first seen in the
+    data of the device are appended, so a position never changes while the
+    device is loaded and can be resolved once by whoever reads the records.
+    """
+
+    __slots__ = ("device_type", "_fields", "_positions")
+
+    def __init__(self, device_type: str, fields: Iterable[str] = ()) -> None:
+        """Initialize the index."""
+        self.device_type = device_type
+        self._fields: list[str] = []
+        self._positions: dict[str, int] = {}
+        for field in fields:
+            self.add(field)
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """Return the field names in position order."""
+        return tuple(self._fields)
+
+    def position(self, field: str) -> Optional[int]:
+        """Return the position of ``field``, or None if it was never seen."""
+        return self._positions.get(field)
+
+    def add(self, field: str) -> int:
+        """Return the position of ``field``, appending it if it is new."""
+        position = self._positions.get(field)
+        if position is None:
+            position = self._positions[field] = len(self._fields)
+            self._fields.append(field)
+        return position
+
+    def __len__(self) -> int:
+        """Return the number of known fields."""
+        return len(self._fields)
+
+
+class RenogyDataRecord(Mapping[str, Any]):
+    """Immutable snapshot of the data of one poll.
+
+    The values live in a tuple laid out by the field index of the device,
+    which is much smaller than a dict with the same keys and can be
+    handed to listeners, the last-data snapshot and the next poll without
+    copying. As a read-only mapping it works wherever the parsed data dict
+    did.
+    """
+
+    __slots__ = ("_index", "_values", "_size")
+
+    def __init__(
+        self, index: RenogyFieldIndex, values: tuple[Any, ...], size: int
+    ) -> None:
+        """Initialize the record, use from_mapping to build one."""
+        self._index = index
+        self._values = values
+        self._size = size
+
+    @classmethod
+    def from_mapping(
+        cls, index: RenogyFieldIndex, data: Mapping[str, Any]
+    ) -> RenogyDataRecord:
+        """Return a record of ``data`` laid out by ``index``."""
+        if isinstance(data, RenogyDataRecord) and data._index is index:
+            return data
+        positions = [index.add(key) for key in data]
+        values = [_MISSING] * len(index)
+        for position, value in zip(positions, data.values()):
+            values[position] = value
+        return cls(index, tuple(values), len(positions))
+
+    @property
+    def index(self) -> RenogyFieldIndex:
+        """Return the field index the record is laid out by."""
+        return self._index
+
+    def value_at(self, position: int) -> Any:
+        """Return the value at a field position, or None if there is none."""
+        if position >= len(self._values):
+            return None
+        value = self._values[position]
+        return None if value is _MISSING else value
+
+    def replace(self, changes: Mapping[str, Any]) -> RenogyDataRecord:
+        """Return a copy of the record with ``changes`` applied."""
+        positions = [self._index.add(key) for key in changes]
+        values = list(self._values)
+        values.extend([_MISSING] * (len(self._index) - len(values)))
+        size = self._size
+        for position, value in zip(positions, changes.values()):
+            if values[position] is _MISSING:
+                size += 1
+            values[position] = value
+        return RenogyDataRecord(self._index, tuple(values), size)
+
+    def changed_keys(self, previous: Mapping[str, Any]) -> set[str]:
+        """Return the keys whose value differs from ``previous``."""
+        if not isinstance(previous, RenogyDataRecord) or (
+            previous._index is not self._index
+        ):
+            changed = {
+                key
+                for key, value in self.items()
+                if key not in previous or previous[key] != value
+            }
+            changed.update(key for key in previous if key not in self)
+            return changed
+
+        fields = self._index._fields
+        old_values = previous._values
+        old_length = len(old_values)
+        changed = set()
+        for position, value in enumerate(self._values):
+            old = old_values[position] if position < old_length else _MISSING
+            if value is not old and value != old:
+                changed.add(fields[position])
+        for position in range(len(self._values), old_length):
+            if old_values[position] is not _MISSING:
+                changed.add(fields[position])
+        return changed
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of ``key``, or ``default``."""
+        position = self._index._positions.get(key)
+        if position is None or position >= len(self._values):
+            return default
+        value = self._values[position]
+        return default if value is _MISSING else value
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value of ``key``."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if the record has a value for ``key``."""
+        return isinstance(key, str) and self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the keys that have a value."""
+        for field, value in zip(self._index._fields, self._values):
+            if value is not _MISSING:
+                yield field
+
+    def __len__(self) -> int:
+        """Return the number of keys that have a value."""
+        return self._size
+
+    def __repr__(self) -> str:
+        """Return the record as a dict would show it."""
+        return f"{type(self).__name__}({dict(self.items())!r})"
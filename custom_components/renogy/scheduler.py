@@ -0,0 +1,266 @@
+"""Connection and operation scheduling for Renogy BLE devices."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+
+from .const import DEFAULT_MAX_CONNECTIONS, LOGGER
+
+# Number of recent queue wait samples kept per adapter
+WAIT_TIME_SAMPLES = 100
+
+
+class _AdapterQueue:
+    """Slot bookkeeping for a single Bluetooth adapter or proxy."""
+
+    def __init__(self) -> None:
+        """Initialize the queue."""
+        self.active = 0
+        self.waiters: deque[asyncio.Future[None]] = deque()
+        self.wait_times: deque[float] = deque(maxlen=WAIT_TIME_SAMPLES)
+        self.total_slots = 0
+        # Held slots whose connection is open but idle, oldest first, with
+        # the callback that closes the connection
+        self.idle: dict[str, Callable[[], None]] = {}
+
+
+class RenogyConnectionScheduler:
+    """Arbitrate BLE connection slots per adapter or proxy.
+
+    Every poll and write asks for a slot on the adapter the device was last
+    seen through. At most ``max_connections`` slots are handed out per adapter
+    at a time; further requests wait in FIFO order so that no device can starve
+    the others.
+
+    A device that keeps its connection open between transactions keeps its
+    slot too, so the limit caps open connections. While it is idle it is
+    asked to close the connection as soon as another device has to wait.
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS) -> None:
+        """Initialize the scheduler."""
+        self.max_connections = max(1, max_connections)
+        self._queues: dict[str, _AdapterQueue] = {}
+
+    def async_set_max_connections(self, max_connections: int) -> None:
+        """Change the concurrency limit applied to every adapter."""
+        self.max_connections = max(1, max_connections)
+        for queue in self._queues.values():
+            self._async_drain(queue)
+            if queue.waiters:
+                self._async_close_idle(queue)
+
+    @asynccontextmanager
+    async def async_slot(self, source: str, address: str) -> AsyncIterator[float]:
+        """Hold a connection slot on ``source`` and yield the queue wait time."""
+        wait_time = await self.async_acquire(source, address)
+        try:
+            yield wait_time
+        finally:
+            self.async_release(source)
+
+    async def async_acquire(self, source: str, address: str) -> float:
+        """Take a connection slot on ``source`` and return the queue wait time.
+
+        The slot is held until ``async_release`` is called.
+        """
+        queue = self._queues.setdefault(source, _AdapterQueue())
+        start = time.monotonic()
+
+        if queue.active < self.max_connections and not queue.waiters:
+            queue.active += 1
+        else:
+            LOGGER.debug(
+                "Queueing %s for a connection slot on %s (%s active, %s waiting)",
+                address,
+                source,
+                queue.active,
+                len(queue.waiters),
+            )
+            waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            queue.waiters.append(waiter)
+            self._async_close_idle(queue)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over right before we got cancelled
+                    self.async_release(source)
+                else:
+                    with contextlib.suppress(ValueError):
+                        queue.waiters.remove(waiter)
+                raise
+
+        wait_time = time.monotonic() - start
+        queue.wait_times.append(wait_time)
+        queue.total_slots += 1
+        return wait_time
+
+    def async_release(self, source: str, address: str | None = None) -> None:
+        """Hand a released slot to the next waiter or free it."""
+        queue = self._queues[source]
+        if address is not None:
+            queue.idle.pop(address, None)
+        queue.active -= 1
+        self._async_drain(queue)
+
+    def async_set_idle(
+        self, source: str, address: str, close: Callable[[], None]
+    ) -> None:
+        """Mark the held slot of an open but idle connection.
+
+        ``close`` is called once another device waits for a slot, it should
+        close the connection and release the slot.
+        """
+        queue = self._queues[source]
+        queue.idle[address] = close
+        if queue.waiters:
+            self._async_close_idle(queue)
+
+    def async_set_busy(self, source: str, address: str) -> None:
+        """Mark the held slot of an idle connection as used again."""
+        queue = self._queues.get(source)
+        if queue is not None:
+            queue.idle.pop(address, None)
+
+    def async_get_stats(self) -> dict[str, dict[str, Any]]:
+        """Return slot usage and queue wait statistics per adapter."""
+        stats: dict[str, dict[str, Any]] = {}
+        for source, queue in self._queues.items():
+            wait_times = list(queue.wait_times)
+            stats[source] = {
+                "max_connections": self.max_connections,
+                "active": queue.active,
+                "idle": len(queue.idle),
+                "queued": len(queue.waiters),
+                "total_slots": queue.total_slots,
+                "wait_time_last": wait_times[-1] if wait_times else None,
+                "wait_time_avg": (
+                    sum(wait_times) / len(wait_times) if wait_times else None
+                ),
+                "wait_time_max": max(wait_times) if wait_times else None,
+            }
+        return stats
+
+    def _async_drain(self, queue: _AdapterQueue) -> None:
+        """Wake waiters while the adapter has free slots."""
+        while queue.waiters and queue.active < self.max_connections:
+            waiter = queue.waiters.popleft()
+            if waiter.done():
+                continue
+            queue.active += 1
+            waiter.set_result(None)
+
+    def _async_close_idle(self, queue: _AdapterQueue) -> None:
+        """Ask the oldest idle connection to close for a waiting device."""
+        if not queue.idle:
+            return
+        address = next(iter(queue.idle))
+        close = queue.idle.pop(address)
+        LOGGER.debug("Closing idle connection to %s for a waiting device", address)
+        close()
+
+
+# Kinds of device operations, by priority: lower values run first
+OPERATION_WRITE = "write"
+OPERATION_POLL = "poll"
+OPERATION_PRIORITIES = {OPERATION_WRITE: 0, OPERATION_POLL: 1}
+
+
+class RenogyOperationQueue:
+    """Run the BLE transactions of one device one at a time, by priority.
+
+    Writes requested by the user go ahead of polls that are still waiting and
+    run as soon as the current transaction finishes, so a busy poll loop can't
+    hold them back. Operations of the same kind run in request order.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the queue."""
+        self._active: str | None = None
+        self._waiters: list[tuple[int, int, str, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self.max_depth = 0
+        self.preemptions = 0
+        self.completed: dict[str, int] = dict.fromkeys(OPERATION_PRIORITIES, 0)
+
+    @property
+    def depth(self) -> int:
+        """Return the number of operations waiting for their turn."""
+        return len(self._waiters)
+
+    @property
+    def active(self) -> str | None:
+        """Return the kind of the running operation, if any."""
+        return self._active
+
+    def pending(self, kind: str) -> int:
+        """Return the number of waiting operations of ``kind``."""
+        return sum(1 for *_, waiting, _ in self._waiters if waiting == kind)
+
+    @asynccontextmanager
+    async def async_run(self, kind: str) -> AsyncIterator[float]:
+        """Run an operation of ``kind`` exclusively and yield its wait time."""
+        priority = OPERATION_PRIORITIES[kind]
+        start = time.monotonic()
+
+        if self._active is not None:
+            waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            entry = (priority, next(self._sequence), kind, waiter)
+            if any(queued[0] > priority for queued in self._waiters):
+                self.preemptions += 1
+            heapq.heappush(self._waiters, entry)
+            self.max_depth = max(self.max_depth, len(self._waiters))
+            LOGGER.debug(
+                "Queueing %s behind running %s (%s waiting)",
+                kind,
+                self._active,
+                len(self._waiters),
+            )
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The turn was handed over right before we got cancelled
+                    self._async_release()
+                else:
+                    with contextlib.suppress(ValueError):
+                        self._waiters.remove(entry)
+                        heapq.heapify(self._waiters)
+                raise
+
+        self._active = kind
+        try:
+            yield time.monotonic() - start
+        finally:
+            self.completed[kind] += 1
+            self._async_release()
+
+    def async_get_stats(self) -> dict[str, Any]:
+        """Return queue depth and throughput statistics."""
+        return {
+            "active": self._active,
+            "depth": self.depth,
+            "pending": {kind: self.pending(kind) for kind in OPERATION_PRIORITIES},
+            "max_depth": self.max_depth,
+            "preemptions": self.preemptions,
+            "completed": dict(self.completed),
+        }
+
+    def _async_release(self) -> None:
+        """Hand the device to the next waiting operation, or free it."""
+        while self._waiters:
+            _, _, kind, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                continue
+            self._active = kind
+            waiter.set_result(None)
+            return
+        self._active = None
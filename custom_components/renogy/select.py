@@ -242,7 +242,9 @@ class RenogyBatteryTypeSelect(SelectEntity):
     async def async_added_to_hass(self) -> None:
         """Run when entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self._handle_coordinator_update)
+            self.coordinator.async_add_listener(
+                self._handle_coordinator_update, (self.entity_description.key,)
+            )
         )
 
     def _handle_coordinator_update(self) -> None:
@@ -371,7 +373,9 @@ class RenogyMaxCurrentSelect(SelectEntity):
     async def async_added_to_hass(self) -> None:
         """Run when entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self._handle_coordinator_update)
+            self.coordinator.async_add_listener(
+                self._handle_coordinator_update, (self.entity_description.key,)
+            )
         )
 
     def _handle_coordinator_update(self) -> None:
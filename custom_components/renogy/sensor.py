@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import asyncio
+import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional
 
 from homeassistant.components.bluetooth.passive_update_coordinator import (
     PassiveBluetoothCoordinatorEntity,
@@ -24,22 +24,38 @@ from homeassistant.const import (
     UnitOfEnergy,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 
 from .ble import RenogyActiveBluetoothCoordinator, RenogyBLEDevice
 from .const import (
     ATTR_MANUFACTURER,
     CONF_DEVICE_TYPE,
+    DEFAULT_COUNT_DECREASE_POLLS,
     DEFAULT_DEVICE_TYPE,
     DOMAIN,
     LOGGER,
     RENOGY_BT_PREFIX,
     DeviceType,
 )
+from .plans import RenogyValuePlan, RenogyValuePlans
+from .publishing import RenogyPublishPolicy, RenogyPublishSettings
+from .timing import (
+    PHASE_CONNECT,
+    PHASE_FAN_OUT,
+    PHASE_MODBUS,
+    PHASE_PARSE,
+    PHASE_READ,
+    PHASE_SERVICES,
+    PHASE_SLOT_WAIT,
+    PHASE_TOTAL,
+)
 
 # Registry of sensor keys
 KEY_BATTERY_VOLTAGE = "battery_voltage"
@@ -135,8 +151,27 @@ KEY_TEMPERATURE_PREFIX = "temperature_"
 class RenogyBLESensorDescription(SensorEntityDescription):
     """Describes a Renogy BLE sensor."""
 
-    # Function to extract value from the device's parsed data
-    value_fn: Optional[Callable[[Dict[str, Any]], Any]] = None
+    # Data key the value is read from
+    field: Optional[str] = None
+    # Function to compute the value from the parsed data, instead of a field
+    value_fn: Optional[Callable[[Mapping[str, Any]], Any]] = None
+    # Factor applied to the raw value, e.g. 0.001 for Wh to kWh
+    scale: Optional[float] = None
+    # Plausible range, overrides the one of the device class
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    # Changes not worth a new state when deadbands are enabled, absolute or
+    # relative to the last written value. Override the device class default
+    deadband: Optional[float] = None
+    deadband_relative: Optional[float] = None
+
+
+@dataclass
+class RenogyPollTimingSensorDescription(RenogyBLESensorDescription):
+    """Describes a poll timing diagnostic sensor."""
+
+    # Poll phase reported by the sensor
+    phase: str = PHASE_TOTAL
 
 
 BATTERY_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
@@ -146,7 +181,7 @@ BATTERY_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_BATTERY_VOLTAGE),
+        field=KEY_BATTERY_VOLTAGE,
     ),
     RenogyBLESensorDescription(
         key=KEY_BATTERY_CURRENT,
@@ -154,7 +189,7 @@ BATTERY_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_BATTERY_CURRENT),
+        field=KEY_BATTERY_CURRENT,
     ),
     RenogyBLESensorDescription(
         key=KEY_BATTERY_PERCENTAGE,
@@ -162,7 +197,7 @@ BATTERY_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.BATTERY,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_BATTERY_PERCENTAGE),
+        field=KEY_BATTERY_PERCENTAGE,
     ),
     RenogyBLESensorDescription(
         key=KEY_BATTERY_TEMPERATURE,
@@ -170,13 +205,13 @@ BATTERY_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_BATTERY_TEMPERATURE),
+        field=KEY_BATTERY_TEMPERATURE,
     ),
     RenogyBLESensorDescription(
         key=KEY_BATTERY_TYPE,
         name="Battery Type",
         device_class=None,
-        value_fn=lambda data: data.get(KEY_BATTERY_TYPE),
+        field=KEY_BATTERY_TYPE,
     ),
     RenogyBLESensorDescription(
         key=KEY_CHARGING_AMP_HOURS_TODAY,
@@ -184,7 +219,7 @@ BATTERY_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement="Ah",
         device_class=None,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(KEY_CHARGING_AMP_HOURS_TODAY),
+        field=KEY_CHARGING_AMP_HOURS_TODAY,
     ),
     RenogyBLESensorDescription(
         key=KEY_DISCHARGING_AMP_HOURS_TODAY,
@@ -192,13 +227,13 @@ BATTERY_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement="Ah",
         device_class=None,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(KEY_DISCHARGING_AMP_HOURS_TODAY),
+        field=KEY_DISCHARGING_AMP_HOURS_TODAY,
     ),
     RenogyBLESensorDescription(
         key=KEY_CHARGING_STATUS,
         name="Charging Status",
         device_class=None,
-        value_fn=lambda data: data.get(KEY_CHARGING_STATUS),
+        field=KEY_CHARGING_STATUS,
     ),
 )
 
@@ -209,7 +244,7 @@ PV_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_PV_VOLTAGE),
+        field=KEY_PV_VOLTAGE,
     ),
     RenogyBLESensorDescription(
         key=KEY_PV_CURRENT,
@@ -217,7 +252,7 @@ PV_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_PV_CURRENT),
+        field=KEY_PV_CURRENT,
     ),
     RenogyBLESensorDescription(
         key=KEY_PV_POWER,
@@ -225,7 +260,7 @@ PV_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_PV_POWER),
+        field=KEY_PV_POWER,
     ),
     RenogyBLESensorDescription(
         key=KEY_MAX_CHARGING_POWER_TODAY,
@@ -233,7 +268,7 @@ PV_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_MAX_CHARGING_POWER_TODAY),
+        field=KEY_MAX_CHARGING_POWER_TODAY,
     ),
     RenogyBLESensorDescription(
         key=KEY_POWER_GENERATION_TODAY,
@@ -241,7 +276,7 @@ PV_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(KEY_POWER_GENERATION_TODAY),
+        field=KEY_POWER_GENERATION_TODAY,
     ),
     RenogyBLESensorDescription(
         key=KEY_POWER_GENERATION_TOTAL,
@@ -249,11 +284,8 @@ PV_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: (
-            None
-            if data.get(KEY_POWER_GENERATION_TOTAL) is None
-            else data.get(KEY_POWER_GENERATION_TOTAL) / 1000
-        ),
+        field=KEY_POWER_GENERATION_TOTAL,
+        scale=0.001,
     ),
 )
 
@@ -264,7 +296,7 @@ LOAD_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_LOAD_VOLTAGE),
+        field=KEY_LOAD_VOLTAGE,
     ),
     RenogyBLESensorDescription(
         key=KEY_LOAD_CURRENT,
@@ -272,7 +304,7 @@ LOAD_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_LOAD_CURRENT),
+        field=KEY_LOAD_CURRENT,
     ),
     RenogyBLESensorDescription(
         key=KEY_LOAD_POWER,
@@ -280,13 +312,13 @@ LOAD_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_LOAD_POWER),
+        field=KEY_LOAD_POWER,
     ),
     RenogyBLESensorDescription(
         key=KEY_LOAD_STATUS,
         name="Load Status",
         device_class=None,
-        value_fn=lambda data: data.get(KEY_LOAD_STATUS),
+        field=KEY_LOAD_STATUS,
     ),
     RenogyBLESensorDescription(
         key=KEY_POWER_CONSUMPTION_TODAY,
@@ -294,7 +326,7 @@ LOAD_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(KEY_POWER_CONSUMPTION_TODAY),
+        field=KEY_POWER_CONSUMPTION_TODAY,
     ),
 )
 
@@ -305,21 +337,21 @@ CONTROLLER_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_CONTROLLER_TEMPERATURE),
+        field=KEY_CONTROLLER_TEMPERATURE,
     ),
     RenogyBLESensorDescription(
         key=KEY_DEVICE_ID,
         name="Device ID",
         device_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_DEVICE_ID),
+        field=KEY_DEVICE_ID,
     ),
     RenogyBLESensorDescription(
         key=KEY_MODEL,
         name="Model",
         device_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_MODEL),
+        field=KEY_MODEL,
     ),
     RenogyBLESensorDescription(
         key=KEY_MAX_DISCHARGING_POWER_TODAY,
@@ -327,7 +359,7 @@ CONTROLLER_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_MAX_DISCHARGING_POWER_TODAY),
+        field=KEY_MAX_DISCHARGING_POWER_TODAY,
     ),
 )
 
@@ -340,7 +372,7 @@ DCC_BATTERY_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.BATTERY,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_BATTERY_SOC),
+        field=KEY_BATTERY_SOC,
     ),
     RenogyBLESensorDescription(
         key=KEY_BATTERY_VOLTAGE,
@@ -348,7 +380,7 @@ DCC_BATTERY_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_BATTERY_VOLTAGE),
+        field=KEY_BATTERY_VOLTAGE,
     ),
     RenogyBLESensorDescription(
         key=KEY_TOTAL_CHARGING_CURRENT,
@@ -356,13 +388,13 @@ DCC_BATTERY_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_TOTAL_CHARGING_CURRENT),
+        field=KEY_TOTAL_CHARGING_CURRENT,
     ),
     RenogyBLESensorDescription(
         key=KEY_BATTERY_TYPE,
         name="Battery Type",
         device_class=None,
-        value_fn=lambda data: data.get(KEY_BATTERY_TYPE),
+        field=KEY_BATTERY_TYPE,
     ),
     RenogyBLESensorDescription(
         key=KEY_CONTROLLER_TEMPERATURE,
@@ -370,7 +402,7 @@ DCC_BATTERY_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_CONTROLLER_TEMPERATURE),
+        field=KEY_CONTROLLER_TEMPERATURE,
     ),
     RenogyBLESensorDescription(
         key=KEY_BATTERY_TEMPERATURE,
@@ -378,7 +410,7 @@ DCC_BATTERY_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_BATTERY_TEMPERATURE),
+        field=KEY_BATTERY_TEMPERATURE,
     ),
 )
 
@@ -389,7 +421,7 @@ DCC_ALTERNATOR_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_ALTERNATOR_VOLTAGE),
+        field=KEY_ALTERNATOR_VOLTAGE,
     ),
     RenogyBLESensorDescription(
         key=KEY_ALTERNATOR_CURRENT,
@@ -397,7 +429,7 @@ DCC_ALTERNATOR_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_ALTERNATOR_CURRENT),
+        field=KEY_ALTERNATOR_CURRENT,
     ),
     RenogyBLESensorDescription(
         key=KEY_ALTERNATOR_POWER,
@@ -405,7 +437,7 @@ DCC_ALTERNATOR_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_ALTERNATOR_POWER),
+        field=KEY_ALTERNATOR_POWER,
     ),
 )
 
@@ -416,7 +448,7 @@ DCC_SOLAR_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_SOLAR_VOLTAGE),
+        field=KEY_SOLAR_VOLTAGE,
     ),
     RenogyBLESensorDescription(
         key=KEY_SOLAR_CURRENT,
@@ -424,7 +456,7 @@ DCC_SOLAR_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_SOLAR_CURRENT),
+        field=KEY_SOLAR_CURRENT,
     ),
     RenogyBLESensorDescription(
         key=KEY_SOLAR_POWER,
@@ -432,7 +464,7 @@ DCC_SOLAR_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_SOLAR_POWER),
+        field=KEY_SOLAR_POWER,
     ),
 )
 
@@ -441,13 +473,13 @@ DCC_STATUS_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         key=KEY_DCC_CHARGING_STATUS,
         name="Charging Status",
         device_class=None,
-        value_fn=lambda data: data.get(KEY_DCC_CHARGING_STATUS),
+        field=KEY_DCC_CHARGING_STATUS,
     ),
     RenogyBLESensorDescription(
         key=KEY_CHARGING_MODE,
         name="Charging Mode",
         device_class=None,
-        value_fn=lambda data: data.get(KEY_CHARGING_MODE),
+        field=KEY_CHARGING_MODE,
     ),
     RenogyBLESensorDescription(
         key=KEY_OUTPUT_POWER,
@@ -455,13 +487,13 @@ DCC_STATUS_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_OUTPUT_POWER),
+        field=KEY_OUTPUT_POWER,
     ),
     RenogyBLESensorDescription(
         key=KEY_IGNITION_STATUS,
         name="Ignition Status",
         device_class=None,
-        value_fn=lambda data: data.get(KEY_IGNITION_STATUS),
+        field=KEY_IGNITION_STATUS,
     ),
 )
 
@@ -472,7 +504,7 @@ DCC_STATISTICS_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_DAILY_MIN_BATTERY_VOLTAGE),
+        field=KEY_DAILY_MIN_BATTERY_VOLTAGE,
     ),
     RenogyBLESensorDescription(
         key=KEY_DAILY_MAX_BATTERY_VOLTAGE,
@@ -480,7 +512,7 @@ DCC_STATISTICS_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_DAILY_MAX_BATTERY_VOLTAGE),
+        field=KEY_DAILY_MAX_BATTERY_VOLTAGE,
     ),
     RenogyBLESensorDescription(
         key=KEY_DAILY_MAX_CHARGING_CURRENT,
@@ -488,7 +520,7 @@ DCC_STATISTICS_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_DAILY_MAX_CHARGING_CURRENT),
+        field=KEY_DAILY_MAX_CHARGING_CURRENT,
     ),
     RenogyBLESensorDescription(
         key=KEY_DAILY_MAX_CHARGING_POWER,
@@ -496,7 +528,7 @@ DCC_STATISTICS_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_DAILY_MAX_CHARGING_POWER),
+        field=KEY_DAILY_MAX_CHARGING_POWER,
     ),
     RenogyBLESensorDescription(
         key=KEY_DAILY_CHARGING_AH,
@@ -504,7 +536,7 @@ DCC_STATISTICS_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement="Ah",
         device_class=None,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(KEY_DAILY_CHARGING_AH),
+        field=KEY_DAILY_CHARGING_AH,
     ),
     RenogyBLESensorDescription(
         key=KEY_DAILY_POWER_GENERATION,
@@ -512,7 +544,7 @@ DCC_STATISTICS_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(KEY_DAILY_POWER_GENERATION),
+        field=KEY_DAILY_POWER_GENERATION,
     ),
     RenogyBLESensorDescription(
         key=KEY_TOTAL_OPERATING_DAYS,
@@ -520,7 +552,7 @@ DCC_STATISTICS_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement="days",
         device_class=None,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(KEY_TOTAL_OPERATING_DAYS),
+        field=KEY_TOTAL_OPERATING_DAYS,
     ),
     RenogyBLESensorDescription(
         key=KEY_TOTAL_CHARGING_AH,
@@ -528,7 +560,7 @@ DCC_STATISTICS_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement="Ah",
         device_class=None,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(KEY_TOTAL_CHARGING_AH),
+        field=KEY_TOTAL_CHARGING_AH,
     ),
     RenogyBLESensorDescription(
         key=KEY_TOTAL_POWER_GENERATION,
@@ -536,7 +568,7 @@ DCC_STATISTICS_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(KEY_TOTAL_POWER_GENERATION),
+        field=KEY_TOTAL_POWER_GENERATION,
     ),
     RenogyBLESensorDescription(
         key=KEY_TOTAL_OVERDISCHARGE_COUNT,
@@ -545,7 +577,7 @@ DCC_STATISTICS_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.TOTAL_INCREASING,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_TOTAL_OVERDISCHARGE_COUNT),
+        field=KEY_TOTAL_OVERDISCHARGE_COUNT,
     ),
     RenogyBLESensorDescription(
         key=KEY_TOTAL_FULL_CHARGE_COUNT,
@@ -554,7 +586,7 @@ DCC_STATISTICS_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         device_class=None,
         state_class=SensorStateClass.TOTAL_INCREASING,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_TOTAL_FULL_CHARGE_COUNT),
+        field=KEY_TOTAL_FULL_CHARGE_COUNT,
     ),
 )
 
@@ -564,14 +596,14 @@ DCC_DIAGNOSTIC_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         name="Device ID",
         device_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_DEVICE_ID),
+        field=KEY_DEVICE_ID,
     ),
     RenogyBLESensorDescription(
         key=KEY_MODEL,
         name="Model",
         device_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_MODEL),
+        field=KEY_MODEL,
     ),
     RenogyBLESensorDescription(
         key=KEY_SYSTEM_VOLTAGE,
@@ -579,21 +611,21 @@ DCC_DIAGNOSTIC_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_SYSTEM_VOLTAGE),
+        field=KEY_SYSTEM_VOLTAGE,
     ),
     RenogyBLESensorDescription(
         key=KEY_FAULT_HIGH,
         name="Fault Code High",
         device_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_FAULT_HIGH),
+        field=KEY_FAULT_HIGH,
     ),
     RenogyBLESensorDescription(
         key=KEY_FAULT_LOW,
         name="Fault Code Low",
         device_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_FAULT_LOW),
+        field=KEY_FAULT_LOW,
     ),
 )
 
@@ -619,7 +651,7 @@ BATTERY_LFP_MAIN_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_VOLTAGE),
+        field=KEY_VOLTAGE,
     ),
     RenogyBLESensorDescription(
         key=KEY_CURRENT,
@@ -627,7 +659,7 @@ BATTERY_LFP_MAIN_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_CURRENT),
+        field=KEY_CURRENT,
     ),
     RenogyBLESensorDescription(
         key=KEY_SOC,
@@ -635,7 +667,7 @@ BATTERY_LFP_MAIN_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.BATTERY,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_SOC),
+        field=KEY_SOC,
     ),
     RenogyBLESensorDescription(
         key=KEY_POWER,
@@ -643,7 +675,7 @@ BATTERY_LFP_MAIN_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_POWER),
+        field=KEY_POWER,
     ),
     RenogyBLESensorDescription(
         key=KEY_CAPACITY,
@@ -651,7 +683,7 @@ BATTERY_LFP_MAIN_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement="Ah",
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_CAPACITY),
+        field=KEY_CAPACITY,
     ),
     RenogyBLESensorDescription(
         key=KEY_REMAINING_CHARGE,
@@ -659,7 +691,7 @@ BATTERY_LFP_MAIN_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         native_unit_of_measurement="Ah",
         device_class=None,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_REMAINING_CHARGE),
+        field=KEY_REMAINING_CHARGE,
     ),
 )
 
@@ -669,32 +701,69 @@ BATTERY_LFP_DIAGNOSTIC_SENSORS: tuple[RenogyBLESensorDescription, ...] = (
         name="Device ID",
         device_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_DEVICE_ID),
+        field=KEY_DEVICE_ID,
     ),
     RenogyBLESensorDescription(
         key=KEY_MODEL,
         name="Model",
         device_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_MODEL),
+        field=KEY_MODEL,
     ),
     RenogyBLESensorDescription(
         key=KEY_CELL_COUNT,
         name="Cell Count",
         device_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_CELL_COUNT),
+        field=KEY_CELL_COUNT,
     ),
     RenogyBLESensorDescription(
         key=KEY_SENSOR_COUNT,
         name="Temperature Sensor Count",
         device_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_SENSOR_COUNT),
+        field=KEY_SENSOR_COUNT,
     ),
 )
 
 
+def _create_poll_timing_sensor(
+    phase: str, name: str, enabled: bool = False
+) -> RenogyPollTimingSensorDescription:
+    """Create the description of a poll phase timing sensor."""
+    return RenogyPollTimingSensorDescription(
+        key=f"poll_{phase}_time",
+        name=f"Poll {name} Time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=enabled,
+        phase=phase,
+    )
+
+
+# Poll timing sensors report the p95 of each phase over the recent polls
+POLL_TIMING_SENSORS: tuple[RenogyPollTimingSensorDescription, ...] = (
+    _create_poll_timing_sensor(PHASE_TOTAL, "Total", enabled=True),
+    _create_poll_timing_sensor(PHASE_SLOT_WAIT, "Slot Wait"),
+    _create_poll_timing_sensor(PHASE_READ, "Read"),
+    _create_poll_timing_sensor(PHASE_CONNECT, "Connect"),
+    _create_poll_timing_sensor(PHASE_SERVICES, "Services"),
+    _create_poll_timing_sensor(PHASE_MODBUS, "Modbus"),
+    _create_poll_timing_sensor(PHASE_PARSE, "Parse"),
+    _create_poll_timing_sensor(PHASE_FAN_OUT, "Fan-out"),
+)
+
+# Failed polls in a row, the data of the other sensors is stale while above 0
+POLL_FAILURES_SENSOR = RenogyBLESensorDescription(
+    key="poll_failures",
+    name="Failed Polls",
+    state_class=SensorStateClass.MEASUREMENT,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+
+
 def _create_cell_voltage_sensors() -> tuple[RenogyBLESensorDescription, ...]:
     """Create sensor descriptions for cell voltages (up to 16 cells)."""
     sensors = []
@@ -707,7 +776,10 @@ def _create_cell_voltage_sensors() -> tuple[RenogyBLESensorDescription, ...]:
                 native_unit_of_measurement=UnitOfElectricPotential.VOLT,
                 device_class=SensorDeviceClass.VOLTAGE,
                 state_class=SensorStateClass.MEASUREMENT,
-                value_fn=lambda data, k=key: data.get(k),
+                field=key,
+                min_value=0,
+                max_value=5,
+                deadband=0.005,
             )
         )
     return tuple(sensors)
@@ -725,7 +797,7 @@ def _create_temperature_sensors() -> tuple[RenogyBLESensorDescription, ...]:
                 native_unit_of_measurement=UnitOfTemperature.CELSIUS,
                 device_class=SensorDeviceClass.TEMPERATURE,
                 state_class=SensorStateClass.MEASUREMENT,
-                value_fn=lambda data, k=key: data.get(k),
+                field=key,
             )
         )
     return tuple(sensors)
@@ -734,6 +806,15 @@ def _create_temperature_sensors() -> tuple[RenogyBLESensorDescription, ...]:
 BATTERY_LFP_CELL_VOLTAGE_SENSORS = _create_cell_voltage_sensors()
 BATTERY_LFP_TEMPERATURE_SENSORS = _create_temperature_sensors()
 
+# Battery (LFP) sensors that exist once per cell or temperature probe. Only as
+# many as the battery reports in the count key are created.
+BATTERY_LFP_COUNTED_SENSORS: dict[
+    str, tuple[str, tuple[RenogyBLESensorDescription, ...]]
+] = {
+    KEY_CELL_COUNT: ("Cell Voltages", BATTERY_LFP_CELL_VOLTAGE_SENSORS),
+    KEY_SENSOR_COUNT: ("Temperatures", BATTERY_LFP_TEMPERATURE_SENSORS),
+}
+
 # All Battery (LFP) sensors combined
 BATTERY_LFP_ALL_SENSORS = (
     BATTERY_LFP_MAIN_SENSORS
@@ -763,12 +844,93 @@ SENSORS_BY_DEVICE_TYPE = {
     },
     DeviceType.BATTERY.value: {
         "Main": BATTERY_LFP_MAIN_SENSORS,
-        "Cell Voltages": BATTERY_LFP_CELL_VOLTAGE_SENSORS,
-        "Temperatures": BATTERY_LFP_TEMPERATURE_SENSORS,
         "Diagnostic": BATTERY_LFP_DIAGNOSTIC_SENSORS,
     },
 }
 
+# Device classes whose values are coerced to float, with their plausible range
+NUMERIC_DEVICE_CLASS_BOUNDS: dict[Any, tuple[float, float]] = {
+    SensorDeviceClass.VOLTAGE: (-1000, 10000),
+    SensorDeviceClass.CURRENT: (-1000, 10000),
+    SensorDeviceClass.TEMPERATURE: (-1000, 10000),
+    SensorDeviceClass.POWER: (-1000, 10000),
+    SensorDeviceClass.BATTERY: (0, 100),
+}
+
+
+# Deadbands of noisy device classes, about one step of their resolution
+DEFAULT_DEADBANDS: dict[Any, float] = {
+    SensorDeviceClass.VOLTAGE: 0.1,
+    SensorDeviceClass.TEMPERATURE: 0.5,
+}
+
+
+def publish_policy(
+    description: RenogyBLESensorDescription, settings: Optional[RenogyPublishSettings]
+) -> RenogyPublishPolicy:
+    """Return when a sensor writes states under the entry's settings."""
+    if settings is None:
+        return RenogyPublishPolicy()
+    deadband = description.deadband
+    if deadband is None and description.deadband_relative is None:
+        deadband = DEFAULT_DEADBANDS.get(description.device_class)
+    return settings.policy(deadband, description.deadband_relative)
+
+
+def compile_value_plan(description: RenogyBLESensorDescription) -> RenogyValuePlan:
+    """Compile how a sensor description extracts and validates its value."""
+    bounds = NUMERIC_DEVICE_CLASS_BOUNDS.get(description.device_class)
+    minimum = description.min_value
+    maximum = description.max_value
+    if bounds is not None:
+        minimum = bounds[0] if minimum is None else minimum
+        maximum = bounds[1] if maximum is None else maximum
+    return RenogyValuePlan(
+        description.key,
+        name=description.name if isinstance(description.name, str) else None,
+        field=description.field,
+        value_fn=description.value_fn,
+        numeric=bounds is not None or minimum is not None or maximum is not None,
+        scale=description.scale,
+        minimum=minimum,
+        maximum=maximum,
+    )
+
+
+# Value plans of every description, compiled once at import. The table is
+# never extended, the descriptions it is keyed by live as long as the module.
+_DESCRIPTION_PLANS: dict[int, tuple[RenogyBLESensorDescription, RenogyValuePlan]] = {
+    id(description): (description, compile_value_plan(description))
+    for descriptions in (
+        *(
+            descriptions
+            for groups in SENSORS_BY_DEVICE_TYPE.values()
+            for descriptions in groups.values()
+        ),
+        *(descriptions for _, descriptions in BATTERY_LFP_COUNTED_SENSORS.values()),
+    )
+    for description in descriptions
+}
+
+
+def value_plan(
+    description: RenogyBLESensorDescription,
+    plans: Optional[RenogyValuePlans] = None,
+) -> RenogyValuePlan:
+    """Return the value plan of a sensor description.
+
+    The plans of a device bind the plan of each sensor key, so a sensor
+    created again, for example after a cell count change, reuses it. Other
+    descriptions than those compiled at import are compiled on the spot.
+    """
+    plan = plans.get(description.key) if plans is not None else None
+    if plan is not None:
+        return plan
+    compiled = _DESCRIPTION_PLANS.get(id(description))
+    if compiled is not None and compiled[0] is description:
+        return compiled[1]
+    return compile_value_plan(description)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -793,22 +955,13 @@ async def async_setup_entry(
         or not coordinator.device.name.startswith(RENOGY_BT_PREFIX)
     ):
         LOGGER.debug("Waiting for real device name before creating entities...")
-        # Force an immediate refresh to try getting device info
-        await coordinator.async_request_refresh()
-
-        # Wait for a short time to see if we can get the real device name
-        # We'll wait up to 10 seconds, checking every second
-        real_name_found = False
-        for _ in range(10):
-            await asyncio.sleep(1)
-            if coordinator.device and coordinator.device.name.startswith(
-                RENOGY_BT_PREFIX
-            ):
-                LOGGER.debug("Real device name found: %s", coordinator.device.name)
-                real_name_found = True
-                break
+        # All platforms wait on the same initial refresh, which ends as soon
+        # as the first read attempt finished
+        await coordinator.async_wait_ready()
 
-        if not real_name_found:
+        if coordinator.device and coordinator.device.name.startswith(RENOGY_BT_PREFIX):
+            LOGGER.debug("Real device name found: %s", coordinator.device.name)
+        else:
             LOGGER.debug(
                 "No real device name found after waiting. "
                 "Using generic name for entities."
@@ -834,6 +987,13 @@ async def async_setup_entry(
     else:
         LOGGER.warning("No entities were created")
 
+    # Cell and temperature sensors follow the counts the battery reports
+    if device_type == DeviceType.BATTERY.value:
+        manager = RenogyCountedSensorManager(
+            hass, coordinator, device_entities, async_add_entities, device_type
+        )
+        config_entry.async_on_unload(manager.async_listen())
+
 
 def create_entities_helper(
     coordinator: RenogyActiveBluetoothCoordinator,
@@ -857,9 +1017,178 @@ def create_entities_helper(
             )
             entities.append(sensor)
 
+    # Per-cell and per-probe sensors only for what the device reports
+    if device_type == DeviceType.BATTERY.value:
+        data = _sensor_data(coordinator, device)
+        for count_key, (
+            category_name,
+            descriptions,
+        ) in BATTERY_LFP_COUNTED_SENSORS.items():
+            for description in descriptions[: _reported_count(data, count_key)]:
+                entities.append(
+                    RenogyBLESensor(
+                        coordinator, device, description, category_name, device_type
+                    )
+                )
+
+    # Poll timing diagnostics are the same for every device type
+    for description in POLL_TIMING_SENSORS:
+        entities.append(
+            RenogyPollTimingSensor(
+                coordinator, device, description, "Diagnostic", device_type
+            )
+        )
+    entities.append(
+        RenogyPollFailuresSensor(
+            coordinator, device, POLL_FAILURES_SENSOR, "Diagnostic", device_type
+        )
+    )
+
     return entities
 
 
+def _sensor_data(
+    coordinator: RenogyActiveBluetoothCoordinator, device: Optional[RenogyBLEDevice]
+) -> Mapping[str, Any]:
+    """Return the data sensors read, from the device or the coordinator."""
+    if device and device.parsed_data:
+        return device.parsed_data
+    return coordinator.data if isinstance(coordinator.data, Mapping) else {}
+
+
+def _reported_count(data: Mapping[str, Any], count_key: str) -> Optional[int]:
+    """Return the cell or probe count reported in ``data``, if it is known."""
+    value = data.get(count_key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    _, descriptions = BATTERY_LFP_COUNTED_SENSORS[count_key]
+    return max(0, min(int(value), len(descriptions)))
+
+
+class RenogyCountedSensorManager:
+    """Add and remove per-cell and per-probe sensors as the counts change.
+
+    A battery reports how many cells and temperature probes it has. Sensors
+    are only created for those, and when a count changes, for example after
+    the battery was swapped, the missing sensors are added right away. The
+    ones that no longer have values are only removed from the entity registry
+    once the lower count was reported by ``DEFAULT_COUNT_DECREASE_POLLS``
+    polls in a row. A count that is missing from the data or zero, as a bad
+    read reports it, leaves the sensors alone.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: RenogyActiveBluetoothCoordinator,
+        entities: List[RenogyBLESensor],
+        async_add_entities: AddEntitiesCallback,
+        device_type: str = DEFAULT_DEVICE_TYPE,
+    ) -> None:
+        """Initialize the manager with the sensors created at setup."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._async_add_entities = async_add_entities
+        self._device_type = device_type
+        self._device = next(
+            (entity._device for entity in entities if entity._device), None
+        )
+        counted_keys = {
+            description.key
+            for _, descriptions in BATTERY_LFP_COUNTED_SENSORS.values()
+            for description in descriptions
+        }
+        self._entities: Dict[str, RenogyBLESensor] = {
+            entity.entity_description.key: entity
+            for entity in entities
+            if entity.entity_description.key in counted_keys
+        }
+        # Per count key, the highest lower count seen in a row and how often
+        self._lower_counts: Dict[str, tuple[int, int]] = {}
+
+    @property
+    def sensor_keys(self) -> List[str]:
+        """Return the keys of the per-cell and per-probe sensors that exist."""
+        return list(self._entities)
+
+    @callback
+    def async_listen(self) -> Callable[[], None]:
+        """Follow the counts on every update of the coordinator.
+
+        A lower count that stays the same does not change the count keys, so
+        the manager listens to every update rather than only to those keys.
+        """
+        return self._coordinator.async_add_listener(self.async_handle_update)
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Match the sensors to the counts in the latest data."""
+        data = _sensor_data(self._coordinator, self._device)
+        added: List[RenogyBLESensor] = []
+        removed: List[str] = []
+        for count_key, (
+            category_name,
+            descriptions,
+        ) in BATTERY_LFP_COUNTED_SENSORS.items():
+            count = _reported_count(data, count_key)
+            if not count:
+                continue
+            for description in descriptions[:count]:
+                if description.key not in self._entities:
+                    entity = RenogyBLESensor(
+                        self._coordinator,
+                        self._device,
+                        description,
+                        category_name,
+                        self._device_type,
+                    )
+                    self._entities[description.key] = entity
+                    added.append(entity)
+            if not any(
+                description.key in self._entities
+                for description in descriptions[count:]
+            ):
+                self._lower_counts.pop(count_key, None)
+                continue
+            lower_count, polls = self._lower_counts.get(count_key, (count, 0))
+            lower_count = max(lower_count, count)
+            polls += 1
+            if polls < DEFAULT_COUNT_DECREASE_POLLS:
+                self._lower_counts[count_key] = (lower_count, polls)
+                continue
+            self._lower_counts.pop(count_key, None)
+            for description in descriptions[lower_count:]:
+                if self._entities.pop(description.key, None) is not None:
+                    removed.append(description.key)
+
+        if added:
+            LOGGER.debug(
+                "Adding %s cell and temperature sensors for %s",
+                len(added),
+                self._coordinator.address,
+            )
+            self._async_add_entities(added)
+        if removed:
+            self._async_remove(removed)
+
+    @callback
+    def _async_remove(self, keys: List[str]) -> None:
+        """Remove the sensors of ``keys`` from the entity registry."""
+        LOGGER.debug(
+            "Removing sensors %s of %s, the battery no longer reports them",
+            ", ".join(keys),
+            self._coordinator.address,
+        )
+        registry = er.async_get(self._hass)
+        for key in keys:
+            entity_id = registry.async_get_entity_id(
+                "sensor", DOMAIN, f"{self._coordinator.address}_{key}"
+            )
+            if entity_id:
+                # The entity removes itself when its registry entry is removed
+                registry.async_remove(entity_id)
+
+
 def create_coordinator_entities(
     coordinator: RenogyActiveBluetoothCoordinator,
     device_type: str = DEFAULT_DEVICE_TYPE,
@@ -896,7 +1225,8 @@ class RenogyBLESensor(PassiveBluetoothCoordinatorEntity, SensorEntity):
         device_type: str = DEFAULT_DEVICE_TYPE,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        # Only get notified when the data key this sensor reads changes
+        super().__init__(coordinator, context=(description.key,))
         self.entity_description = description
         self._device = device
         self._category = category
@@ -907,6 +1237,9 @@ class RenogyBLESensor(PassiveBluetoothCoordinatorEntity, SensorEntity):
         device_model = f"Renogy {device_type.capitalize()}"
         if device and device.parsed_data and KEY_MODEL in device.parsed_data:
             device_model = device.parsed_data[KEY_MODEL]
+        elif isinstance(coordinator.data, Mapping) and coordinator.data.get(KEY_MODEL):
+            # Restored or cached model, before the first poll
+            device_model = coordinator.data[KEY_MODEL]
 
         # Device-dependent properties
         if device:
@@ -939,7 +1272,31 @@ class RenogyBLESensor(PassiveBluetoothCoordinatorEntity, SensorEntity):
                 # Add device type as software version for clarity.
             )
 
+        # The coordinator evaluates the plans of all sensors once per update,
+        # the sensor then only reads its slot
+        plans = getattr(coordinator, "value_plans", None)
+        if not isinstance(plans, RenogyValuePlans):
+            plans = None
+        self._value_plan = value_plan(description, plans)
+        self._value_plans: Optional[RenogyValuePlans] = None
+        self._value_slot: Optional[int] = None
+        if plans is not None and self._value_plan.has_value:
+            self._value_plans = plans
+            self._value_slot = plans.register(self._value_plan)
+
         self._last_updated = None
+        # Last published (value, available, data source), used to skip
+        # state writes when a poll did not change anything.
+        self._last_published_state: Optional[tuple[Any, bool, Optional[str]]] = None
+        self._suppressed_writes = 0
+        # When states are written, from the publishing options of the entry
+        settings = getattr(coordinator, "publish_settings", None)
+        self._publish_policy = publish_policy(
+            description,
+            settings if isinstance(settings, RenogyPublishSettings) else None,
+        )
+        self._last_write_time = 0.0
+        self._unsub_publish: Optional[Callable[[], None]] = None
 
     @property
     def device(self) -> Optional[RenogyBLEDevice]:
@@ -1005,53 +1362,31 @@ class RenogyBLESensor(PassiveBluetoothCoordinatorEntity, SensorEntity):
         if self._attr_native_value is not None:
             return self._attr_native_value
 
-        device = self.device
-        data = None
+        # Evaluated by the coordinator for the data it published
+        plans = self._value_plans
+        if (
+            plans is not None
+            and self._value_slot is not None
+            and plans.is_current(self.coordinator.data)
+        ):
+            value = plans.value(self._value_slot)
+        else:
+            device = self.device
+            data = None
 
-        # Get data from device if available, otherwise from coordinator
-        if device and device.parsed_data:
-            data = device.parsed_data
-        elif self.coordinator.data:
-            data = self.coordinator.data
+            # Get data from device if available, otherwise from coordinator
+            if device and device.parsed_data:
+                data = device.parsed_data
+            elif self.coordinator.data:
+                data = self.coordinator.data
 
-        if not data:
-            return None
+            if not data:
+                return None
+            value = self._value_plan.extract(data)
 
-        try:
-            if self.entity_description.value_fn:
-                value = self.entity_description.value_fn(data)
-                # Basic type validation based on device_class
-                if value is not None:
-                    if self.device_class in [
-                        SensorDeviceClass.VOLTAGE,
-                        SensorDeviceClass.CURRENT,
-                        SensorDeviceClass.TEMPERATURE,
-                        SensorDeviceClass.POWER,
-                    ]:
-                        try:
-                            value = float(value)
-                            # Basic range validation
-                            if value < -1000 or value > 10000:
-                                LOGGER.warning(
-                                    "Value %s out of reasonable range for %s",
-                                    value,
-                                    self.name,
-                                )
-                                return None
-                        except (ValueError, TypeError):
-                            LOGGER.warning(
-                                "Invalid numeric value for %s: %s",
-                                self.name,
-                                value,
-                            )
-                            return None
-
-                # Cache the value
-                self._attr_native_value = value
-                return value
-        except Exception as e:
-            LOGGER.warning("Error getting native value for %s: %s", self.name, e)
-        return None
+        # Cache the value
+        self._attr_native_value = value
+        return value
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -1074,14 +1409,95 @@ class RenogyBLESensor(PassiveBluetoothCoordinatorEntity, SensorEntity):
             )
             self._attr_name = f"{self._device.name} {self.entity_description.name}"
 
-        self._last_updated = datetime.now()
-
         # Explicitly get our value before updating state, so it's cached
-        self.native_value
+        published_state = (self.native_value, self.available, self._data_source)
+
+        # Skip the state write if nothing visible changed since the last one,
+        # or the publishing policy holds the change back. RSSI and
+        # last_updated are refreshed on the next real write.
+        if self._is_suppressed(published_state):
+            self._suppressed_writes += 1
+            if hasattr(self.coordinator, "suppressed_state_writes"):
+                self.coordinator.suppressed_state_writes += 1
+            return
+
+        self._async_publish(published_state)
+
+    def _is_suppressed(self, state: tuple[Any, bool, Optional[str]]) -> bool:
+        """Return True if ``state`` should not be written now."""
+        last_state = self._last_published_state
+        if state == last_state:
+            return True
+        # Availability and data source changes are written right away
+        if last_state is None or state[1:] != last_state[1:]:
+            return False
+
+        policy = self._publish_policy
+        if policy.within_deadband(last_state[0], state[0]):
+            return True
+        delay = policy.deferral(time.monotonic() - self._last_write_time)
+        if delay > 0:
+            # Written once the min interval has passed
+            self._async_schedule_publish(delay)
+            return True
+        return False
+
+    @callback
+    def _async_publish(self, state: tuple[Any, bool, Optional[str]]) -> None:
+        """Write ``state`` and schedule the next heartbeat."""
+        self._last_published_state = state
+        self._last_updated = datetime.now()
+        self._last_write_time = time.monotonic()
 
         # Update entity state
         self.async_write_ha_state()
 
+        if self._publish_policy.heartbeat:
+            self._async_schedule_publish(self._publish_policy.heartbeat)
+        elif self._unsub_publish is not None:
+            self._unsub_publish()
+            self._unsub_publish = None
+
+    @callback
+    def _async_schedule_publish(self, delay: float) -> None:
+        """Write the current state after ``delay`` seconds."""
+        hass = getattr(self, "hass", None)
+        if hass is None:
+            return
+        if self._unsub_publish is not None:
+            self._unsub_publish()
+        self._unsub_publish = async_call_later(hass, delay, self._async_publish_later)
+
+    @callback
+    def _async_publish_later(self, _now: Any = None) -> None:
+        """Write a held back change or a heartbeat."""
+        self._unsub_publish = None
+        self._async_publish((self.native_value, self.available, self._data_source))
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending state write."""
+        if self._unsub_publish is not None:
+            self._unsub_publish()
+            self._unsub_publish = None
+        await super().async_will_remove_from_hass()
+
+    @property
+    def suppressed_writes(self) -> int:
+        """Return how many unchanged state writes this sensor skipped."""
+        return self._suppressed_writes
+
+    @property
+    def _data_source(self) -> Optional[str]:
+        """Return where the sensor value is read from."""
+        if self._device and self._device.parsed_data:
+            return "device"
+        if self.coordinator.data:
+            # Values restored from the last run until the first poll lands
+            if getattr(self.coordinator, "is_restored", False) is True:
+                return "restored"
+            return "coordinator"
+        return None
+
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """Return additional state attributes."""
@@ -1095,9 +1511,100 @@ class RenogyBLESensor(PassiveBluetoothCoordinatorEntity, SensorEntity):
             attrs["rssi"] = device.rssi
 
         # Add data source info
-        if self._device and self._device.parsed_data:
-            attrs["data_source"] = "device"
-        elif self.coordinator.data:
-            attrs["data_source"] = "coordinator"
+        data_source = self._data_source
+        if data_source:
+            attrs["data_source"] = data_source
+
+        return attrs
+
+
+class RenogyPollTimingSensor(RenogyBLESensor):
+    """Diagnostic sensor with the p95 duration of one poll phase."""
+
+    entity_description: RenogyPollTimingSensorDescription
+
+    def __init__(
+        self,
+        coordinator: RenogyActiveBluetoothCoordinator,
+        device: Optional[RenogyBLEDevice],
+        description: RenogyPollTimingSensorDescription,
+        category: str | None = None,
+        device_type: str = DEFAULT_DEVICE_TYPE,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, device, description, category, device_type)
+        # Timings change with every poll, not with a data key
+        self.coordinator_context = None
+
+    @property
+    def _phase_stats(self) -> Optional[Dict[str, Any]]:
+        """Return the rolling statistics of the phase, if it was measured."""
+        poll_timings = getattr(self.coordinator, "poll_timings", None)
+        if poll_timings is None:
+            return None
+        return poll_timings.phase_stats(self.entity_description.phase)
+
+    @property
+    def available(self) -> bool:
+        """Return True once the phase was measured at least once."""
+        return self._phase_stats is not None
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the p95 duration of the phase in milliseconds."""
+        stats = self._phase_stats
+        if stats is None:
+            return None
+        return round(stats["p95"] * 1000, 1)
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the other percentiles of the phase."""
+        attrs = super().extra_state_attributes
+        stats = self._phase_stats
+        if stats:
+            for name in ("p50", "p95", "max", "last"):
+                attrs[f"{name}_ms"] = round(stats[name] * 1000, 1)
+            attrs["samples"] = stats["samples"]
+        return attrs
+
+
+class RenogyPollFailuresSensor(RenogyBLESensor):
+    """Diagnostic sensor with the number of failed polls in a row.
 
+    The other sensors keep their last values for a few failed polls instead
+    of turning unavailable, this sensor tells whether those values are stale.
+    """
+
+    def __init__(
+        self,
+        coordinator: RenogyActiveBluetoothCoordinator,
+        device: Optional[RenogyBLEDevice],
+        description: RenogyBLESensorDescription,
+        category: str | None = None,
+        device_type: str = DEFAULT_DEVICE_TYPE,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, device, description, category, device_type)
+        # Failures don't change any data key
+        self.coordinator_context = None
+
+    @property
+    def available(self) -> bool:
+        """Return True, failures are reported even while unavailable."""
+        return True
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of failed polls since the last successful one."""
+        return int(getattr(self.coordinator, "consecutive_failures", 0))
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return whether the data is stale and since when polls fail."""
+        attrs = super().extra_state_attributes
+        attrs["stale"] = bool(getattr(self.coordinator, "is_stale", False))
+        failing_since = getattr(self.coordinator, "failing_since", None)
+        if isinstance(failing_since, datetime):
+            attrs["failing_since"] = failing_since.isoformat()
         return attrs
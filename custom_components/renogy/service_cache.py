@@ -0,0 +1,158 @@
+"""GATT service cache shared by all Renogy BLE devices."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, LOGGER
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.gatt_services"
+# Seconds to batch record changes before writing them to disk
+SAVE_DELAY = 10
+
+
+def _characteristic_handles(services: Any) -> dict[str, int]:
+    """Return the characteristic handles of a resolved service collection."""
+    handles: dict[str, int] = {}
+    try:
+        for service in services:
+            for characteristic in getattr(service, "characteristics", ()):
+                uuid = getattr(characteristic, "uuid", None)
+                handle = getattr(characteristic, "handle", None)
+                if isinstance(uuid, str) and isinstance(handle, int):
+                    handles[uuid] = handle
+    except TypeError:
+        return {}
+    return handles
+
+
+class RenogyGattServiceCache:
+    """Remember the resolved GATT services of every device address.
+
+    The resolved service collection is kept in memory and handed back to
+    bleak-retry-connector on the next connect, so reconnects skip service
+    discovery. Persisted per address are the name and model the services were
+    resolved for, their characteristic handles and whether they are still
+    trusted. A device whose services failed or whose identity changed, even
+    while Home Assistant was stopped, gets a fresh discovery instead of a
+    stale backend cache.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._records: dict[str, dict[str, Any]] = {}
+        self._services: dict[str, Any] = {}
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def async_load(self) -> None:
+        """Load the persisted records, only once."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            data = await self._store.async_load()
+            if isinstance(data, dict):
+                devices = data.get("devices", {})
+                for address, record in devices.items():
+                    if isinstance(record, dict):
+                        self._records.setdefault(address, record)
+            self._loaded = True
+
+    def get_services(self, address: str) -> Optional[Any]:
+        """Return the resolved services of a trusted device, if cached."""
+        services = self._services.get(address) if self.is_trusted(address) else None
+        if services is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return services
+
+    def is_trusted(self, address: str) -> bool:
+        """Return False if services must be discovered again for the device."""
+        record = self._records.get(address)
+        return record is None or bool(record.get("valid", True))
+
+    @callback
+    def async_set_services(self, address: str, services: Any) -> None:
+        """Remember freshly resolved services of a device."""
+        self._services[address] = services
+        record = self._records.setdefault(address, {})
+        handles = _characteristic_handles(services)
+        if record.get("valid") is not True or record.get("characteristics") != handles:
+            record["valid"] = True
+            record["characteristics"] = handles
+            self._async_schedule_save()
+
+    @callback
+    def async_set_identity(
+        self, address: str, name: Optional[str], model: Optional[str]
+    ) -> None:
+        """Record who the services belong to, invalidating them on a change."""
+        record = self._records.setdefault(address, {})
+        identity = {"name": name, "model": model}
+        changed = [
+            key
+            for key, value in identity.items()
+            if value is not None
+            and record.get(key) is not None
+            and record.get(key) != value
+        ]
+        if changed:
+            self.async_invalidate(
+                address, f"{', '.join(changed)} changed since services were resolved"
+            )
+
+        updated = False
+        for key, value in identity.items():
+            if value is not None and record.get(key) != value:
+                record[key] = value
+                updated = True
+        if updated:
+            self._async_schedule_save()
+
+    @callback
+    def async_invalidate(self, address: str, reason: str) -> None:
+        """Forget the services of a device until they are resolved again."""
+        self._services.pop(address, None)
+        record = self._records.setdefault(address, {})
+        if record.get("valid") is False:
+            return
+        LOGGER.debug("Invalidating cached GATT services of %s: %s", address, reason)
+        record["valid"] = False
+        self.invalidations += 1
+        self._async_schedule_save()
+
+    def async_get_device_info(self, address: str) -> dict[str, Any]:
+        """Return what the cache knows about a device."""
+        return {
+            **self._records.get(address, {}),
+            "in_memory": address in self._services,
+        }
+
+    def async_get_stats(self) -> dict[str, int]:
+        """Return cache hit, miss and invalidation counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "devices": len(self._records),
+        }
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Write the records to disk after a short delay."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the records to persist."""
+        return {"devices": self._records}
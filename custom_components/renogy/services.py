@@ -0,0 +1,73 @@
+"""Services of the Renogy BLE integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN, SERVICE_GET_HISTORY
+
+ATTR_DEVICE_ID = "device_id"
+ATTR_KEYS = "keys"
+ATTR_SECONDS = "seconds"
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_KEYS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_SECONDS): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+
+
+def _coordinator_for_device(hass: HomeAssistant, device_id: str) -> Any:
+    """Return the coordinator of a Renogy device registry entry."""
+    device = dr.async_get(hass).async_get(device_id)
+    if device is not None:
+        domain_data = hass.data.get(DOMAIN, {})
+        for entry_id in device.config_entries:
+            entry_data = domain_data.get(entry_id)
+            if isinstance(entry_data, dict) and "coordinator" in entry_data:
+                return entry_data["coordinator"]
+    raise ServiceValidationError(
+        f"{device_id} is not a loaded Renogy device",
+        translation_domain=DOMAIN,
+        translation_key="unknown_device",
+        translation_placeholders={"device_id": device_id},
+    )
+
+
+async def _async_get_history(call: ServiceCall) -> ServiceResponse:
+    """Return the recent samples of a device."""
+    coordinator = _coordinator_for_device(call.hass, call.data[ATTR_DEVICE_ID])
+    history = coordinator.history
+    if history is None:
+        return {"samples": []}
+    return {
+        "samples": history.samples(
+            call.data.get(ATTR_KEYS), call.data.get(ATTR_SECONDS)
+        ),
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
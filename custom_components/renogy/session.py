@@ -0,0 +1,537 @@
+"""Persistent BLE session for Renogy devices."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Optional
+
+from bleak import BleakError
+from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from renogy_ble import ble as renogy_ble_module
+from renogy_ble.ble import (
+    COMMANDS,
+    DEFAULT_DEVICE_ID,
+    MAX_NOTIFICATION_WAIT_TIME,
+    RENOGY_READ_CHAR_UUID,
+    RENOGY_WRITE_CHAR_UUID,
+    RenogyBLEDevice,
+    RenogyBleReadResult,
+    create_modbus_read_request,
+    modbus_crc,
+)
+
+from .const import DEFAULT_SESSION_IDLE_TIMEOUT
+from .service_cache import RenogyGattServiceCache
+from .timing import PHASE_CONNECT, PHASE_MODBUS, PHASE_PARSE, PHASE_SERVICES
+
+# Writes need a renogy-ble version with write support, without it the session
+# is read-only
+create_modbus_write_request = getattr(
+    renogy_ble_module, "create_modbus_write_request", None
+)
+if TYPE_CHECKING:
+    from renogy_ble.ble import RenogyBleWriteResult
+else:
+    RenogyBleWriteResult = getattr(renogy_ble_module, "RenogyBleWriteResult", None)
+HAS_WRITE_SUPPORT = (
+    create_modbus_write_request is not None and RenogyBleWriteResult is not None
+)
+
+# Modbus write responses are 8 bytes and echo the first 6 bytes of the
+# request (device id, function code, register and value or count)
+WRITE_RESPONSE_LENGTH = 8
+WRITE_MULTIPLE_FUNCTION_CODE = 0x10
+# Modbus limits a write multiple registers request to 123 registers
+MAX_WRITE_MULTIPLE_REGISTERS = 123
+# Modbus exception responses are device id, function | 0x80, code and CRC
+EXCEPTION_RESPONSE_LENGTH = 5
+
+
+def create_modbus_write_multiple_request(
+    device_id: int, register: int, values: list[int]
+) -> bytearray:
+    """Build a Modbus write multiple registers (0x10) request frame."""
+    count = len(values)
+    frame = bytearray(
+        [
+            device_id,
+            WRITE_MULTIPLE_FUNCTION_CODE,
+            (register >> 8) & 0xFF,
+            register & 0xFF,
+            (count >> 8) & 0xFF,
+            count & 0xFF,
+            count * 2,
+        ]
+    )
+    for value in values:
+        frame.extend(((value >> 8) & 0xFF, value & 0xFF))
+    frame.extend(modbus_crc(frame))
+    return frame
+
+
+def _check_write_support() -> None:
+    """Raise if the installed renogy-ble cannot build write requests."""
+    if not HAS_WRITE_SUPPORT:
+        raise RuntimeError("Write support not available in renogy-ble library")
+
+
+class RenogyBleSession:
+    """Run Modbus transactions over a BLE connection, optionally kept open.
+
+    The session exposes the same ``read_device``/``write_single_register``/
+    ``write_register`` interface as ``RenogyBleClient``. With ``keep_alive``
+    the connection is re-established transparently when it drops and closed
+    after ``idle_timeout`` seconds without a transaction, otherwise it is
+    closed after every transaction.
+
+    With a ``service_cache`` every connect reuses the GATT services resolved
+    on the previous one, and failures invalidate them.
+
+    ``on_close`` is called whenever an open connection is closed or dropped.
+
+    ``last_phase_timings`` holds the seconds the last transaction spent
+    connecting, setting up GATT services, in Modbus round trips and parsing.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: logging.Logger,
+        *,
+        scanner: Any | None = None,
+        idle_timeout: float = DEFAULT_SESSION_IDLE_TIMEOUT,
+        keep_alive: bool = True,
+        service_cache: RenogyGattServiceCache | None = None,
+        device_id: int = DEFAULT_DEVICE_ID,
+        commands: dict[str, dict[str, tuple[int, int, int]]] | None = None,
+        max_notification_wait_time: float = MAX_NOTIFICATION_WAIT_TIME,
+        max_attempts: int = 3,
+        on_close: Callable[[], None] | None = None,
+    ) -> None:
+        """Initialize the session."""
+        self.hass = hass
+        self.logger = logger
+        self._scanner = scanner
+        self._idle_timeout = idle_timeout
+        self._keep_alive = keep_alive
+        self._service_cache = service_cache
+        self._device_id = device_id
+        self._commands = commands or COMMANDS
+        self._max_notification_wait_time = max_notification_wait_time
+        self._max_attempts = max_attempts
+        self._on_close = on_close
+
+        self._client: Optional[BleakClientWithServiceCache] = None
+        self._client_device: Optional[RenogyBLEDevice] = None
+        self._lock = asyncio.Lock()
+        self._notification_data = bytearray()
+        self._notification_event = asyncio.Event()
+        self._unsub_idle: Optional[Callable[[], None]] = None
+        # Nesting depth of hold_connection, the connection stays open while > 0
+        self._holds = 0
+        self.last_phase_timings: dict[str, float] = {}
+
+    @property
+    def commands(self) -> dict[str, dict[str, tuple[int, int, int]]]:
+        """Return the read commands per device type."""
+        return self._commands
+
+    @property
+    def is_connected(self) -> bool:
+        """Return True if the session currently holds an open connection."""
+        return self._client is not None and self._client.is_connected
+
+    async def read_device(self, device: RenogyBLEDevice) -> RenogyBleReadResult:
+        """Read all registered commands for the device over the session."""
+        commands = self._commands.get(device.device_type)
+        if not commands:
+            error = ValueError(f"Unsupported device type: {device.device_type}")
+            self.logger.error("%s", error)
+            return RenogyBleReadResult(False, dict(device.parsed_data), error)
+
+        return await self._async_read(device, commands, merge=False)
+
+    async def read_commands(
+        self,
+        device: RenogyBLEDevice,
+        commands: dict[str, tuple[int, int, int]],
+    ) -> RenogyBleReadResult:
+        """Read only ``commands`` and merge the values into the parsed data."""
+        return await self._async_read(device, commands, merge=True)
+
+    @asynccontextmanager
+    async def hold_connection(self) -> AsyncIterator[None]:
+        """Keep the connection open across the transactions in the block."""
+        self._holds += 1
+        # An idle timer from an earlier transaction must not close the
+        # connection during the hold, it is started again on release
+        if self._unsub_idle:
+            self._unsub_idle()
+            self._unsub_idle = None
+        try:
+            yield
+        finally:
+            self._holds -= 1
+            if not self._holds:
+                async with self._lock:
+                    await self._async_end_transaction()
+
+    async def _async_read(
+        self,
+        device: RenogyBLEDevice,
+        commands: dict[str, tuple[int, int, int]],
+        merge: bool,
+    ) -> RenogyBleReadResult:
+        """Read commands, retrying once on a fresh connection."""
+        async with self._lock:
+            self.last_phase_timings = {}
+            try:
+                return await self._async_read_commands(device, commands, merge)
+            except (BleakError, asyncio.TimeoutError) as err:
+                # The link most likely dropped mid-transaction, retry once on a
+                # fresh connection before reporting the failure.
+                self.logger.debug(
+                    "Session read failed for %s, reconnecting: %s", device.address, err
+                )
+                await self._async_invalidate_services(device, f"read failed: {err}")
+                await self._async_disconnect()
+                try:
+                    return await self._async_read_commands(device, commands, merge)
+                except (BleakError, asyncio.TimeoutError) as retry_err:
+                    await self._async_disconnect()
+                    return RenogyBleReadResult(
+                        False, dict(device.parsed_data), retry_err
+                    )
+            finally:
+                await self._async_end_transaction()
+
+    async def write_single_register(
+        self,
+        device: RenogyBLEDevice,
+        register: int,
+        value: int,
+        function_code: int = 0x06,
+    ) -> RenogyBleWriteResult:
+        """Write a single register value over the session."""
+        _check_write_support()
+        request = create_modbus_write_request(
+            self._device_id, register, value, function_code=function_code
+        )
+        return await self._async_write(device, register, request, function_code)
+
+    async def write_registers(
+        self, device: RenogyBLEDevice, register: int, values: list[int]
+    ) -> RenogyBleWriteResult:
+        """Write consecutive registers, starting at ``register``, in one frame."""
+        _check_write_support()
+        if not 0 < len(values) <= MAX_WRITE_MULTIPLE_REGISTERS:
+            return RenogyBleWriteResult(
+                False, ValueError(f"Cannot write {len(values)} registers at once")
+            )
+        request = create_modbus_write_multiple_request(
+            self._device_id, register, values
+        )
+        return await self._async_write(
+            device, register, request, WRITE_MULTIPLE_FUNCTION_CODE
+        )
+
+    async def _async_write(
+        self,
+        device: RenogyBLEDevice,
+        register: int,
+        request: bytearray,
+        function_code: int,
+    ) -> RenogyBleWriteResult:
+        """Send a write request and check that the device echoed it."""
+        async with self._lock:
+            self.last_phase_timings = {}
+            try:
+                client = await self._async_ensure_connected(device)
+                start = time.perf_counter()
+                response = await self._async_exchange(
+                    client, request, WRITE_RESPONSE_LENGTH, function_code
+                )
+                self._add_phase_time(PHASE_MODBUS, start)
+            except (BleakError, asyncio.TimeoutError) as err:
+                self.logger.debug(
+                    "Session write to register 0x%04X failed for %s: %s",
+                    register,
+                    device.address,
+                    err,
+                )
+                await self._async_invalidate_services(device, f"write failed: {err}")
+                await self._async_disconnect()
+                return RenogyBleWriteResult(False, err)
+            except RuntimeError as err:
+                return RenogyBleWriteResult(False, err)
+            finally:
+                await self._async_end_transaction()
+
+        if response[:6] != request[:6]:
+            self.logger.info(
+                "Write response mismatch for register 0x%04X. Expected %s got %s",
+                register,
+                list(request[:6]),
+                list(response[:6]),
+            )
+            return RenogyBleWriteResult(False, RuntimeError("Response mismatch"))
+
+        return RenogyBleWriteResult(True, None)
+
+    async def write_register(
+        self, device: RenogyBLEDevice, register: int, value: int
+    ) -> bool:
+        """Write a single register value and return True on success."""
+        result = await self.write_single_register(device, register, value)
+        return result.success
+
+    async def async_close(self) -> None:
+        """Close the session connection."""
+        if self._unsub_idle:
+            self._unsub_idle()
+            self._unsub_idle = None
+        async with self._lock:
+            await self._async_disconnect()
+
+    async def _async_read_commands(
+        self,
+        device: RenogyBLEDevice,
+        commands: dict[str, tuple[int, int, int]],
+        merge: bool = False,
+    ) -> RenogyBleReadResult:
+        """Run the read commands on the open connection."""
+        client = await self._async_ensure_connected(device)
+        if not merge:
+            device.parsed_data.clear()
+        any_command_succeeded = False
+
+        for cmd_name, cmd in commands.items():
+            request = create_modbus_read_request(self._device_id, *cmd)
+            expected_len = 3 + cmd[2] * 2 + 2
+            start = time.perf_counter()
+            try:
+                response = await self._async_exchange(
+                    client, request, expected_len, cmd[0]
+                )
+            except asyncio.TimeoutError:
+                self.logger.debug(
+                    "Timeout – only %s / %s bytes received for %s from device %s",
+                    len(self._notification_data),
+                    expected_len,
+                    cmd_name,
+                    device.name,
+                )
+                continue
+            except RuntimeError as err:
+                self.logger.debug("Modbus error for %s: %s", cmd_name, err)
+                continue
+            finally:
+                self._add_phase_time(PHASE_MODBUS, start)
+
+            start = time.perf_counter()
+            parsed = device.update_parsed_data(
+                response, register=cmd[1], cmd_name=cmd_name
+            )
+            self._add_phase_time(PHASE_PARSE, start)
+            if parsed:
+                any_command_succeeded = True
+
+        error = None
+        if not any_command_succeeded:
+            error = RuntimeError("No commands completed successfully")
+            # A link that answers nothing is likely stale, start fresh next time
+            await self._async_invalidate_services(device, "no command completed")
+            await self._async_disconnect()
+        return RenogyBleReadResult(
+            any_command_succeeded, dict(device.parsed_data), error
+        )
+
+    async def _async_exchange(
+        self,
+        client: BleakClientWithServiceCache,
+        request: bytearray,
+        expected_len: int,
+        function_code: int,
+    ) -> bytes:
+        """Send a Modbus request and wait for its complete response."""
+        self._notification_data.clear()
+        self._notification_event.clear()
+        await client.write_gatt_char(RENOGY_WRITE_CHAR_UUID, request)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._max_notification_wait_time
+        exception_code = function_code | 0x80
+        while len(self._notification_data) < expected_len:
+            if (
+                len(self._notification_data) >= EXCEPTION_RESPONSE_LENGTH
+                and self._notification_data[1] == exception_code
+            ):
+                response = bytes(self._notification_data[:EXCEPTION_RESPONSE_LENGTH])
+                crc_low, crc_high = modbus_crc(response[:3])
+                if response[3:5] == bytes([crc_low, crc_high]):
+                    raise RuntimeError(f"Modbus exception code {response[2]}")
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            await asyncio.wait_for(self._notification_event.wait(), remaining)
+            self._notification_event.clear()
+
+        response = bytes(self._notification_data[:expected_len])
+        crc_low, crc_high = modbus_crc(response[:-2])
+        if response[-2:] != bytes([crc_low, crc_high]):
+            raise RuntimeError("CRC mismatch")
+        return response
+
+    async def _async_ensure_connected(
+        self, device: RenogyBLEDevice
+    ) -> BleakClientWithServiceCache:
+        """Return the open connection, connecting first if needed."""
+        if self._client is not None and self._client.is_connected:
+            if self._client_device is device:
+                return self._client
+            await self._async_disconnect()
+
+        self.logger.debug("Opening BLE session to %s", device.address)
+        start = time.perf_counter()
+        client = await establish_connection(
+            BleakClientWithServiceCache,
+            device.ble_device,
+            device.name or device.address,
+            disconnected_callback=self._handle_disconnect,
+            max_attempts=self._max_attempts,
+            **self._connection_kwargs(),
+            **self._service_cache_kwargs(device.address),
+        )
+        self._add_phase_time(PHASE_CONNECT, start)
+        start = time.perf_counter()
+        try:
+            await client.start_notify(RENOGY_READ_CHAR_UUID, self._handle_notification)
+        except BleakError:
+            await client.disconnect()
+            raise
+        finally:
+            self._add_phase_time(PHASE_SERVICES, start)
+
+        services = getattr(client, "services", None)
+        if self._service_cache is not None and services is not None:
+            self._service_cache.async_set_services(device.address, services)
+
+        self._client = client
+        self._client_device = device
+        return client
+
+    async def _async_disconnect(self) -> None:
+        """Disconnect the current connection if one is open."""
+        client = self._client
+        self._client = None
+        self._client_device = None
+        if client is None:
+            return
+        try:
+            await client.disconnect()
+            self.logger.debug("Closed BLE session")
+        except Exception as err:
+            self.logger.debug("Error closing BLE session: %s", err)
+        finally:
+            self._notify_closed()
+
+    async def _async_invalidate_services(
+        self, device: RenogyBLEDevice, reason: str
+    ) -> None:
+        """Stop trusting the cached services of the device after a failure."""
+        if self._service_cache is not None:
+            self._service_cache.async_invalidate(device.address, reason)
+        # Also drop the services the Bluetooth backend cached for the device
+        clear_cache = getattr(self._client, "clear_cache", None)
+        if clear_cache is None:
+            return
+        try:
+            await clear_cache()
+        except Exception as err:
+            self.logger.debug("Error clearing GATT service cache: %s", err)
+
+    async def _async_end_transaction(self) -> None:
+        """Keep the connection for the next transaction or close it."""
+        if self._holds:
+            return
+        if self._keep_alive:
+            self._schedule_idle_disconnect()
+        else:
+            await self._async_disconnect()
+
+    def _add_phase_time(self, phase: str, start: float) -> None:
+        """Add the time elapsed since ``start`` to a phase of the transaction."""
+        elapsed = time.perf_counter() - start
+        self.last_phase_timings[phase] = (
+            self.last_phase_timings.get(phase, 0.0) + elapsed
+        )
+
+    def _handle_notification(self, _sender: Any, data: bytearray) -> None:
+        """Collect notification payloads for the pending transaction."""
+        self._notification_data.extend(data)
+        self._notification_event.set()
+
+    def _handle_disconnect(self, client: BleakClientWithServiceCache) -> None:
+        """Forget the connection when the device drops it."""
+        if client is self._client:
+            self.logger.debug("BLE session dropped by device")
+            self._client = None
+            self._client_device = None
+            self._notify_closed()
+
+    def _notify_closed(self) -> None:
+        """Tell the owner that the connection is no longer open."""
+        if self._on_close is not None:
+            self._on_close()
+
+    def _schedule_idle_disconnect(self) -> None:
+        """(Re)start the idle timer that closes an unused connection."""
+        if self._unsub_idle:
+            self._unsub_idle()
+        self._unsub_idle = async_call_later(
+            self.hass, self._idle_timeout, self._async_handle_idle_timeout
+        )
+
+    @callback
+    def _async_handle_idle_timeout(self, _now: Any) -> None:
+        """Close the connection after it was idle for too long."""
+        self._unsub_idle = None
+        if self._client is not None:
+            self.logger.debug(
+                "BLE session idle for %ss, disconnecting", self._idle_timeout
+            )
+            self.hass.async_create_task(self.async_close())
+
+    def _service_cache_kwargs(self, address: str) -> dict[str, Any]:
+        """Build the service cache kwargs for bleak-retry-connector."""
+        if self._service_cache is None:
+            return {}
+
+        signature = inspect.signature(establish_connection)
+        if not self._service_cache.is_trusted(address):
+            # The backend may hold the same stale services, resolve them again
+            if "use_services_cache" in signature.parameters:
+                return {"use_services_cache": False}
+            return {}
+        services = self._service_cache.get_services(address)
+        if services is not None and "cached_services" in signature.parameters:
+            return {"cached_services": services}
+        return {}
+
+    def _connection_kwargs(self) -> dict[str, Any]:
+        """Build connection kwargs for bleak-retry-connector."""
+        if not self._scanner:
+            return {}
+
+        signature = inspect.signature(establish_connection)
+        if "bleak_scanner" in signature.parameters:
+            return {"bleak_scanner": self._scanner}
+        if "scanner" in signature.parameters:
+            return {"scanner": self._scanner}
+        return {}
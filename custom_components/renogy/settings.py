@@ -0,0 +1,72 @@
+"""Settings shared by all Renogy BLE devices."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import CONF_MAX_CONNECTIONS, DATA_SETTINGS, DEFAULT_MAX_CONNECTIONS, DOMAIN
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.settings"
+# Seconds to batch setting changes before writing them to disk
+SAVE_DELAY = 1
+
+
+class RenogyDomainSettings:
+    """Integration-wide settings, edited from the options of any device.
+
+    The connection limit protects the Bluetooth adapters all devices share,
+    so there is one value for the integration rather than one per device.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the settings."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._settings: dict[str, Any] = {}
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the persisted settings, only once."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            data = await self._store.async_load()
+            if isinstance(data, dict):
+                self._settings = dict(data)
+            self._loaded = True
+
+    @property
+    def max_connections(self) -> int:
+        """Return the simultaneous connections allowed per adapter."""
+        value = self._settings.get(CONF_MAX_CONNECTIONS)
+        return value if isinstance(value, int) else DEFAULT_MAX_CONNECTIONS
+
+    @callback
+    def async_set_max_connections(self, max_connections: int) -> None:
+        """Change the simultaneous connections allowed per adapter."""
+        if self._settings.get(CONF_MAX_CONNECTIONS) == max_connections:
+            return
+        self._settings[CONF_MAX_CONNECTIONS] = max_connections
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the settings to persist."""
+        return dict(self._settings)
+
+
+async def async_get_settings(hass: HomeAssistant) -> RenogyDomainSettings:
+    """Return the loaded settings shared through ``hass.data``."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    settings = domain_data.get(DATA_SETTINGS)
+    if settings is None:
+        settings = RenogyDomainSettings(hass)
+        domain_data[DATA_SETTINGS] = settings
+    await settings.async_load()
+    return settings
@@ -0,0 +1,70 @@
+"""Last known data of a Renogy BLE device, persisted across restarts."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Mapping, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, LOGGER
+
+STORAGE_VERSION = 1
+# Seconds to batch snapshot updates before writing them to disk. Home
+# Assistant writes pending snapshots when it stops.
+SAVE_DELAY = 60
+
+
+class RenogyDataSnapshot:
+    """Persist the last polled data of one config entry.
+
+    At setup the coordinator is seeded from the snapshot, so entities show
+    the last known values right away instead of waiting for the first poll.
+    Every successful poll replaces the snapshot.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the snapshot."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.last_data"
+        )
+        self._data: Mapping[str, Any] = {}
+        self._saved_at: Optional[datetime] = None
+
+    async def async_load(self) -> Optional[tuple[dict[str, Any], datetime]]:
+        """Return the persisted data and when it was polled, if any."""
+        stored = await self._store.async_load()
+        if not isinstance(stored, dict) or not isinstance(stored.get("data"), dict):
+            return None
+        try:
+            saved_at = datetime.fromisoformat(stored["saved_at"])
+        except (KeyError, TypeError, ValueError):
+            LOGGER.debug("Ignoring data snapshot without a valid timestamp")
+            return None
+        self._data = stored["data"]
+        self._saved_at = saved_at
+        return dict(self._data), saved_at
+
+    @callback
+    def async_update(self, data: Mapping[str, Any]) -> None:
+        """Replace the snapshot with freshly polled data.
+
+        Polled data is an immutable record, so it is kept as is and only
+        turned into a dict when the snapshot is written.
+        """
+        self._data = data
+        self._saved_at = datetime.now()
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Delete the persisted snapshot."""
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the snapshot to persist."""
+        return {
+            "saved_at": self._saved_at.isoformat() if self._saved_at else None,
+            "data": dict(self._data),
+        }
@@ -2,9 +2,8 @@
 
 from __future__ import annotations
 
-import asyncio
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Mapping, Optional
 
 from homeassistant.components.bluetooth.passive_update_coordinator import (
     PassiveBluetoothCoordinatorEntity,
@@ -66,19 +65,13 @@ async def async_setup_entry(
         or not coordinator.device.name.startswith(RENOGY_BT_PREFIX)
     ):
         LOGGER.debug("Waiting for real device name before creating switches...")
-        await coordinator.async_request_refresh()
-
-        real_name_found = False
-        for _ in range(10):
-            await asyncio.sleep(1)
-            if coordinator.device and coordinator.device.name.startswith(
-                RENOGY_BT_PREFIX
-            ):
-                LOGGER.debug("Real device name found: %s", coordinator.device.name)
-                real_name_found = True
-                break
-
-        if not real_name_found:
+        # All platforms wait on the same initial refresh, which ends as soon
+        # as the first read attempt finished
+        await coordinator.async_wait_ready()
+
+        if coordinator.device and coordinator.device.name.startswith(RENOGY_BT_PREFIX):
+            LOGGER.debug("Real device name found: %s", coordinator.device.name)
+        else:
             LOGGER.debug(
                 "No real device name found after waiting. "
                 "Using generic name for entities."
@@ -101,7 +94,7 @@ class RenogyLoadSwitch(PassiveBluetoothCoordinatorEntity, SwitchEntity):
         device_type: str = DEFAULT_DEVICE_TYPE,
     ) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=(KEY_LOAD_STATUS,))
         self.entity_description = LOAD_SWITCH
         self._device = device
         self._device_type = device_type
@@ -193,7 +186,7 @@ class RenogyLoadSwitch(PassiveBluetoothCoordinatorEntity, SwitchEntity):
         device = self.device
         if device and device.parsed_data and KEY_LOAD_STATUS in device.parsed_data:
             return device.parsed_data.get(KEY_LOAD_STATUS)
-        if isinstance(self.coordinator.data, dict):
+        if isinstance(self.coordinator.data, Mapping):
             return self.coordinator.data.get(KEY_LOAD_STATUS)
         return None
 
@@ -0,0 +1,102 @@
+"""Per-phase poll timing for Renogy BLE devices."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping, Optional
+
+# Poll phases, in the order they happen during a poll
+PHASE_SLOT_WAIT = "slot_wait"  # waiting for a connection slot on the adapter
+PHASE_CONNECT = "connect"  # establishing the BLE connection
+PHASE_SERVICES = "services"  # GATT setup on the new connection (notifications)
+PHASE_MODBUS = "modbus"  # Modbus request/notification round trips
+PHASE_PARSE = "parse"  # parsing register responses into values
+PHASE_READ = "read"  # the whole client read, whatever the transport
+PHASE_FAN_OUT = "fan_out"  # notifying entities of the new data
+PHASE_TOTAL = "total"  # the whole poll, from slot request to data callback
+
+POLL_PHASES = (
+    PHASE_SLOT_WAIT,
+    PHASE_CONNECT,
+    PHASE_SERVICES,
+    PHASE_MODBUS,
+    PHASE_PARSE,
+    PHASE_READ,
+    PHASE_FAN_OUT,
+    PHASE_TOTAL,
+)
+
+# Number of recent samples kept per phase
+TIMING_SAMPLES = 100
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of an already sorted list."""
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class RenogyPollTimings:
+    """Rolling per-phase durations of the polls of one device.
+
+    Only the last ``samples`` durations of each phase are kept, so the
+    percentiles follow changes in radio conditions instead of averaging them
+    away over the lifetime of the integration.
+    """
+
+    def __init__(self, samples: int = TIMING_SAMPLES) -> None:
+        """Initialize the timings."""
+        self._max_samples = samples
+        self._samples: dict[str, deque[float]] = {
+            phase: deque(maxlen=samples) for phase in POLL_PHASES
+        }
+        self._totals: dict[str, int] = dict.fromkeys(POLL_PHASES, 0)
+
+    def record(self, phase: str, duration: float) -> None:
+        """Record how long ``phase`` took, in seconds."""
+        samples = self._samples.get(phase)
+        if samples is None:
+            samples = self._samples[phase] = deque(maxlen=self._max_samples)
+            self._totals[phase] = 0
+        samples.append(duration)
+        self._totals[phase] += 1
+
+    def record_phases(self, durations: Optional[Mapping[str, float]]) -> None:
+        """Record every phase duration of a mapping, if there is one."""
+        for phase, duration in (durations or {}).items():
+            self.record(phase, duration)
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Record how long the wrapped block took as ``phase``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def phase_stats(self, phase: str) -> Optional[dict[str, Any]]:
+        """Return p50/p95/max/last for ``phase`` in seconds, or None."""
+        samples = self._samples.get(phase)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return {
+            "p50": _percentile(ordered, 0.5),
+            "p95": _percentile(ordered, 0.95),
+            "max": ordered[-1],
+            "last": samples[-1],
+            "samples": len(samples),
+            "count": self._totals[phase],
+        }
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the statistics of every phase that has samples."""
+        stats: dict[str, dict[str, Any]] = {}
+        for phase in self._samples:
+            phase_stats = self.phase_stats(phase)
+            if phase_stats is not None:
+                stats[phase] = phase_stats
+        return stats
@@ -0,0 +1,368 @@
+"""Benchmark the integration against a fleet of emulated devices.
+
+Run with::
+
+    python -m tests.benchmark --devices 1,10,50 --polls 20 --output bench.json
+    python -m tests.benchmark --baseline bench.json --tolerance 0.25
+
+The integration runs on the same Home Assistant stubs as the unit tests, with
+``tests.mocks.renogy_emulator`` standing in for the BLE devices. Results are
+written as JSON. When a baseline is given, metrics that got worse by more than
+the tolerance are reported as regressions and the exit code is 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import platform
+import statistics
+import sys
+import time
+import types
+from contextlib import contextmanager
+from typing import Any, Iterator
+from unittest.mock import MagicMock
+
+from tests.mocks.renogy_emulator import (
+    EMULATOR_COMMANDS,
+    EMULATOR_REGISTER_MAP,
+    EmulatorConditions,
+    RenogyEmulatorFleet,
+)
+
+# Metrics compared against a baseline, all of them lower-is-better
+REGRESSION_METRICS = (
+    "setup.total_s",
+    "setup.per_entry_s",
+    "poll.latency_p50_s",
+    "poll.latency_p95_s",
+    "sensor.cpu_per_poll_s",
+    "sensor.state_writes_per_poll",
+)
+DEFAULT_TOLERANCE = 0.25
+# Absolute slack so tiny timings don't flag noise as regressions
+MIN_ABSOLUTE_DELTA = 0.0005
+
+
+def load_integration() -> types.SimpleNamespace:
+    """Import the integration on top of the unit test stubs."""
+    from tests import test_ble, test_sensor
+
+    test_sensor._install_module_stubs()
+    sensor_const = sys.modules["homeassistant.const"]
+    sensor_registry = sys.modules["homeassistant.helpers.device_registry"]
+    test_ble._install_module_stubs()
+    # The sensor stubs are a superset of what the BLE stubs provide
+    sys.modules["homeassistant.const"] = sensor_const
+    sys.modules["homeassistant.helpers.device_registry"] = sensor_registry
+    for name in (
+        "custom_components.renogy",
+        "custom_components.renogy.ble",
+        "custom_components.renogy.session",
+        "custom_components.renogy.sensor",
+    ):
+        sys.modules.pop(name, None)
+
+    integration = importlib.import_module("custom_components.renogy")
+    ble = importlib.import_module("custom_components.renogy.ble")
+    sensor = importlib.import_module("custom_components.renogy.sensor")
+    ble.RenogyBLEDevice.is_available = True
+    ble.renogy_ble_module.COMMANDS = EMULATOR_COMMANDS
+    ble.renogy_register_map = types.SimpleNamespace(REGISTER_MAP=EMULATOR_REGISTER_MAP)
+    return types.SimpleNamespace(integration=integration, ble=ble, sensor=sensor)
+
+
+class _SensorProbe:
+    """Count state writes and CPU time spent in sensor updates."""
+
+    def __init__(self, sensor_cls: type) -> None:
+        self.sensor_cls = sensor_cls
+        self.state_writes = 0
+        self.update_cpu_ns = 0
+        self.native_value_cpu_ns = 0
+        self.updates = 0
+
+    @contextmanager
+    def install(self) -> Iterator[None]:
+        sensor_cls = self.sensor_cls
+        original_update = sensor_cls._handle_coordinator_update
+        original_native_value = sensor_cls.native_value
+        original_write = sensor_cls.async_write_ha_state
+        probe = self
+
+        def _handle_coordinator_update(entity: Any) -> None:
+            start = time.thread_time_ns()
+            try:
+                original_update(entity)
+            finally:
+                probe.update_cpu_ns += time.thread_time_ns() - start
+                probe.updates += 1
+
+        def _native_value(entity: Any) -> Any:
+            start = time.thread_time_ns()
+            try:
+                return original_native_value.fget(entity)
+            finally:
+                probe.native_value_cpu_ns += time.thread_time_ns() - start
+
+        def _write(entity: Any) -> None:
+            probe.state_writes += 1
+
+        sensor_cls._handle_coordinator_update = _handle_coordinator_update
+        sensor_cls.native_value = property(_native_value)
+        sensor_cls.async_write_ha_state = _write
+        try:
+            yield
+        finally:
+            sensor_cls._handle_coordinator_update = original_update
+            sensor_cls.native_value = original_native_value
+            sensor_cls.async_write_ha_state = original_write
+
+    def reset(self) -> None:
+        self.state_writes = 0
+        self.update_cpu_ns = 0
+        self.native_value_cpu_ns = 0
+        self.updates = 0
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _make_hass(loaded: types.SimpleNamespace, fleet: RenogyEmulatorFleet) -> Any:
+    """Build a hass mock that forwards entries to the sensor platform."""
+    hass = MagicMock()
+    hass.data = {}
+    hass.state = loaded.ble.CoreState.running
+    hass.async_create_task = lambda coro: asyncio.get_running_loop().create_task(coro)
+    hass.entities = []
+
+    async def _forward_entry_setups(entry: Any, _platforms: Any) -> None:
+        def _add_entities(entities: list[Any]) -> None:
+            for entity in entities:
+                entity.coordinator.async_add_listener(
+                    entity._handle_coordinator_update,
+                    getattr(entity, "coordinator_context", None),
+                )
+                entity._handle_coordinator_update()
+            hass.entities.extend(entities)
+
+        await loaded.sensor.async_setup_entry(hass, entry, _add_entities)
+
+    hass.config_entries.async_forward_entry_setups = _forward_entry_setups
+    loaded.ble.bluetooth.async_last_service_info.side_effect = lambda _hass, address: (
+        fleet[address].service_info()
+    )
+    return hass
+
+
+async def _run_scenario(
+    loaded: types.SimpleNamespace,
+    device_count: int,
+    polls: int,
+    conditions: EmulatorConditions,
+    seed: int,
+) -> dict[str, Any]:
+    """Set up ``device_count`` entries and poll each of them ``polls`` times."""
+    fleet = RenogyEmulatorFleet(conditions=conditions, seed=seed)
+    device_types = ("controller", "dcc", "battery")
+    for index in range(device_count):
+        fleet.add(device_types[index % len(device_types)])
+
+    ble = loaded.ble
+    ble.RenogyBleSession = lambda hass, logger, commands=None, **kwargs: fleet.client(
+        commands=commands, error_cls=ble.BleakError
+    )
+    ble.RenogyBleClient = lambda scanner=None, commands=None: fleet.client(
+        commands=commands, error_cls=ble.BleakError
+    )
+    hass = _make_hass(loaded, fleet)
+    probe = _SensorProbe(loaded.sensor.RenogyBLESensor)
+
+    entries = []
+    for index, emulator in enumerate(fleet):
+        entry = MagicMock()
+        entry.entry_id = f"entry-{index}"
+        entry.data = {"address": emulator.address, "device_type": emulator.device_type}
+        entries.append(entry)
+
+    with probe.install():
+        setup_times: list[float] = []
+
+        async def _timed_setup(entry: Any) -> None:
+            start = time.perf_counter()
+            await loaded.integration.async_setup_entry(hass, entry)
+            setup_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(_timed_setup(entry) for entry in entries))
+        setup_total = time.perf_counter() - start
+        # Let the shared initial refreshes settle before measuring polls
+        coordinators = [
+            hass.data["renogy"][entry.entry_id]["coordinator"] for entry in entries
+        ]
+        await asyncio.gather(
+            *(coordinator.async_wait_ready() for coordinator in coordinators)
+        )
+        probe.reset()
+
+        latencies: list[float] = []
+        failures = 0
+
+        async def _timed_poll(coordinator: Any) -> None:
+            nonlocal failures
+            start = time.perf_counter()
+            success = await coordinator.async_request_refresh()
+            latencies.append(time.perf_counter() - start)
+            if not success:
+                failures += 1
+
+        for _ in range(polls):
+            await asyncio.gather(*(_timed_poll(c) for c in coordinators))
+
+    total_polls = max(1, polls * len(coordinators))
+    suppressed = sum(c.suppressed_state_writes for c in coordinators)
+    return {
+        "devices": device_count,
+        "entities": len(hass.entities),
+        "setup": {
+            "total_s": setup_total,
+            "per_entry_s": statistics.mean(setup_times) if setup_times else 0.0,
+            "max_entry_s": max(setup_times, default=0.0),
+        },
+        "poll": {
+            "count": len(latencies),
+            "failures": failures,
+            "latency_mean_s": statistics.mean(latencies) if latencies else 0.0,
+            "latency_p50_s": _percentile(latencies, 0.5) if latencies else 0.0,
+            "latency_p95_s": _percentile(latencies, 0.95) if latencies else 0.0,
+            "latency_max_s": max(latencies, default=0.0),
+        },
+        "sensor": {
+            "updates_per_poll": probe.updates / total_polls,
+            "cpu_per_poll_s": probe.update_cpu_ns / 1e9 / total_polls,
+            "native_value_cpu_per_poll_s": probe.native_value_cpu_ns
+            / 1e9
+            / total_polls,
+            "state_writes_per_poll": probe.state_writes / total_polls,
+            "suppressed_writes_per_poll": suppressed / total_polls,
+        },
+    }
+
+
+def run_benchmark(
+    device_counts: list[int],
+    polls: int = 10,
+    conditions: EmulatorConditions | None = None,
+    seed: int = 1,
+) -> dict[str, Any]:
+    """Run every scenario and return the machine readable report."""
+    loaded = load_integration()
+    conditions = conditions or EmulatorConditions()
+    scenarios = {}
+    for count in device_counts:
+        scenarios[str(count)] = asyncio.run(
+            _run_scenario(loaded, count, polls, conditions, seed)
+        )
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "polls": polls,
+            "conditions": vars(conditions),
+            "seed": seed,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def _metric(scenario: dict[str, Any], path: str) -> float | None:
+    value: Any = scenario
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return float(value)
+
+
+def find_regressions(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[dict[str, Any]]:
+    """Return metrics that are worse than the baseline beyond the tolerance."""
+    regressions = []
+    for name, scenario in report["scenarios"].items():
+        base_scenario = baseline.get("scenarios", {}).get(name)
+        if base_scenario is None:
+            continue
+        for path in REGRESSION_METRICS:
+            current = _metric(scenario, path)
+            previous = _metric(base_scenario, path)
+            if current is None or previous is None:
+                continue
+            limit = max(previous * (1 + tolerance), previous + MIN_ABSOLUTE_DELTA)
+            if current > limit:
+                regressions.append(
+                    {
+                        "scenario": name,
+                        "metric": path,
+                        "baseline": previous,
+                        "current": current,
+                        "change": (current - previous) / previous if previous else None,
+                    }
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", default="1,10,50", help="comma separated counts")
+    parser.add_argument("--polls", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--packet-loss", type=float, default=0.0)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--drift", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    conditions = EmulatorConditions(
+        latency=args.latency,
+        jitter=args.jitter,
+        packet_loss=args.packet_loss,
+        disconnect_rate=args.disconnect_rate,
+        drift=args.drift,
+    )
+    report = run_benchmark(
+        [int(count) for count in args.devices.split(",") if count],
+        polls=args.polls,
+        conditions=conditions,
+        seed=args.seed,
+    )
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            report["regressions"] = find_regressions(
+                report, json.load(file), args.tolerance
+            )
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    print(output)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,6 +32,7 @@ class BluetoothServiceInfoBleak:
         self.device.rssi = rssi
         self.advertisement = MagicMock()
         self.advertisement.rssi = rssi
+        self.manufacturer_data = {}
 
 
 # Create a mock bluetooth module
@@ -47,6 +48,7 @@ components.bluetooth = bluetooth
 components.bluetooth.BluetoothServiceInfoBleak = BluetoothServiceInfoBleak
 components.bluetooth.BluetoothScanningMode = BluetoothScanningMode
 components.bluetooth.BluetoothChange = BluetoothChange
+components.bluetooth.BluetoothCallbackMatcher = dict
 components.bluetooth.active_update_coordinator = MagicMock()
 components.bluetooth.active_update_coordinator.ActiveBluetoothDataUpdateCoordinator = (
     MagicMock()
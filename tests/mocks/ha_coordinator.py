@@ -45,6 +45,17 @@ class ActiveBluetoothDataUpdateCoordinator:
         self.device = None
         self.last_update_success = True
         self._listeners = []
+        self._poll_method = kwargs.get("poll_method")
+        self._last_service_info = None
+
+    async def _async_poll(self):
+        """Poll the device after an advertisement, as the real coordinator."""
+        self.data = await self._poll_method(self._last_service_info)
+        self._async_handle_bluetooth_poll()
+
+    def _async_handle_bluetooth_poll(self):
+        """Handle a poll event."""
+        self.async_update_listeners()
 
     def async_add_listener(self, update_callback, context=None):
         """Add a listener for update."""
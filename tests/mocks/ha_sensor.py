@@ -10,6 +10,7 @@ class SensorDeviceClass(str, Enum):
 
     BATTERY = "battery"
     CURRENT = "current"
+    DURATION = "duration"
     ENERGY = "energy"
     POWER = "power"
     TEMPERATURE = "temperature"
@@ -41,6 +42,7 @@ class SensorEntityDescription:
     state_class: Optional[str] = None
     native_unit_of_measurement: Optional[str] = None
     entity_category: Optional[str] = None
+    entity_registry_enabled_default: bool = True
     native_value: Any = None
     value_fn: Optional[Callable] = None
 
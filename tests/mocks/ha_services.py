@@ -0,0 +1,77 @@
+"""Mock modules for the service registration of the integration."""
+
+import sys
+import types
+from enum import Enum
+from typing import Any, Callable, cast
+
+
+class SupportsResponse(str, Enum):
+    """Service response support, as in homeassistant.core."""
+
+    NONE = "none"
+    OPTIONAL = "optional"
+    ONLY = "only"
+
+
+class ServiceCall:
+    """Service call, as in homeassistant.core."""
+
+    def __init__(self, hass: Any, domain: str, service: str, data: dict) -> None:
+        self.hass = hass
+        self.domain = domain
+        self.service = service
+        self.data = data
+
+
+class ServiceValidationError(Exception):
+    """Invalid service call, as in homeassistant.exceptions."""
+
+    def __init__(self, message: str = "", **kwargs: Any) -> None:
+        super().__init__(message)
+        self.translation_key = kwargs.get("translation_key")
+
+
+def _passthrough(*args: Any, **kwargs: Any) -> Callable[[Any], Any]:
+    """Return a validator that accepts any value."""
+    return lambda value: value
+
+
+def _marker(key: Any, *args: Any, **kwargs: Any) -> Any:
+    """Return a schema key as is."""
+    return key
+
+
+def install(core_module: Any) -> None:
+    """Install voluptuous, config validation, typing and exception stubs."""
+    core_module.ServiceCall = ServiceCall
+    core_module.ServiceResponse = dict
+    core_module.SupportsResponse = SupportsResponse
+
+    voluptuous = cast(Any, types.ModuleType("voluptuous"))
+    voluptuous.Schema = lambda schema, *args, **kwargs: lambda value: value
+    voluptuous.Required = _marker
+    voluptuous.Optional = _marker
+    voluptuous.All = _passthrough
+    voluptuous.Coerce = _passthrough
+    voluptuous.Range = _passthrough
+    voluptuous.In = _passthrough
+    sys.modules["voluptuous"] = voluptuous
+
+    config_validation = cast(
+        Any, types.ModuleType("homeassistant.helpers.config_validation")
+    )
+    config_validation.string = str
+    config_validation.ensure_list = lambda value: (
+        value if isinstance(value, list) else [value]
+    )
+    config_validation.config_entry_only_config_schema = _passthrough
+    sys.modules["homeassistant.helpers.config_validation"] = config_validation
+
+    helpers_typing = cast(Any, types.ModuleType("homeassistant.helpers.typing"))
+    helpers_typing.ConfigType = dict
+    sys.modules["homeassistant.helpers.typing"] = helpers_typing
+
+    exceptions = cast(Any, types.ModuleType("homeassistant.exceptions"))
+    exceptions.ServiceValidationError = ServiceValidationError
+    sys.modules["homeassistant.exceptions"] = exceptions
@@ -0,0 +1,35 @@
+"""Mock implementation of Home Assistant storage for testing."""
+
+import copy
+from typing import Any, Callable, Generic, TypeVar
+
+_T = TypeVar("_T")
+
+# Saved data per storage key, survives Store instances like .storage does
+STORAGE: dict[str, Any] = {}
+
+
+class Store(Generic[_T]):
+    """In-memory stand-in for homeassistant.helpers.storage.Store."""
+
+    def __init__(self, hass: Any, version: int, key: str, *args, **kwargs) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.version = version
+        self.key = key
+
+    async def async_load(self) -> _T | None:
+        """Return a copy of the saved data."""
+        return copy.deepcopy(STORAGE.get(self.key))
+
+    async def async_save(self, data: _T) -> None:
+        """Save data right away."""
+        STORAGE[self.key] = copy.deepcopy(data)
+
+    def async_delay_save(self, data_func: Callable[[], _T], delay: float = 0) -> None:
+        """Save data right away instead of after the delay."""
+        STORAGE[self.key] = copy.deepcopy(data_func())
+
+    async def async_remove(self) -> None:
+        """Remove the saved data."""
+        STORAGE.pop(self.key, None)
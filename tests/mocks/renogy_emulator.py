@@ -0,0 +1,995 @@
+"""Emulated Renogy BLE devices for tests and load generation.
+
+The emulator answers real Modbus RTU frames the way a Renogy BT module does.
+Controller and DCC register layouts mirror ``renogy_ble.register_map``; the
+battery layout follows the Renogy smart lithium battery BMS registers.
+
+It can stand in for the library at three levels:
+
+* ``RenogyDeviceEmulator.handle_request`` turns a request frame into a
+  response frame (or ``None`` when the packet is lost).
+* ``EmulatedGattClient`` is a fake GATT peer that can be returned from a
+  patched ``establish_connection``, so ``RenogyBleSession`` runs unchanged.
+* ``EmulatedRenogyBleClient`` replaces ``RenogyBleClient`` in the coordinator.
+
+``RenogyEmulatorFleet`` creates and addresses 1-100+ devices at once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from tests.mocks.ha_bluetooth import BluetoothServiceInfoBleak
+
+DEFAULT_DEVICE_ID = 0xFF
+READ_CHAR_UUID = "0000fff1-0000-1000-8000-00805f9b34fb"
+WRITE_CHAR_UUID = "0000ffd1-0000-1000-8000-00805f9b34fb"
+NOTIFICATION_MTU = 20
+LOAD_CONTROL_REGISTER = 0x010A
+LOAD_STATUS_REGISTER = 0x0120
+
+# Modbus exception codes
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_ADDRESS = 0x02
+
+# Read commands per device type: name -> (function code, register, word count)
+EMULATOR_COMMANDS: dict[str, dict[str, tuple[int, int, int]]] = {
+    "controller": {
+        "device_info": (3, 12, 8),
+        "device_id": (3, 26, 1),
+        "battery": (3, 57348, 1),
+        "pv": (3, 256, 34),
+    },
+    "dcc": {
+        "device_info": (3, 12, 8),
+        "device_id": (3, 26, 1),
+        "dynamic_data": (3, 256, 32),
+        "status": (3, 288, 8),
+        "current_limit": (3, 57345, 1),
+        "parameters": (3, 57347, 18),
+        "reverse_charging_voltage": (3, 57376, 1),
+        "solar_cutoff_current": (3, 57400, 1),
+    },
+    "battery": {
+        "cell_voltage_info": (3, 5000, 17),
+        "cell_temperature_info": (3, 5017, 17),
+        "battery_info": (3, 5042, 6),
+        "device_info": (3, 5122, 8),
+        "device_id": (3, 5223, 1),
+    },
+}
+
+
+def _field(
+    register: int,
+    offset: int,
+    length: int = 2,
+    *,
+    scale: float | None = None,
+    signed: bool = False,
+    sign_magnitude: bool = False,
+    bit_offset: int | None = None,
+    value_map: dict[int, str] | None = None,
+    string: bool = False,
+    dynamic: bool = False,
+) -> dict[str, Any]:
+    """Describe one field like renogy_ble.register_map does."""
+    info: dict[str, Any] = {"register": register, "offset": offset, "length": length}
+    if scale is not None:
+        info["scale"] = scale
+    if signed:
+        info["signed"] = True
+        info["signed_encoding"] = (
+            "sign_magnitude" if sign_magnitude else "twos_complement"
+        )
+    if bit_offset is not None:
+        info["bit_offset"] = bit_offset
+    if value_map is not None:
+        info["map"] = value_map
+    if string:
+        info["data_type"] = "string"
+    info["dynamic"] = dynamic
+    return info
+
+
+_CONTROLLER_CHARGING_STATUS = {
+    0: "deactivated",
+    1: "activated",
+    2: "mppt",
+    3: "equalizing",
+    4: "boost",
+    5: "floating",
+    6: "current limiting",
+}
+_DCC_CHARGING_STATUS = {
+    0: "standby",
+    2: "mppt",
+    3: "equalizing",
+    4: "boost",
+    5: "floating",
+    6: "current_limiting",
+    8: "dc_mode",
+}
+_DCC_CHARGING_MODE = {
+    0: "standby",
+    1: "alternator_to_house",
+    2: "house_to_starter",
+    3: "solar_to_house",
+    4: "solar_alternator_to_house",
+    5: "solar_to_starter",
+}
+
+
+def _battery_layout() -> dict[str, dict[str, Any]]:
+    """Build the battery BMS layout with 16 cell and temperature slots."""
+    layout: dict[str, dict[str, Any]] = {
+        "cell_count": _field(5000, 3),
+        "sensor_count": _field(5017, 3),
+        "current": _field(5042, 3, scale=0.01, signed=True, dynamic=True),
+        "voltage": _field(5042, 5, scale=0.1, dynamic=True),
+        "remaining_charge": _field(5042, 7, 4, scale=0.001, dynamic=True),
+        "capacity": _field(5042, 11, 4, scale=0.001),
+        "model": _field(5122, 3, 16, string=True),
+        "device_id": _field(5223, 4, 1),
+    }
+    for index in range(16):
+        layout[f"cell_voltage_{index}"] = _field(
+            5000, 5 + index * 2, scale=0.1, dynamic=True
+        )
+        layout[f"temperature_{index}"] = _field(
+            5017, 5 + index * 2, scale=0.1, signed=True, dynamic=True
+        )
+    return layout
+
+
+# Field layouts per device type, in renogy_ble.register_map format
+EMULATOR_REGISTER_MAP: dict[str, dict[str, dict[str, Any]]] = {
+    "controller": {
+        "model": _field(12, 3, 14, string=True),
+        "device_id": _field(26, 4, 1),
+        "battery_percentage": _field(256, 3, dynamic=True),
+        "battery_voltage": _field(256, 5, scale=0.1, dynamic=True),
+        "battery_current": _field(256, 7, scale=0.01, dynamic=True),
+        "controller_temperature": _field(
+            256, 9, 1, signed=True, sign_magnitude=True, dynamic=True
+        ),
+        "battery_temperature": _field(
+            256, 10, 1, signed=True, sign_magnitude=True, dynamic=True
+        ),
+        "load_voltage": _field(256, 11, scale=0.1, dynamic=True),
+        "load_current": _field(256, 13, scale=0.01, dynamic=True),
+        "load_power": _field(256, 15, dynamic=True),
+        "pv_voltage": _field(256, 17, scale=0.1, dynamic=True),
+        "pv_current": _field(256, 19, scale=0.01, dynamic=True),
+        "pv_power": _field(256, 21, dynamic=True),
+        "max_charging_power_today": _field(256, 33),
+        "max_discharging_power_today": _field(256, 35),
+        "charging_amp_hours_today": _field(256, 37),
+        "discharging_amp_hours_today": _field(256, 39),
+        "power_generation_today": _field(256, 41),
+        "power_consumption_today": _field(256, 43),
+        "power_generation_total": _field(256, 59, 4),
+        "load_status": _field(256, 67, 1, bit_offset=7, value_map={0: "off", 1: "on"}),
+        "charging_status": _field(256, 68, 1, value_map=_CONTROLLER_CHARGING_STATUS),
+        "battery_type": _field(
+            57348,
+            3,
+            value_map={1: "open", 2: "sealed", 3: "gel", 4: "lithium", 5: "custom"},
+        ),
+    },
+    "dcc": {
+        "model": _field(12, 3, 14, string=True),
+        "device_id": _field(26, 4, 1),
+        "battery_soc": _field(256, 3, dynamic=True),
+        "battery_voltage": _field(256, 5, scale=0.1, dynamic=True),
+        "total_charging_current": _field(256, 7, scale=0.01, dynamic=True),
+        "controller_temperature": _field(
+            256, 9, 1, signed=True, sign_magnitude=True, dynamic=True
+        ),
+        "battery_temperature": _field(
+            256, 10, 1, signed=True, sign_magnitude=True, dynamic=True
+        ),
+        "alternator_voltage": _field(256, 11, scale=0.1, dynamic=True),
+        "alternator_current": _field(256, 13, scale=0.01, dynamic=True),
+        "alternator_power": _field(256, 15, dynamic=True),
+        "solar_voltage": _field(256, 17, scale=0.1, dynamic=True),
+        "solar_current": _field(256, 19, scale=0.01, dynamic=True),
+        "solar_power": _field(256, 21, dynamic=True),
+        "daily_min_battery_voltage": _field(256, 25, scale=0.1),
+        "daily_max_battery_voltage": _field(256, 27, scale=0.1),
+        "daily_max_charging_current": _field(256, 29, scale=0.01),
+        "daily_max_charging_power": _field(256, 33),
+        "daily_charging_ah": _field(256, 37),
+        "daily_power_generation": _field(256, 41, scale=0.001),
+        "total_operating_days": _field(256, 45),
+        "total_overdischarge_count": _field(256, 47),
+        "total_full_charge_count": _field(256, 49),
+        "total_charging_ah": _field(256, 51, 4),
+        "total_power_generation": _field(256, 59, 4, scale=0.001),
+        "charging_status": _field(288, 4, 1, value_map=_DCC_CHARGING_STATUS),
+        "fault_high": _field(289, 3),
+        "fault_low": _field(290, 3),
+        "output_power": _field(292, 3, dynamic=True),
+        "charging_mode": _field(293, 3, value_map=_DCC_CHARGING_MODE),
+        "ignition_status": _field(
+            294, 3, value_map={0: "disconnected", 1: "connected"}
+        ),
+        "max_charging_current": _field(57345, 3, scale=0.01),
+        "system_voltage": _field(57347, 3, 1),
+        "battery_type": _field(
+            57347,
+            5,
+            value_map={0: "custom", 1: "open", 2: "sealed", 3: "gel", 4: "lithium"},
+        ),
+        "overvoltage_threshold": _field(57347, 7, scale=0.1),
+        "charging_limit_voltage": _field(57347, 9, scale=0.1),
+        "equalization_voltage": _field(57347, 11, scale=0.1),
+        "boost_voltage": _field(57347, 13, scale=0.1),
+        "float_voltage": _field(57347, 15, scale=0.1),
+        "boost_return_voltage": _field(57347, 17, scale=0.1),
+        "overdischarge_return_voltage": _field(57347, 19, scale=0.1),
+        "undervoltage_warning": _field(57347, 21, scale=0.1),
+        "overdischarge_voltage": _field(57347, 23, scale=0.1),
+        "discharge_limit_voltage": _field(57347, 25, scale=0.1),
+        "overdischarge_delay": _field(57347, 29),
+        "equalization_time": _field(57347, 31),
+        "boost_time": _field(57347, 33),
+        "equalization_interval": _field(57347, 35),
+        "temperature_compensation": _field(57347, 37),
+        "reverse_charging_voltage": _field(57376, 3, scale=0.1),
+        "solar_cutoff_current": _field(57400, 3),
+    },
+    "battery": _battery_layout(),
+}
+
+# Realistic default values per device type
+DEFAULT_VALUES: dict[str, dict[str, Any]] = {
+    "controller": {
+        "model": "RNG-CTRL-RVR40",
+        "device_id": 1,
+        "battery_percentage": 87,
+        "battery_voltage": 13.2,
+        "battery_current": 4.25,
+        "controller_temperature": 27,
+        "battery_temperature": 22,
+        "load_voltage": 13.1,
+        "load_current": 0.85,
+        "load_power": 11,
+        "pv_voltage": 18.6,
+        "pv_current": 3.1,
+        "pv_power": 57,
+        "max_charging_power_today": 212,
+        "max_discharging_power_today": 38,
+        "charging_amp_hours_today": 31,
+        "discharging_amp_hours_today": 9,
+        "power_generation_today": 402,
+        "power_consumption_today": 118,
+        "power_generation_total": 125400,
+        "load_status": "on",
+        "charging_status": "mppt",
+        "battery_type": "lithium",
+    },
+    "dcc": {
+        "model": "RBC50D1S-G1",
+        "device_id": 1,
+        "battery_soc": 76,
+        "battery_voltage": 13.4,
+        "total_charging_current": 18.5,
+        "controller_temperature": 31,
+        "battery_temperature": 20,
+        "alternator_voltage": 14.1,
+        "alternator_current": 12.2,
+        "alternator_power": 172,
+        "solar_voltage": 19.8,
+        "solar_current": 4.6,
+        "solar_power": 91,
+        "daily_min_battery_voltage": 12.8,
+        "daily_max_battery_voltage": 14.2,
+        "daily_max_charging_current": 32.5,
+        "daily_max_charging_power": 455,
+        "daily_charging_ah": 48,
+        "daily_power_generation": 0.62,
+        "total_operating_days": 311,
+        "total_overdischarge_count": 2,
+        "total_full_charge_count": 188,
+        "total_charging_ah": 15234,
+        "total_power_generation": 201.5,
+        "charging_status": "mppt",
+        "output_power": 248,
+        "charging_mode": "solar_alternator_to_house",
+        "ignition_status": "connected",
+        "max_charging_current": 40.0,
+        "system_voltage": 12,
+        "battery_type": "lithium",
+        "overvoltage_threshold": 16.0,
+        "charging_limit_voltage": 14.6,
+        "equalization_voltage": 14.6,
+        "boost_voltage": 14.4,
+        "float_voltage": 13.6,
+        "boost_return_voltage": 13.2,
+        "overdischarge_return_voltage": 12.6,
+        "undervoltage_warning": 12.0,
+        "overdischarge_voltage": 11.1,
+        "discharge_limit_voltage": 10.6,
+        "overdischarge_delay": 5,
+        "equalization_time": 120,
+        "boost_time": 120,
+        "equalization_interval": 30,
+        "temperature_compensation": 5,
+        "reverse_charging_voltage": 12.8,
+        "solar_cutoff_current": 5,
+    },
+    "battery": {
+        "cell_count": 4,
+        "sensor_count": 4,
+        "current": -2.35,
+        "voltage": 13.3,
+        "remaining_charge": 82.5,
+        "capacity": 100.0,
+        "model": "RBT100LFP12S-G1",
+        "device_id": 48,
+        **{f"cell_voltage_{index}": 3.3 for index in range(4)},
+        **{f"temperature_{index}": 21.5 for index in range(4)},
+    },
+}
+
+DEFAULT_NAMES = {
+    "controller": "BT-TH-{suffix}",
+    "dcc": "BT-TH-{suffix}",
+    "battery": "RNGRBP{suffix}",
+}
+
+
+def modbus_crc(data: bytes | bytearray) -> tuple[int, int]:
+    """Return the Modbus CRC16 as (low, high) bytes."""
+    crc = 0xFFFF
+    for pos in data:
+        crc ^= pos
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return (crc & 0xFF, (crc >> 8) & 0xFF)
+
+
+def _with_crc(frame: bytearray) -> bytes:
+    frame.extend(modbus_crc(frame))
+    return bytes(frame)
+
+
+def build_read_request(
+    device_id: int, function_code: int, register: int, word_count: int
+) -> bytes:
+    """Build a Modbus read holding registers request."""
+    return _with_crc(
+        bytearray(
+            [
+                device_id,
+                function_code,
+                (register >> 8) & 0xFF,
+                register & 0xFF,
+                (word_count >> 8) & 0xFF,
+                word_count & 0xFF,
+            ]
+        )
+    )
+
+
+def build_write_request(device_id: int, register: int, value: int) -> bytes:
+    """Build a Modbus write single register request."""
+    return _with_crc(
+        bytearray(
+            [
+                device_id,
+                0x06,
+                (register >> 8) & 0xFF,
+                register & 0xFF,
+                (value >> 8) & 0xFF,
+                value & 0xFF,
+            ]
+        )
+    )
+
+
+def build_write_multiple_request(
+    device_id: int, register: int, values: list[int]
+) -> bytes:
+    """Build a Modbus write multiple registers (0x10) request."""
+    frame = bytearray(
+        [
+            device_id,
+            0x10,
+            (register >> 8) & 0xFF,
+            register & 0xFF,
+            (len(values) >> 8) & 0xFF,
+            len(values) & 0xFF,
+            len(values) * 2,
+        ]
+    )
+    for value in values:
+        frame.extend(((value >> 8) & 0xFF, value & 0xFF))
+    return _with_crc(frame)
+
+
+def decode_field(data: bytes, info: dict[str, Any]) -> Any:
+    """Decode a field from a response frame like renogy_ble's parser does."""
+    offset = info["offset"]
+    length = info["length"]
+    raw = data[offset : offset + length]
+    if len(raw) < length:
+        raise ValueError(f"Response too short for offset {offset}")
+    if info.get("data_type") == "string":
+        return raw.decode("ascii", errors="ignore").strip("\x00").strip()
+
+    signed = info.get("signed", False)
+    value = int.from_bytes(raw, "big", signed=signed)
+    if signed and length == 1 and info.get("signed_encoding") == "sign_magnitude":
+        value = -(raw[0] & 0x7F) if raw[0] & 0x80 else raw[0]
+    if "bit_offset" in info:
+        value = (value >> info["bit_offset"]) & 1
+    if "scale" in info:
+        value = value * info["scale"]
+    value_map = info.get("map")
+    if value_map is not None and isinstance(value, int) and value in value_map:
+        value = value_map[value]
+    return value
+
+
+def parse_response(device_type: str, register: int, data: bytes) -> dict[str, Any]:
+    """Parse a read response for the command that starts at ``register``."""
+    result: dict[str, Any] = {}
+    for name, info in EMULATOR_REGISTER_MAP.get(device_type, {}).items():
+        if info["register"] != register:
+            continue
+        try:
+            result[name] = decode_field(data, info)
+        except ValueError:
+            continue
+    if device_type == "battery":
+        _finish_battery_data(result)
+    return result
+
+
+def _finish_battery_data(result: dict[str, Any]) -> None:
+    """Drop unused cell/temperature slots and derive SOC and power."""
+    for prefix, count_key in (
+        ("cell_voltage_", "cell_count"),
+        ("temperature_", "sensor_count"),
+    ):
+        if count_key in result:
+            for index in range(result[count_key], 16):
+                result.pop(f"{prefix}{index}", None)
+    if result.get("capacity"):
+        result["soc"] = round(result["remaining_charge"] / result["capacity"] * 100, 1)
+    if "voltage" in result and "current" in result:
+        result["power"] = round(result["voltage"] * result["current"], 1)
+
+
+@dataclass
+class EmulatorConditions:
+    """Link conditions applied to every Modbus exchange."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    packet_loss: float = 0.0
+    disconnect_rate: float = 0.0
+    drift: float = 0.0
+
+
+@dataclass
+class EmulatorStats:
+    """Counters kept by an emulated device."""
+
+    connects: int = 0
+    requests: int = 0
+    reads: int = 0
+    writes: int = 0
+    lost_packets: int = 0
+    disconnects: int = 0
+    exceptions: int = 0
+    written_registers: list[tuple[int, int]] = field(default_factory=list)
+    read_ranges: list[tuple[int, int]] = field(default_factory=list)
+
+
+class RenogyDeviceEmulator:
+    """A single emulated Renogy device with a Modbus register bank."""
+
+    def __init__(
+        self,
+        device_type: str,
+        *,
+        address: str = "AA:BB:CC:DD:EE:FF",
+        name: str | None = None,
+        device_id: int = DEFAULT_DEVICE_ID,
+        values: dict[str, Any] | None = None,
+        conditions: EmulatorConditions | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the emulator with default or custom values."""
+        if device_type not in EMULATOR_COMMANDS:
+            raise ValueError(f"Unsupported device type: {device_type}")
+        self.device_type = device_type
+        self.address = address
+        self.name = name or DEFAULT_NAMES[device_type].format(
+            suffix=address.replace(":", "")[-8:]
+        )
+        self.device_id = device_id
+        self.conditions = conditions or EmulatorConditions()
+        self.stats = EmulatorStats()
+        self.rng = random.Random(seed)
+        self.connected = False
+        self.layout = EMULATOR_REGISTER_MAP[device_type]
+        self.commands = EMULATOR_COMMANDS[device_type]
+
+        self._bank = bytearray(0x10000 * 2)
+        self._readable: set[int] = set()
+        for _function, start, count in self.commands.values():
+            self._readable.update(range(start, start + count))
+        # Settings registers and the load switch accept writes
+        self._writable = {register for register in self._readable if register >= 0xE000}
+        if device_type == "controller":
+            self._writable.add(LOAD_CONTROL_REGISTER)
+            self._readable.add(LOAD_CONTROL_REGISTER)
+
+        for key, value in {**DEFAULT_VALUES[device_type], **(values or {})}.items():
+            self.set_value(key, value)
+
+    # Register level access
+
+    def read_registers(self, register: int, count: int) -> list[int]:
+        """Return ``count`` 16 bit register words starting at ``register``."""
+        return [
+            int.from_bytes(self._bank[(reg * 2) : (reg * 2) + 2], "big")
+            for reg in range(register, register + count)
+        ]
+
+    def write_register(self, register: int, value: int) -> None:
+        """Write one 16 bit register word, applying device side effects."""
+        self._bank[register * 2 : register * 2 + 2] = (value & 0xFFFF).to_bytes(
+            2, "big"
+        )
+        self.stats.written_registers.append((register, value & 0xFFFF))
+        if self.device_type == "controller" and register == LOAD_CONTROL_REGISTER:
+            # The load state is reported in the high bit of register 0x0120
+            status_byte = LOAD_STATUS_REGISTER * 2
+            if value:
+                self._bank[status_byte] |= 0x80
+            else:
+                self._bank[status_byte] &= 0x7F
+
+    # Field level access
+
+    def set_value(self, key: str, value: Any) -> None:
+        """Encode a parsed value into the register bank."""
+        info = self.layout[key]
+        start = info["register"] * 2 + info["offset"] - 3
+        length = info["length"]
+        if info.get("data_type") == "string":
+            encoded = str(value).encode("ascii")[:length].ljust(length, b"\x00")
+            self._bank[start : start + length] = encoded
+            return
+
+        value_map = info.get("map")
+        if value_map is not None and isinstance(value, str):
+            value = next(raw for raw, name in value_map.items() if name == value)
+        if "scale" in info:
+            value = round(value / info["scale"])
+        value = int(value)
+
+        if "bit_offset" in info:
+            bit = 1 << info["bit_offset"]
+            current = self._bank[start]
+            self._bank[start] = current | bit if value else current & ~bit & 0xFF
+            return
+        if info.get("signed_encoding") == "sign_magnitude" and length == 1:
+            raw = bytes([(abs(value) & 0x7F) | (0x80 if value < 0 else 0)])
+        else:
+            signed = info.get("signed", False)
+            if signed:
+                limit = 1 << (length * 8 - 1)
+                value = max(-limit, min(limit - 1, value))
+            else:
+                value = max(0, min((1 << (length * 8)) - 1, value))
+            raw = value.to_bytes(length, "big", signed=signed)
+        self._bank[start : start + length] = raw
+
+    def get_value(self, key: str) -> Any:
+        """Decode a value from the register bank."""
+        info = self.layout[key]
+        start = info["register"] * 2
+        frame = bytes(3) + bytes(self._bank[start : start + info["offset"] + 64])
+        return decode_field(frame, info)
+
+    def values(self) -> dict[str, Any]:
+        """Return all decoded field values."""
+        return {key: self.get_value(key) for key in self.layout}
+
+    def apply_drift(self) -> None:
+        """Random walk every dynamic numeric field by up to ``drift`` (relative)."""
+        drift = self.conditions.drift
+        if not drift:
+            return
+        for key, info in self.layout.items():
+            if not info.get("dynamic") or "map" in info:
+                continue
+            value = self.get_value(key)
+            step = max(abs(value), 1) * drift * self.rng.uniform(-1, 1)
+            self.set_value(key, value + step)
+
+    # Modbus protocol
+
+    def handle_request(self, request: bytes) -> Optional[bytes]:
+        """Answer a Modbus RTU request frame, or return None if it is lost."""
+        self.stats.requests += 1
+        if self.rng.random() < self.conditions.packet_loss:
+            self.stats.lost_packets += 1
+            return None
+        if len(request) < 8 or bytes(modbus_crc(request[:-2])) != request[-2:]:
+            # Real devices stay silent on corrupted frames
+            return None
+
+        function_code = request[1]
+        register = (request[2] << 8) | request[3]
+        if function_code == 0x03:
+            count = (request[4] << 8) | request[5]
+            if not all(
+                reg in self._readable for reg in range(register, register + count)
+            ):
+                return self._exception(function_code, ILLEGAL_DATA_ADDRESS)
+            self.stats.reads += 1
+            self.stats.read_ranges.append((register, count))
+            self.apply_drift()
+            payload = bytearray([self.device_id, function_code, count * 2])
+            for word in self.read_registers(register, count):
+                payload.extend(((word >> 8) & 0xFF, word & 0xFF))
+            return _with_crc(payload)
+        if function_code == 0x06:
+            if register not in self._writable:
+                return self._exception(function_code, ILLEGAL_DATA_ADDRESS)
+            self.stats.writes += 1
+            self.write_register(register, (request[4] << 8) | request[5])
+            return bytes(request[:8])
+        if function_code == 0x10:
+            count = (request[4] << 8) | request[5]
+            if not all(
+                reg in self._writable for reg in range(register, register + count)
+            ):
+                return self._exception(function_code, ILLEGAL_DATA_ADDRESS)
+            self.stats.writes += 1
+            for index in range(count):
+                word = (request[7 + index * 2] << 8) | request[8 + index * 2]
+                self.write_register(register + index, word)
+            return _with_crc(bytearray(request[:6]))
+        return self._exception(function_code, ILLEGAL_FUNCTION)
+
+    def _exception(self, function_code: int, code: int) -> bytes:
+        self.stats.exceptions += 1
+        return _with_crc(bytearray([self.device_id, function_code | 0x80, code]))
+
+    def response_delay(self) -> float:
+        """Return the simulated round trip time for one exchange."""
+        jitter = self.conditions.jitter
+        return max(0.0, self.conditions.latency + self.rng.uniform(-jitter, jitter))
+
+    def should_disconnect(self) -> bool:
+        """Return True if the link should drop on this exchange."""
+        return self.rng.random() < self.conditions.disconnect_rate
+
+    # Home Assistant helpers
+
+    def ble_device(self) -> Any:
+        """Return a BLEDevice-like object for this emulator."""
+        return BluetoothServiceInfoBleak(self.address, self.name, -60).device
+
+    def service_info(self, rssi: int = -60) -> BluetoothServiceInfoBleak:
+        """Return advertisement data for this emulator."""
+        return BluetoothServiceInfoBleak(self.address, self.name, rssi)
+
+
+class EmulatedGattClient:
+    """Fake GATT peer bridging write/notify characteristics to an emulator."""
+
+    def __init__(
+        self,
+        emulator: RenogyDeviceEmulator,
+        *,
+        disconnected_callback: Callable[[Any], None] | None = None,
+        error_cls: type[Exception] = ConnectionError,
+    ) -> None:
+        """Initialize the connection."""
+        self.emulator = emulator
+        self.address = emulator.address
+        self.is_connected = True
+        self._disconnected_callback = disconnected_callback
+        self._error_cls = error_cls
+        self._notify_handler: Callable[[Any, bytearray], None] | None = None
+        emulator.connected = True
+        emulator.stats.connects += 1
+
+    async def start_notify(
+        self, _uuid: str, handler: Callable[[Any, bytearray], None]
+    ) -> None:
+        """Register the notification handler."""
+        self._notify_handler = handler
+
+    async def stop_notify(self, _uuid: str) -> None:
+        """Unregister the notification handler."""
+        self._notify_handler = None
+
+    async def write_gatt_char(
+        self, _uuid: str, data: bytes | bytearray, response: bool = False
+    ) -> None:
+        """Send a request and deliver the response as MTU sized notifications."""
+        if not self.is_connected:
+            raise self._error_cls("Not connected")
+        if self.emulator.should_disconnect():
+            self.emulator.stats.disconnects += 1
+            self._drop()
+            raise self._error_cls("Device disconnected")
+
+        delay = self.emulator.response_delay()
+        if delay:
+            await asyncio.sleep(delay)
+        response_frame = self.emulator.handle_request(bytes(data))
+        if response_frame is None or self._notify_handler is None:
+            return
+        for start in range(0, len(response_frame), NOTIFICATION_MTU):
+            chunk = bytearray(response_frame[start : start + NOTIFICATION_MTU])
+            self._notify_handler(None, chunk)
+
+    async def disconnect(self) -> bool:
+        """Close the connection."""
+        if self.is_connected:
+            self.is_connected = False
+            self.emulator.connected = False
+        return True
+
+    def _drop(self) -> None:
+        self.is_connected = False
+        self.emulator.connected = False
+        if self._disconnected_callback is not None:
+            self._disconnected_callback(self)
+
+
+@dataclass
+class EmulatedReadResult:
+    """Mirror of renogy_ble.ble.RenogyBleReadResult."""
+
+    success: bool
+    parsed_data: dict[str, Any]
+    error: Exception | None = None
+
+
+@dataclass
+class EmulatedWriteResult:
+    """Mirror of renogy_ble.ble.RenogyBleWriteResult."""
+
+    success: bool
+    error: Exception | None = None
+
+
+class EmulatedRenogyBleClient:
+    """Drop-in replacement for ``RenogyBleClient`` backed by emulators.
+
+    Every call opens and closes a fake connection, like the library client.
+    """
+
+    def __init__(
+        self,
+        fleet: RenogyEmulatorFleet,
+        *,
+        commands: dict[str, dict[str, tuple[int, int, int]]] | None = None,
+        device_id: int = DEFAULT_DEVICE_ID,
+        timeout: float = 2.0,
+        error_cls: type[Exception] = ConnectionError,
+    ) -> None:
+        """Initialize the client."""
+        self._fleet = fleet
+        self._commands = commands or EMULATOR_COMMANDS
+        self._device_id = device_id
+        self._timeout = timeout
+        self._error_cls = error_cls
+
+    async def read_device(self, device: Any) -> EmulatedReadResult:
+        """Read every configured command from the emulated device."""
+        emulator = self._fleet[device.address]
+        commands = self._commands.get(device.device_type)
+        if not commands:
+            error = ValueError(f"Unsupported device type: {device.device_type}")
+            return EmulatedReadResult(False, dict(device.parsed_data), error)
+
+        device.parsed_data.clear()
+        client = await self._fleet.async_connect(emulator, error_cls=self._error_cls)
+        any_command_succeeded = False
+        error: Exception | None = None
+        # A dropped link raises error_cls to the caller, like a BleakError
+        try:
+            for cmd_name, (function_code, register, count) in commands.items():
+                request = build_read_request(
+                    self._device_id, function_code, register, count
+                )
+                try:
+                    response = await self._exchange(client, request, 5 + count * 2)
+                except asyncio.TimeoutError:
+                    continue
+                if response[1] & 0x80:
+                    continue
+                if self._update_parsed_data(device, response, register, cmd_name):
+                    any_command_succeeded = True
+        finally:
+            await client.disconnect()
+
+        if not any_command_succeeded:
+            error = RuntimeError("No commands completed successfully")
+        return EmulatedReadResult(
+            any_command_succeeded, dict(device.parsed_data), error
+        )
+
+    async def write_single_register(
+        self, device: Any, register: int, value: int
+    ) -> EmulatedWriteResult:
+        """Write one register on the emulated device."""
+        emulator = self._fleet[device.address]
+        request = build_write_request(self._device_id, register, value)
+        client = await self._fleet.async_connect(emulator, error_cls=self._error_cls)
+        try:
+            response = await self._exchange(client, request, 8)
+        except (asyncio.TimeoutError, self._error_cls) as err:
+            return EmulatedWriteResult(False, err)
+        finally:
+            await client.disconnect()
+        if response[:6] != request[:6]:
+            return EmulatedWriteResult(False, RuntimeError("Response mismatch"))
+        return EmulatedWriteResult(True, None)
+
+    async def write_register(self, device: Any, register: int, value: int) -> bool:
+        """Write one register and return True on success."""
+        result = await self.write_single_register(device, register, value)
+        return result.success
+
+    async def write_registers(
+        self, device: Any, register: int, values: list[int]
+    ) -> EmulatedWriteResult:
+        """Write consecutive registers with one write multiple request."""
+        emulator = self._fleet[device.address]
+        request = build_write_multiple_request(self._device_id, register, values)
+        client = await self._fleet.async_connect(emulator, error_cls=self._error_cls)
+        try:
+            response = await self._exchange(client, request, 8)
+        except (asyncio.TimeoutError, self._error_cls) as err:
+            return EmulatedWriteResult(False, err)
+        finally:
+            await client.disconnect()
+        if response[:6] != request[:6]:
+            return EmulatedWriteResult(False, RuntimeError("Response mismatch"))
+        return EmulatedWriteResult(True, None)
+
+    async def _exchange(
+        self, client: EmulatedGattClient, request: bytes, expected_len: int
+    ) -> bytes:
+        received = bytearray()
+        event = asyncio.Event()
+
+        def _collect(_sender: Any, data: bytearray) -> None:
+            received.extend(data)
+            event.set()
+
+        await client.start_notify(READ_CHAR_UUID, _collect)
+        await client.write_gatt_char(WRITE_CHAR_UUID, request)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._timeout
+        while len(received) < expected_len:
+            if len(received) >= 5 and received[1] & 0x80:
+                return bytes(received[:5])
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            event.clear()
+            await asyncio.wait_for(event.wait(), remaining)
+        return bytes(received[:expected_len])
+
+    @staticmethod
+    def _update_parsed_data(
+        device: Any, response: bytes, register: int, cmd_name: str
+    ) -> bool:
+        update = getattr(device, "update_parsed_data", None)
+        if callable(update):
+            return bool(update(response, register=register, cmd_name=cmd_name))
+        parsed = parse_response(device.device_type, register, response)
+        device.parsed_data.update(parsed)
+        return bool(parsed)
+
+
+class RenogyEmulatorFleet:
+    """A set of emulated devices addressed by MAC address."""
+
+    def __init__(
+        self,
+        *,
+        conditions: EmulatorConditions | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize an empty fleet."""
+        self.conditions = conditions or EmulatorConditions()
+        self._rng = random.Random(seed)
+        self._devices: dict[str, RenogyDeviceEmulator] = {}
+
+    def __getitem__(self, address: str) -> RenogyDeviceEmulator:
+        """Return the emulator for ``address``."""
+        return self._devices[address]
+
+    def __iter__(self):
+        """Iterate over emulators."""
+        return iter(self._devices.values())
+
+    def __len__(self) -> int:
+        """Return the number of emulated devices."""
+        return len(self._devices)
+
+    def add(
+        self,
+        device_type: str,
+        count: int = 1,
+        *,
+        values: dict[str, Any] | None = None,
+        conditions: EmulatorConditions | None = None,
+    ) -> list[RenogyDeviceEmulator]:
+        """Add ``count`` devices of ``device_type`` with unique addresses."""
+        added = []
+        for _ in range(count):
+            index = len(self._devices) + 1
+            address = "AA:BB:CC:{:02X}:{:02X}:{:02X}".format(
+                (index >> 16) & 0xFF, (index >> 8) & 0xFF, index & 0xFF
+            )
+            emulator = RenogyDeviceEmulator(
+                device_type,
+                address=address,
+                values=values,
+                conditions=conditions or self.conditions,
+                seed=self._rng.randrange(1 << 30),
+            )
+            self._devices[address] = emulator
+            added.append(emulator)
+        return added
+
+    async def async_connect(
+        self,
+        emulator: RenogyDeviceEmulator,
+        *,
+        disconnected_callback: Callable[[Any], None] | None = None,
+        error_cls: type[Exception] = ConnectionError,
+    ) -> EmulatedGattClient:
+        """Open a fake connection to ``emulator`` after the link latency."""
+        delay = emulator.response_delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return EmulatedGattClient(
+            emulator,
+            disconnected_callback=disconnected_callback,
+            error_cls=error_cls,
+        )
+
+    def establish_connection_factory(
+        self, error_cls: type[Exception] = ConnectionError
+    ) -> Callable[..., Any]:
+        """Return a stand-in for ``bleak_retry_connector.establish_connection``."""
+
+        async def establish_connection(
+            _client_class: Any,
+            ble_device: Any,
+            _name: str,
+            disconnected_callback: Callable[[Any], None] | None = None,
+            **_kwargs: Any,
+        ) -> EmulatedGattClient:
+            return await self.async_connect(
+                self[ble_device.address],
+                disconnected_callback=disconnected_callback,
+                error_cls=error_cls,
+            )
+
+        return establish_connection
+
+    def client(self, **kwargs: Any) -> EmulatedRenogyBleClient:
+        """Return a ``RenogyBleClient`` stand-in for this fleet."""
+        return EmulatedRenogyBleClient(self, **kwargs)
@@ -0,0 +1,23 @@
+"""Tests for the benchmark harness."""
+
+import copy
+
+from tests.benchmark import find_regressions, run_benchmark
+from tests.mocks.renogy_emulator import EmulatorConditions
+
+
+def test_benchmark_reports_metrics_and_flags_regressions():
+    """Ensure a small run produces metrics and regressions are detected."""
+    report = run_benchmark([2], polls=2, conditions=EmulatorConditions(drift=0.05))
+
+    scenario = report["scenarios"]["2"]
+    assert scenario["entities"] > 0
+    assert scenario["poll"]["count"] == 4
+    assert scenario["poll"]["failures"] == 0
+    assert scenario["sensor"]["updates_per_poll"] > 0
+    assert find_regressions(report, report) == []
+
+    baseline = copy.deepcopy(report)
+    baseline["scenarios"]["2"]["sensor"]["state_writes_per_poll"] = 0.1
+    regressions = find_regressions(report, baseline)
+    assert [item["metric"] for item in regressions] == ["sensor.state_writes_per_poll"]
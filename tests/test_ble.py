@@ -10,7 +10,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 def _install_module_stubs() -> None:
     """Install minimal module stubs to import the BLE coordinator."""
-    from tests.mocks import ha_bluetooth, ha_coordinator
+    from tests.mocks import ha_bluetooth, ha_coordinator, ha_services, ha_storage
 
     bleak_module = cast(Any, types.ModuleType("bleak"))
 
@@ -20,6 +20,11 @@ def _install_module_stubs() -> None:
     bleak_module.BleakError = BleakError
     sys.modules["bleak"] = bleak_module
 
+    retry_connector_module = cast(Any, types.ModuleType("bleak_retry_connector"))
+    retry_connector_module.BleakClientWithServiceCache = object
+    retry_connector_module.establish_connection = AsyncMock()
+    sys.modules["bleak_retry_connector"] = retry_connector_module
+
     core_module = cast(Any, types.ModuleType("homeassistant.core"))
 
     class CoreState(str, Enum):
@@ -34,11 +39,14 @@ def _install_module_stubs() -> None:
     core_module.CoreState = CoreState
     core_module.HomeAssistant = object
     core_module.callback = callback
+    ha_services.install(core_module)
 
     helpers_event_module = cast(Any, types.ModuleType("homeassistant.helpers.event"))
     helpers_event_module.async_track_time_interval = MagicMock()
+    helpers_event_module.async_call_later = MagicMock()
 
     bluetooth_module = cast(Any, types.ModuleType("homeassistant.components.bluetooth"))
+    bluetooth_module.BluetoothCallbackMatcher = dict
     bluetooth_module.BluetoothChange = ha_bluetooth.BluetoothChange
     bluetooth_module.BluetoothScanningMode = ha_bluetooth.BluetoothScanningMode
     bluetooth_module.BluetoothServiceInfoBleak = ha_bluetooth.BluetoothServiceInfoBleak
@@ -69,6 +77,7 @@ def _install_module_stubs() -> None:
     device_registry_module.async_get = MagicMock()
     sys.modules["homeassistant.helpers"] = helpers_module
     sys.modules["homeassistant.helpers.device_registry"] = device_registry_module
+    sys.modules["homeassistant.helpers.storage"] = ha_storage
     const_module = cast(Any, types.ModuleType("homeassistant.const"))
     const_module.CONF_ADDRESS = "address"
 
@@ -89,8 +98,9 @@ def _install_module_stubs() -> None:
     class RenogyBleClient:
         """Stub RenogyBleClient for testing."""
 
-        def __init__(self, scanner):
+        def __init__(self, scanner=None, commands=None):
             self.scanner = scanner
+            self.commands = commands
 
         async def read_device(self, device):
             return MagicMock(success=True, error=None)
@@ -111,10 +121,74 @@ def _install_module_stubs() -> None:
         """Return a cleaned device name for testing."""
         return name.strip()
 
+    class RenogyBleReadResult:
+        """Stub RenogyBleReadResult for testing."""
+
+        def __init__(self, success, parsed_data, error=None):
+            self.success = success
+            self.parsed_data = parsed_data
+            self.error = error
+
+    class RenogyBleWriteResult:
+        """Stub RenogyBleWriteResult for testing."""
+
+        def __init__(self, success, error=None):
+            self.success = success
+            self.error = error
+
+    def modbus_crc(data):
+        """Return the Modbus CRC16 as (low, high) bytes."""
+        crc = 0xFFFF
+        for pos in data:
+            crc ^= pos
+            for _ in range(8):
+                crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        return (crc & 0xFF, (crc >> 8) & 0xFF)
+
+    def create_modbus_read_request(device_id, function_code, register, word_count):
+        """Build a Modbus read request frame."""
+        frame = bytearray(
+            [
+                device_id,
+                function_code,
+                (register >> 8) & 0xFF,
+                register & 0xFF,
+                (word_count >> 8) & 0xFF,
+                word_count & 0xFF,
+            ]
+        )
+        frame.extend(modbus_crc(frame))
+        return frame
+
+    def create_modbus_write_request(device_id, register, value, function_code=0x06):
+        """Build a Modbus write single register frame."""
+        frame = bytearray(
+            [
+                device_id,
+                function_code,
+                (register >> 8) & 0xFF,
+                register & 0xFF,
+                (value >> 8) & 0xFF,
+                value & 0xFF,
+            ]
+        )
+        frame.extend(modbus_crc(frame))
+        return frame
+
     renogy_ble_ble_module.RenogyBleClient = RenogyBleClient
     renogy_ble_ble_module.RenogyBLEDevice = RenogyBLEDevice
+    renogy_ble_ble_module.RenogyBleReadResult = RenogyBleReadResult
+    renogy_ble_ble_module.RenogyBleWriteResult = RenogyBleWriteResult
     renogy_ble_ble_module.clean_device_name = clean_device_name
+    renogy_ble_ble_module.modbus_crc = modbus_crc
+    renogy_ble_ble_module.create_modbus_read_request = create_modbus_read_request
+    renogy_ble_ble_module.create_modbus_write_request = create_modbus_write_request
     renogy_ble_ble_module.LOAD_CONTROL_REGISTER = 0x010A
+    renogy_ble_ble_module.COMMANDS = {"controller": {"pv": (3, 256, 2)}}
+    renogy_ble_ble_module.DEFAULT_DEVICE_ID = 0xFF
+    renogy_ble_ble_module.MAX_NOTIFICATION_WAIT_TIME = 0.1
+    renogy_ble_ble_module.RENOGY_READ_CHAR_UUID = "read-char"
+    renogy_ble_ble_module.RENOGY_WRITE_CHAR_UUID = "write-char"
 
     sys.modules["renogy_ble"] = renogy_ble_module
     sys.modules["renogy_ble.ble"] = renogy_ble_ble_module
@@ -124,6 +198,7 @@ def _load_ble_module():
     """Load the BLE module with stubs in place."""
     _install_module_stubs()
     sys.modules.pop("custom_components.renogy.ble", None)
+    sys.modules.pop("custom_components.renogy.session", None)
     sys.modules.pop("custom_components.renogy", None)
 
     import importlib
@@ -142,6 +217,7 @@ def test_read_device_data_handles_ble_errors():
         address="AA:BB:CC:DD:EE:FF",
         scan_interval=30,
         device_type="controller",
+        unavailable_after_failures=1,
     )
 
     service_info = ble_module.BluetoothServiceInfoBleak(
@@ -162,3 +238,676 @@ def test_read_device_data_handles_ble_errors():
     call_args = coordinator.device.update_availability.call_args[0]
     assert call_args[0] is False
     assert "read failed" in str(call_args[1])
+
+
+def test_library_without_write_support_loads_read_only():
+    """Ensure a renogy-ble build without write helpers still imports."""
+    _install_module_stubs()
+    renogy_ble_ble_module = sys.modules["renogy_ble.ble"]
+    del renogy_ble_ble_module.create_modbus_write_request
+    del renogy_ble_ble_module.RenogyBleWriteResult
+    sys.modules.pop("custom_components.renogy.ble", None)
+    sys.modules.pop("custom_components.renogy.session", None)
+    sys.modules.pop("custom_components.renogy", None)
+
+    import importlib
+
+    ble_module = importlib.import_module("custom_components.renogy.ble")
+    session_module = sys.modules["custom_components.renogy.session"]
+    assert not ble_module.HAS_WRITE_SUPPORT
+    assert not session_module.HAS_WRITE_SUPPORT
+
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+        persistent_session=True,
+    )
+    coordinator.device = MagicMock()
+    assert asyncio.run(coordinator.async_set_load_state(True)) is False
+    assert asyncio.run(coordinator.async_write_register(0xE004, 1)) is False
+    coordinator.device.update_availability.assert_not_called()
+
+
+class _FakeGattClient:
+    """Fake BLE client that answers Modbus reads with a fixed payload."""
+
+    def __init__(self, crc):
+        self.is_connected = True
+        self._crc = crc
+        self._handler = None
+        self.writes = []
+
+    async def start_notify(self, _uuid, handler):
+        self._handler = handler
+
+    async def write_gatt_char(self, _uuid, request):
+        self.writes.append(bytes(request))
+        if request[1] == 0x06:
+            self._handler(None, bytearray(request))
+            return
+        payload = bytearray([request[0], request[1], 4, 0x00, 0x64, 0x00, 0x7B])
+        payload.extend(self._crc(payload))
+        self._handler(None, payload)
+
+    async def disconnect(self):
+        self.is_connected = False
+
+
+def _session_device(ble_module):
+    """Create a device whose parser records the raw responses."""
+    ble_device = MagicMock(address="AA:BB:CC:DD:EE:FF", name="BT-TH-12345")
+    device = ble_module.RenogyBLEDevice(ble_device, -60, device_type="controller")
+
+    def update_parsed_data(raw, register, cmd_name):
+        device.parsed_data[cmd_name] = raw[3:-2].hex()
+        return True
+
+    device.update_parsed_data = update_parsed_data
+    return device
+
+
+def test_library_client_is_used_without_persistent_session():
+    """Ensure the in-tree session is only used when it was asked for."""
+    ble_module = _load_ble_module()
+
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+        device_type="controller",
+    )
+
+    assert isinstance(coordinator._ble_client, ble_module.RenogyBleClient)
+    assert coordinator._session is None
+
+
+def test_persistent_session_reuses_connection():
+    """Ensure the persistent session connects once for polls and writes."""
+    ble_module = _load_ble_module()
+    session_module = sys.modules["custom_components.renogy.session"]
+    fake_client = _FakeGattClient(session_module.modbus_crc)
+    session_module.establish_connection = AsyncMock(return_value=fake_client)
+
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+        persistent_session=True,
+    )
+    session = coordinator._ble_client
+    assert isinstance(session, session_module.RenogyBleSession)
+    device = _session_device(ble_module)
+
+    async def _exercise():
+        first = await session.read_device(device)
+        second = await session.read_device(device)
+        written = await session.write_single_register(device, 0x010A, 1)
+        return first, second, written
+
+    first, second, written = asyncio.run(_exercise())
+
+    assert first.success and second.success and written.success
+    assert device.parsed_data == {"pv": "0064007b"}
+    assert session_module.establish_connection.await_count == 1
+    assert len(fake_client.writes) == 3
+
+
+def test_persistent_session_reconnects_after_drop():
+    """Ensure a dropped connection is re-established on the next poll."""
+    _load_ble_module()
+    session_module = sys.modules["custom_components.renogy.session"]
+    clients = [
+        _FakeGattClient(session_module.modbus_crc),
+        _FakeGattClient(session_module.modbus_crc),
+    ]
+    session_module.establish_connection = AsyncMock(side_effect=clients)
+    session = session_module.RenogyBleSession(MagicMock(), MagicMock())
+    device = _session_device(sys.modules["custom_components.renogy.ble"])
+
+    async def _exercise():
+        await session.read_device(device)
+        session._handle_disconnect(clients[0])
+        return await session.read_device(device)
+
+    result = asyncio.run(_exercise())
+
+    assert result.success
+    assert session_module.establish_connection.await_count == 2
+
+
+def test_holding_the_session_pauses_the_idle_timer():
+    """Ensure an earlier idle timer cannot close a held connection."""
+    _load_ble_module()
+    session_module = sys.modules["custom_components.renogy.session"]
+    session_module.establish_connection = AsyncMock(
+        return_value=_FakeGattClient(session_module.modbus_crc)
+    )
+    timers = []
+
+    def _call_later(*_args):
+        timers.append(MagicMock())
+        return timers[-1]
+
+    session_module.async_call_later = _call_later
+    session = session_module.RenogyBleSession(MagicMock(), MagicMock())
+    device = _session_device(sys.modules["custom_components.renogy.ble"])
+
+    async def _exercise():
+        await session.read_device(device)
+        assert len(timers) == 1
+        async with session.hold_connection():
+            timers[0].assert_called_once()
+            await session.read_device(device)
+            assert len(timers) == 1
+        assert len(timers) == 2
+
+    asyncio.run(_exercise())
+
+    assert session_module.establish_connection.await_count == 1
+
+
+def test_tiered_polling_reads_static_and_settings_registers_less_often():
+    """Ensure static registers are read once and settings on a schedule."""
+    ble_module = _load_ble_module()
+    ble_module.renogy_ble_module.COMMANDS = {
+        "controller": {
+            "device_info": (3, 12, 8),
+            "device_id": (3, 26, 1),
+            "battery": (3, 57348, 1),
+            "pv": (3, 256, 34),
+        }
+    }
+    ble_module.renogy_register_map = types.SimpleNamespace(
+        REGISTER_MAP={
+            "controller": {
+                "model": {"register": 12},
+                "device_id": {"register": 26},
+                "battery_type": {"register": 57348},
+                "battery_voltage": {"register": 256},
+            }
+        }
+    )
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+        device_type="controller",
+        settings_refresh_polls=2,
+    )
+    service_info = ble_module.BluetoothServiceInfoBleak(
+        address="AA:BB:CC:DD:EE:FF",
+        name="BT-TH-12345",
+        rssi=-60,
+    )
+    values = {
+        "device_info": {"model": "RNG-CTRL-RVR40"},
+        "device_id": {"device_id": 1},
+        "battery": {"battery_type": "lithium"},
+        "pv": {"battery_voltage": 13.2},
+    }
+    polled = []
+
+    async def read_device(device):
+        commands = coordinator._ble_client.commands["controller"]
+        polled.append(sorted(commands))
+        device.parsed_data.clear()
+        for name in commands:
+            device.parsed_data.update(values[name])
+        return MagicMock(success=True, error=None)
+
+    coordinator._ble_client.read_device = read_device
+
+    async def _poll(count):
+        for _ in range(count):
+            await coordinator._read_device_data(service_info)
+
+    asyncio.run(_poll(4))
+
+    assert polled == [
+        ["battery", "device_id", "device_info", "pv"],
+        ["pv"],
+        ["pv"],
+        ["battery", "pv"],
+    ]
+    assert coordinator.data == {
+        "model": "RNG-CTRL-RVR40",
+        "device_id": 1,
+        "battery_type": "lithium",
+        "battery_voltage": 13.2,
+    }
+
+    coordinator._settings_stale = True
+    asyncio.run(_poll(1))
+    assert polled[-1] == ["battery", "pv"]
+
+
+def test_listeners_are_notified_only_for_changed_keys():
+    """Ensure keyed listeners only run when their data keys change."""
+    ble_module = _load_ble_module()
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+    )
+    voltage_listener = MagicMock()
+    current_listener = MagicMock()
+    global_listener = MagicMock()
+    coordinator.async_add_listener(voltage_listener, ("battery_voltage",))
+    remove_current = coordinator.async_add_listener(current_listener, "pv_current")
+    coordinator.async_add_listener(global_listener)
+
+    coordinator.data = {"battery_voltage": 12.6, "pv_current": 1.0}
+    coordinator._async_notify_data_changes()
+    coordinator.data = {"battery_voltage": 12.6, "pv_current": 1.5}
+    coordinator._async_notify_data_changes()
+
+    assert voltage_listener.call_count == 1
+    assert current_listener.call_count == 2
+    assert global_listener.call_count == 2
+
+    remove_current()
+    coordinator.last_update_success = False
+    coordinator._async_notify_data_changes()
+
+    assert voltage_listener.call_count == 2
+    assert current_listener.call_count == 2
+    assert global_listener.call_count == 3
+
+
+def test_polls_started_by_advertisements_publish_changed_keys_only():
+    """Ensure a poll run by the base coordinator goes through the same fan-out."""
+    ble_module = _load_ble_module()
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+        scan_interval=60,
+        adaptive_scan_interval=True,
+        scan_interval_min=15,
+        scan_interval_max=150,
+    )
+    coordinator._last_service_info = ble_module.BluetoothServiceInfoBleak(
+        address="AA:BB:CC:DD:EE:FF", name="BT-TH-12345", rssi=-60
+    )
+    samples = iter(
+        [
+            {"battery_voltage": 12.6, "pv_power": 0},
+            {"battery_voltage": 12.6, "pv_power": 0},
+        ]
+    )
+
+    async def _read_device_data(service_info):
+        coordinator.device = MagicMock(parsed_data=next(samples))
+        coordinator.data = coordinator._data_record(coordinator.device.parsed_data)
+        return True
+
+    coordinator._read_device_data = _read_device_data
+    voltage_listener = MagicMock()
+    coordinator.async_add_listener(voltage_listener, "battery_voltage")
+
+    asyncio.run(coordinator._async_poll())
+    asyncio.run(coordinator._async_poll())
+
+    # The unchanged second sample notifies nobody, but still counts as a
+    # flat poll for the adaptive interval
+    assert voltage_listener.call_count == 1
+    assert coordinator.value_plans.is_current(coordinator.data)
+    assert coordinator.poll_timings.phase_stats("fan_out")["count"] == 2
+    assert coordinator.scan_interval == 90
+
+
+def test_platforms_share_one_initial_refresh():
+    """Ensure concurrent readiness waiters trigger a single device read."""
+    ble_module = _load_ble_module()
+    hass = MagicMock()
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=hass,
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+    )
+    coordinator._async_refresh = AsyncMock()
+
+    async def _exercise():
+        hass.async_create_task = asyncio.ensure_future
+        results = await asyncio.gather(
+            coordinator.async_wait_ready(), coordinator.async_wait_ready()
+        )
+        coordinator.async_request_initial_refresh()
+        return results
+
+    assert asyncio.run(_exercise()) == [True, True]
+    assert coordinator.is_ready
+    coordinator._async_refresh.assert_awaited_once()
+
+
+def test_concurrent_refreshes_share_one_poll_and_writes_queue():
+    """Ensure refresh callers join one poll and writes wait for it."""
+    ble_module = _load_ble_module()
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+    )
+    ble_module.bluetooth.async_last_service_info.return_value = (
+        ble_module.BluetoothServiceInfoBleak(
+            address="AA:BB:CC:DD:EE:FF",
+            name="BT-TH-12345",
+            rssi=-60,
+        )
+    )
+    events = []
+    read_started = asyncio.Event()
+
+    async def read_device(device):
+        events.append("read-start")
+        read_started.set()
+        await asyncio.sleep(0.01)
+        device.parsed_data["battery_voltage"] = 12.6
+        events.append("read-end")
+        return MagicMock(success=True, error=None)
+
+    async def write_single_register(device, register, value):
+        events.append("write")
+        return MagicMock(success=True, error=None)
+
+    coordinator._ble_client.read_device = read_device
+    coordinator._ble_client.write_single_register = write_single_register
+
+    async def _exercise():
+        first = asyncio.ensure_future(coordinator.async_request_refresh())
+        await read_started.wait()
+        return await asyncio.gather(
+            first,
+            coordinator.async_request_refresh(),
+            coordinator.async_set_load_state(True),
+        )
+
+    results = asyncio.run(_exercise())
+
+    assert results == [True, True, True]
+    assert events == ["read-start", "read-end", "write"]
+    assert coordinator.data["load_status"] == "on"
+
+
+def test_writes_preempt_waiting_polls():
+    """Ensure a write runs before polls that were queued ahead of it."""
+    ble_module = _load_ble_module()
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+    )
+    service_info = ble_module.BluetoothServiceInfoBleak(
+        address="AA:BB:CC:DD:EE:FF",
+        name="BT-TH-12345",
+        rssi=-60,
+    )
+    ble_module.bluetooth.async_last_service_info.return_value = service_info
+    events = []
+    read_started = asyncio.Event()
+
+    async def read_device(device):
+        events.append("read")
+        read_started.set()
+        await asyncio.sleep(0.01)
+        return MagicMock(success=True, error=None)
+
+    async def write_single_register(device, register, value):
+        events.append("write")
+        return MagicMock(success=True, error=None)
+
+    coordinator._ble_client.read_device = read_device
+    coordinator._ble_client.write_single_register = write_single_register
+    queue = coordinator.operation_queue
+
+    async def _exercise():
+        first = asyncio.ensure_future(coordinator._read_device_data(service_info))
+        await read_started.wait()
+        second = asyncio.ensure_future(coordinator._read_device_data(service_info))
+        write = asyncio.ensure_future(coordinator.async_set_load_state(False))
+        await asyncio.sleep(0)
+        assert queue.pending("poll") == 1
+        assert queue.pending("write") == 1
+        return await asyncio.gather(first, second, write)
+
+    assert asyncio.run(_exercise()) == [True, True, True]
+    assert events == ["read", "write", "read"]
+    stats = queue.async_get_stats()
+    assert stats["depth"] == 0
+    assert stats["active"] is None
+    assert stats["max_depth"] == 2
+    assert stats["preemptions"] == 1
+    assert stats["completed"] == {"write": 1, "poll": 2}
+
+
+def test_stopping_cancels_batched_writes():
+    """Ensure stopping fails batched writes and drops the value plans."""
+    ble_module = _load_ble_module()
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+    )
+    coordinator.device = MagicMock(address="AA:BB:CC:DD:EE:FF")
+    coordinator.write_batch_window = 60
+    session_module = sys.modules["custom_components.renogy.session"]
+    session_module.establish_connection = AsyncMock()
+    plans_module = sys.modules["custom_components.renogy.plans"]
+    coordinator.value_plans.register(
+        plans_module.RenogyValuePlan("battery_voltage", field="battery_voltage")
+    )
+
+    async def _exercise():
+        write = asyncio.ensure_future(coordinator.async_write_register(0xE004, 1))
+        await asyncio.sleep(0)
+        coordinator.async_stop()
+        return await asyncio.wait_for(write, 1)
+
+    assert asyncio.run(_exercise()) is False
+    session_module.establish_connection.assert_not_awaited()
+    assert coordinator._write_flush_task is None
+    assert coordinator._write_batch is None
+    assert len(coordinator.value_plans) == 0
+
+
+def test_needs_poll_uses_the_age_of_the_last_poll():
+    """Ensure advertisements only poll once the scan interval has passed."""
+    ble_module = _load_ble_module()
+    hass = MagicMock()
+    hass.state = ble_module.CoreState.running
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=hass,
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+        scan_interval=60,
+    )
+    service_info = ble_module.BluetoothServiceInfoBleak(
+        address="AA:BB:CC:DD:EE:FF", name="BT-TH-12345", rssi=-60
+    )
+
+    # Home Assistant passes the seconds since the last poll
+    assert coordinator._needs_poll(service_info, 5.0) is False
+    assert coordinator._needs_poll(service_info, 59.9) is False
+    assert coordinator._needs_poll(service_info, 120.0) is True
+    assert coordinator._needs_poll(service_info, None) is True
+
+
+def test_absent_devices_skip_polls_until_they_advertise():
+    """Ensure interval polls wait for an advertisement after a silence."""
+    ble_module = _load_ble_module()
+    presence_module = sys.modules["custom_components.renogy.presence"]
+    hass = MagicMock()
+    hass.state = ble_module.CoreState.running
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=hass,
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+    )
+    now = [1000.0]
+    coordinator.presence = presence_module.RenogyPresenceTracker(
+        window=300, clock=lambda: now[0]
+    )
+    coordinator.async_request_refresh = AsyncMock(return_value=True)
+    service_info = ble_module.BluetoothServiceInfoBleak(
+        address="AA:BB:CC:DD:EE:FF", name="RNGRBP12345", rssi=-70
+    )
+    service_info.manufacturer_data = {57676: b"\x01"}
+
+    asyncio.run(coordinator._handle_refresh_interval())
+    assert coordinator.async_request_refresh.await_count == 1
+
+    # Out of range: the interval refresh is skipped without connecting
+    now[0] += 301
+    asyncio.run(coordinator._handle_refresh_interval())
+    assert coordinator.async_request_refresh.await_count == 1
+    assert coordinator.presence.skipped_polls == 1
+
+    # A passive advertisement brings it back and polls right away
+    coordinator._async_handle_advertisement(
+        service_info, ble_module.BluetoothChange.ADVERTISEMENT
+    )
+    hass.async_create_task.assert_called_once()
+    hass.async_create_task.call_args.args[0].close()
+    stats = coordinator.presence.async_get_stats()
+    assert stats["present"] is True
+    assert stats["seconds_since_manufacturer_data"] == 0
+    assert stats["last_rssi"] == -70
+
+    # Further advertisements of a present device don't trigger polls
+    coordinator._async_handle_advertisement(
+        service_info, ble_module.BluetoothChange.ADVERTISEMENT
+    )
+    hass.async_create_task.assert_called_once()
+
+    # Connectable advertisements also reach the coordinator's own callback,
+    # but only the passive callback counts them
+    coordinator._async_handle_bluetooth_event(
+        service_info, ble_module.BluetoothChange.ADVERTISEMENT
+    )
+    assert coordinator.presence.advertisements == 2
+
+
+def test_adaptive_scan_interval_follows_device_activity():
+    """Ensure the interval backs off while flat and shortens on activity."""
+    ble_module = _load_ble_module()
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+        scan_interval=60,
+        adaptive_scan_interval=True,
+        scan_interval_min=15,
+        scan_interval_max=150,
+    )
+    intervals = []
+    samples = [
+        {"pv_power": 0, "battery_current": 0.1},
+        {"pv_power": 0, "battery_current": 0.2},
+        {"pv_power": 2, "battery_current": 0.1},
+        {"pv_power": 1, "battery_current": 0.1},
+        {"pv_power": 240, "battery_current": 12.0},
+        {"pv_power": 120, "battery_current": 6.0},
+        {"pv_power": 125, "battery_current": 6.1},
+    ]
+    for data in samples:
+        coordinator.data = data
+        coordinator._async_adapt_scan_interval()
+        intervals.append(coordinator.scan_interval)
+
+    # Changes below the floors are noise, the ceiling caps the back-off
+    assert intervals == [60, 90, 135, 150, 75, 38, 57]
+    assert coordinator.update_interval.total_seconds() == 57
+
+    # Fixed intervals stay fixed
+    fixed = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+        scan_interval=60,
+    )
+    fixed.data = samples[0]
+    fixed._async_adapt_scan_interval()
+    assert fixed.adaptive_interval is None
+    assert fixed.scan_interval == 60
+
+
+def test_failed_polls_keep_data_available_until_a_limit():
+    """Ensure single failed polls mark the data stale, not unavailable."""
+    ble_module = _load_ble_module()
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+        unavailable_after_failures=3,
+        unavailable_after_seconds=300,
+    )
+    service_info = ble_module.BluetoothServiceInfoBleak(
+        address="AA:BB:CC:DD:EE:FF", name="BT-TH-12345", rssi=-60
+    )
+    results = iter([True, False, False, True, False, False, False])
+
+    async def read_device(device):
+        return MagicMock(success=next(results), error=None)
+
+    coordinator._ble_client.read_device = read_device
+    availability = []
+    for _ in range(7):
+        asyncio.run(coordinator._read_device_data(service_info))
+        availability.append((coordinator.last_update_success, coordinator.is_stale))
+
+    assert coordinator.device.max_failures == 3
+    assert availability == [
+        (True, False),
+        (True, True),
+        (True, True),
+        (True, False),
+        (True, True),
+        (True, True),
+        (False, True),
+    ]
+    assert coordinator.consecutive_failures == 3
+
+    # Failing for longer than the time limit is enough on its own
+    coordinator._async_record_result(True)
+    coordinator._async_record_result(False)
+    coordinator.failing_since -= ble_module.timedelta(seconds=301)
+    coordinator._async_record_result(False)
+    assert coordinator.last_update_success is False
+
+
+def test_poll_records_phase_timings():
+    """Ensure polls record per-phase durations and reuse skips the connect."""
+    ble_module = _load_ble_module()
+    session_module = sys.modules["custom_components.renogy.session"]
+    session_module.establish_connection = AsyncMock(
+        return_value=_FakeGattClient(session_module.modbus_crc)
+    )
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+        persistent_session=True,
+        connection_scheduler=ble_module.RenogyConnectionScheduler(),
+    )
+    coordinator.device = _session_device(ble_module)
+    ble_module.bluetooth.async_last_service_info.return_value = (
+        ble_module.BluetoothServiceInfoBleak(
+            address="AA:BB:CC:DD:EE:FF", name="BT-TH-12345", rssi=-60
+        )
+    )
+
+    async def _exercise():
+        assert await coordinator.async_request_refresh()
+        assert await coordinator.async_request_refresh()
+
+    asyncio.run(_exercise())
+
+    timings = coordinator.poll_timings.as_dict()
+    for phase in ("slot_wait", "read", "modbus", "parse", "fan_out", "total"):
+        assert timings[phase]["count"] == 2, phase
+    # The second poll reused the open session
+    assert timings["connect"]["count"] == 1
+    assert timings["services"]["count"] == 1
+    assert timings["total"]["p50"] <= timings["total"]["p95"]
+    assert timings["total"]["p95"] <= timings["total"]["max"]
@@ -0,0 +1,88 @@
+"""Tests for Renogy BLE diagnostics."""
+
+import asyncio
+import importlib
+import sys
+import types
+from typing import Any, cast
+from unittest.mock import MagicMock
+
+from tests.test_ble import _load_ble_module
+
+
+def _load_diagnostics_module():
+    """Load the diagnostics module with stubs in place."""
+    ble_module = _load_ble_module()
+    diagnostics_module = cast(
+        Any, types.ModuleType("homeassistant.components.diagnostics")
+    )
+    diagnostics_module.async_redact_data = lambda data, to_redact: {
+        key: "**REDACTED**" if key in to_redact else value
+        for key, value in data.items()
+    }
+    sys.modules["homeassistant.components.diagnostics"] = diagnostics_module
+    sys.modules.pop("custom_components.renogy.diagnostics", None)
+    return ble_module, importlib.import_module("custom_components.renogy.diagnostics")
+
+
+def test_poll_timings_keep_a_rolling_window():
+    """Ensure percentiles only cover the most recent samples."""
+    _load_ble_module()
+    timing_module = importlib.import_module("custom_components.renogy.timing")
+    timings = timing_module.RenogyPollTimings(samples=10)
+
+    for value in range(1, 21):
+        timings.record("modbus", value / 10)
+
+    stats = timings.phase_stats("modbus")
+    assert stats["samples"] == 10 and stats["count"] == 20
+    assert stats["max"] == 2.0 and stats["last"] == 2.0
+    assert stats["p50"] in (1.5, 1.6)
+    assert stats["p95"] == 2.0
+    assert timings.phase_stats("connect") is None
+    assert "connect" not in timings.as_dict()
+
+
+def test_config_entry_diagnostics_dump():
+    """Ensure diagnostics include timings and scheduler stats but no address."""
+    ble_module, diagnostics = _load_diagnostics_module()
+    scheduler = ble_module.RenogyConnectionScheduler()
+    service_cache = ble_module.RenogyGattServiceCache(MagicMock())
+    service_cache.async_set_identity("AA:BB:CC:DD:EE:FF", None, "RNG-CTRL-RVR40")
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+        connection_scheduler=scheduler,
+        service_cache=service_cache,
+    )
+    coordinator.data = {"battery_voltage": 13.2}
+    coordinator.poll_timings.record("total", 1.5)
+    coordinator.history.record({"battery_voltage": 13.2})
+
+    entry = MagicMock()
+    entry.entry_id = "entry-1"
+    entry.data = {"address": "AA:BB:CC:DD:EE:FF", "device_type": "controller"}
+    hass = MagicMock()
+    hass.data = {
+        "renogy": {
+            "entry-1": {"coordinator": coordinator},
+            "connection_scheduler": scheduler,
+            "service_cache": service_cache,
+        }
+    }
+
+    result = asyncio.run(diagnostics.async_get_config_entry_diagnostics(hass, entry))
+
+    assert result["entry"]["address"] == "**REDACTED**"
+    assert result["entry"]["device_type"] == "controller"
+    assert result["poll_timings"]["total"]["max"] == 1.5
+    assert result["data"] == {"battery_voltage": 13.2}
+    assert result["coordinator"]["device_type"] == "controller"
+    assert result["connection_scheduler"] == {}
+    assert result["operation_queue"]["depth"] == 0
+    assert result["presence"]["present"] is True
+    assert result["history"]["samples"][0]["battery_voltage"] == 13.2
+    assert result["gatt_services"]["model"] == "RNG-CTRL-RVR40"
+    assert result["gatt_service_cache"]["devices"] == 1
+    assert "AA:BB:CC:DD:EE:FF" not in repr(result)
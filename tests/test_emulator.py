@@ -0,0 +1,269 @@
+"""Tests for the emulated Renogy BLE devices."""
+
+import asyncio
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from tests.mocks.renogy_emulator import (
+    EMULATOR_COMMANDS,
+    EMULATOR_REGISTER_MAP,
+    EmulatorConditions,
+    RenogyDeviceEmulator,
+    RenogyEmulatorFleet,
+    build_read_request,
+    build_write_multiple_request,
+    build_write_request,
+    parse_response,
+)
+from tests.test_ble import _load_ble_module
+
+
+def _read(emulator, cmd_name):
+    function_code, register, count = EMULATOR_COMMANDS[emulator.device_type][cmd_name]
+    response = emulator.handle_request(
+        build_read_request(0xFF, function_code, register, count)
+    )
+    return parse_response(emulator.device_type, register, response)
+
+
+@pytest.mark.parametrize("device_type", ["controller", "dcc", "battery"])
+def test_emulator_round_trips_every_field(device_type):
+    """Ensure each command returns the values encoded in the register bank."""
+    emulator = RenogyDeviceEmulator(device_type)
+    parsed = {}
+    for cmd_name in EMULATOR_COMMANDS[device_type]:
+        parsed.update(_read(emulator, cmd_name))
+
+    expected = emulator.values()
+    command_registers = {
+        register for _fn, register, _count in EMULATOR_COMMANDS[device_type].values()
+    }
+    for key, info in EMULATOR_REGISTER_MAP[device_type].items():
+        if info["register"] in command_registers and key in parsed:
+            assert parsed[key] == pytest.approx(expected[key]), key
+    assert "model" in parsed and "device_id" in parsed
+
+
+def test_emulator_handles_writes_and_exceptions():
+    """Ensure writes update registers and bad addresses raise exceptions."""
+    emulator = RenogyDeviceEmulator("controller")
+
+    response = emulator.handle_request(build_write_request(0xFF, 0x010A, 0))
+    assert response == build_write_request(0xFF, 0x010A, 0)
+    assert _read(emulator, "pv")["load_status"] == "off"
+
+    response = emulator.handle_request(build_write_request(0xFF, 0x0100, 1))
+    assert response[1] == 0x86 and response[2] == 0x02
+
+    dcc = RenogyDeviceEmulator("dcc")
+    response = dcc.handle_request(
+        build_write_multiple_request(0xFF, 0xE006, [146, 144])
+    )
+    assert response[:6] == bytes([0xFF, 0x10, 0xE0, 0x06, 0x00, 0x02])
+    parameters = _read(dcc, "parameters")
+    assert parameters["charging_limit_voltage"] == pytest.approx(14.6)
+    assert parameters["equalization_voltage"] == pytest.approx(14.4)
+
+
+def test_emulator_drift_and_packet_loss():
+    """Ensure drift changes dynamic values and loss drops responses."""
+    emulator = RenogyDeviceEmulator(
+        "controller", conditions=EmulatorConditions(drift=0.2), seed=1
+    )
+    first = _read(emulator, "pv")["pv_power"]
+    readings = {_read(emulator, "pv")["pv_power"] for _ in range(5)}
+    assert readings - {first}
+    assert _read(emulator, "device_info")["model"] == "RNG-CTRL-RVR40"
+
+    lossy = RenogyDeviceEmulator(
+        "controller", conditions=EmulatorConditions(packet_loss=1.0)
+    )
+    assert lossy.handle_request(build_read_request(0xFF, 3, 256, 34)) is None
+    assert lossy.stats.lost_packets == 1
+
+
+def test_session_reads_and_writes_through_emulated_peer():
+    """Ensure the persistent session talks Modbus to the fake GATT peer."""
+    _load_ble_module()
+    session_module = sys.modules["custom_components.renogy.session"]
+    fleet = RenogyEmulatorFleet(seed=3)
+    (emulator,) = fleet.add("controller")
+    session_module.establish_connection = fleet.establish_connection_factory(
+        session_module.BleakError
+    )
+    session = session_module.RenogyBleSession(
+        MagicMock(), MagicMock(), commands=EMULATOR_COMMANDS
+    )
+    device = MagicMock(
+        address=emulator.address, device_type="controller", parsed_data={}
+    )
+    device.name = emulator.name
+    device.ble_device = emulator.ble_device()
+
+    def update_parsed_data(raw, register, cmd_name):
+        device.parsed_data.update(parse_response("controller", register, raw))
+        return True
+
+    device.update_parsed_data = update_parsed_data
+
+    async def _exercise():
+        read = await session.read_device(device)
+        written = await session.write_single_register(device, 0x010A, 0)
+        reread = await session.read_device(device)
+        return read, written, reread
+
+    read, written, reread = asyncio.run(_exercise())
+
+    assert read.success and written.success and reread.success
+    assert read.parsed_data["battery_voltage"] == pytest.approx(13.2)
+    assert reread.parsed_data["load_status"] == "off"
+    assert emulator.stats.connects == 1
+
+
+def test_coordinators_poll_an_emulated_fleet():
+    """Ensure many coordinators can poll emulated devices concurrently."""
+    ble_module = _load_ble_module()
+    fleet = RenogyEmulatorFleet(
+        conditions=EmulatorConditions(latency=0.001, disconnect_rate=0.05), seed=7
+    )
+    fleet.add("controller", 10)
+    fleet.add("battery", 5)
+    scheduler = ble_module.RenogyConnectionScheduler(max_connections=3)
+
+    coordinators = []
+    for emulator in fleet:
+        coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+            hass=MagicMock(),
+            logger=MagicMock(),
+            address=emulator.address,
+            device_type=emulator.device_type,
+            connection_scheduler=scheduler,
+        )
+        coordinator._ble_client = fleet.client(error_cls=ble_module.BleakError)
+        coordinators.append((coordinator, emulator))
+
+    async def _exercise():
+        return await asyncio.gather(
+            *(
+                coordinator._read_device_data(emulator.service_info())
+                for coordinator, emulator in coordinators
+            )
+        )
+
+    results = asyncio.run(_exercise())
+
+    assert sum(results) >= len(coordinators) - 3
+    for (coordinator, emulator), success in zip(coordinators, results):
+        if success:
+            assert coordinator.data["model"] == emulator.get_value("model")
+
+
+def test_battery_exposes_only_populated_cells():
+    """Ensure battery data only contains the configured cells and sensors."""
+    emulator = RenogyDeviceEmulator("battery")
+    parsed = _read(emulator, "cell_voltage_info")
+    parsed.update(_read(emulator, "battery_info"))
+
+    assert parsed["cell_count"] == 4
+    assert "cell_voltage_3" in parsed and "cell_voltage_4" not in parsed
+    assert parsed["soc"] == pytest.approx(82.5)
+    assert parsed["power"] == pytest.approx(-31.3)
+
+
+@pytest.mark.parametrize("persistent_session", [False, True])
+def test_coordinator_batches_contiguous_register_writes(persistent_session):
+    """Ensure writes within the window share frames and a single connection."""
+    ble_module = _load_ble_module()
+    session_module = sys.modules["custom_components.renogy.session"]
+    fleet = RenogyEmulatorFleet(seed=11)
+    (emulator,) = fleet.add("dcc")
+    session_module.establish_connection = fleet.establish_connection_factory(
+        session_module.BleakError
+    )
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address=emulator.address,
+        device_type="dcc",
+        persistent_session=persistent_session,
+    )
+    coordinator.write_batch_window = 0.01
+    coordinator.device = MagicMock(address=emulator.address, parsed_data={})
+    coordinator.device.name = emulator.name
+    coordinator.device.ble_device = emulator.ble_device()
+    coordinator.async_request_refresh = AsyncMock(return_value=True)
+    # A charge profile: 0xE005-0xE00E are contiguous, 0xE010 is not
+    profile = {0xE005 + offset: 140 + offset for offset in range(10)}
+    profile[0xE010] = 5
+
+    async def _exercise():
+        return await asyncio.gather(
+            *(
+                coordinator.async_write_register(register, value)
+                for register, value in profile.items()
+            )
+        )
+
+    results = asyncio.run(_exercise())
+
+    assert all(results)
+    assert emulator.stats.writes == 2
+    assert emulator.stats.connects == 1
+    assert dict(emulator.stats.written_registers) == profile
+    coordinator.async_request_refresh.assert_awaited_once()
+
+
+@pytest.mark.parametrize("persistent_session", [False, True])
+def test_write_reads_back_only_the_affected_command(persistent_session):
+    """Ensure a write re-reads its command block over the same connection."""
+    ble_module = _load_ble_module()
+    ble_module.renogy_ble_module.COMMANDS = EMULATOR_COMMANDS
+    session_module = sys.modules["custom_components.renogy.session"]
+    fleet = RenogyEmulatorFleet(seed=13)
+    (emulator,) = fleet.add("dcc")
+    session_module.establish_connection = fleet.establish_connection_factory(
+        session_module.BleakError
+    )
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address=emulator.address,
+        device_type="dcc",
+        persistent_session=persistent_session,
+    )
+    coordinator.write_batch_window = 0.01
+    device = MagicMock(address=emulator.address, device_type="dcc", parsed_data={})
+    device.name = emulator.name
+    device.ble_device = emulator.ble_device()
+
+    def update_parsed_data(raw, register, cmd_name):
+        device.parsed_data.update(parse_response("dcc", register, raw))
+        return True
+
+    device.update_parsed_data = update_parsed_data
+    coordinator.device = device
+    coordinator.data = {"charging_limit_voltage": 14.4, "battery_soc": 80}
+    coordinator.async_request_refresh = AsyncMock(return_value=True)
+    # Baseline for the change detection, as after a first poll
+    coordinator._async_notify_data_changes()
+    notified = []
+    coordinator.async_add_listener(
+        lambda: notified.append("limit"), ("charging_limit_voltage",)
+    )
+    coordinator.async_add_listener(lambda: notified.append("soc"), ("battery_soc",))
+    reads_before = emulator.stats.reads
+
+    assert asyncio.run(coordinator.async_write_register(0xE006, 146))
+
+    coordinator.async_request_refresh.assert_not_awaited()
+    # One connection for the write and the read of the "parameters" block
+    assert emulator.stats.connects == 1
+    assert emulator.stats.reads - reads_before == 1
+    assert emulator.stats.read_ranges[reads_before:] == [
+        EMULATOR_COMMANDS["dcc"]["parameters"][1:]
+    ]
+    assert coordinator.data["charging_limit_voltage"] == pytest.approx(14.6)
+    assert coordinator.data["battery_soc"] == 80
+    assert notified == ["limit"]
@@ -0,0 +1,88 @@
+"""Tests for the Renogy BLE sample export."""
+
+import asyncio
+import csv
+import json
+import sys
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+from tests.test_ble import _load_ble_module
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+def _hass(executor_jobs):
+    """Return a hass mock running executor jobs inline and counting them."""
+    hass = MagicMock()
+
+    async def _async_add_executor_job(func, *args):
+        executor_jobs.append(func)
+        return func(*args)
+
+    hass.async_add_executor_job = _async_add_executor_job
+    return hass
+
+
+def test_export_writes_queued_samples_in_one_batch(tmp_path):
+    """Ensure samples are only queued per poll and written on flush."""
+    _load_ble_module()
+    export_module = sys.modules["custom_components.renogy.export"]
+    records_module = sys.modules["custom_components.renogy.records"]
+    jobs = []
+    sink = export_module.RenogyExportSink(
+        _hass(jobs), ADDRESS, "jsonl", directory=str(tmp_path)
+    )
+    index = records_module.RenogyFieldIndex("controller", ("battery_voltage", "model"))
+
+    for voltage in (12.5, 12.6, 12.7):
+        sink.async_add(
+            records_module.RenogyDataRecord.from_mapping(
+                index, {"battery_voltage": voltage, "model": "RNG-CTRL-RVR40"}
+            )
+        )
+    assert jobs == [] and list(tmp_path.iterdir()) == []
+    assert sink.async_get_stats()["pending"] == 3
+
+    asyncio.run(sink.async_flush())
+    asyncio.run(sink.async_stop())
+
+    path = tmp_path / f"aabbccddeeff-{date.today().isoformat()}.jsonl"
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row["battery_voltage"] for row in rows] == [12.5, 12.6, 12.7]
+    assert rows[0]["address"] == ADDRESS and rows[0]["model"] == "RNG-CTRL-RVR40"
+    # One executor job for the batch, nothing left for the final flush
+    assert len(jobs) == 1
+    stats = sink.async_get_stats()
+    assert stats["written"] == 3 and stats["pending"] == 0
+
+
+def test_export_csv_keeps_its_header_and_prunes_old_files(tmp_path):
+    """Ensure CSV files keep the first header and expired files are deleted."""
+    _load_ble_module()
+    export_module = sys.modules["custom_components.renogy.export"]
+    today = date.today()
+    expired = tmp_path / f"aabbccddeeff-{(today - timedelta(days=3)).isoformat()}.csv"
+    kept = tmp_path / f"aabbccddeeff-{(today - timedelta(days=1)).isoformat()}.csv"
+    other_device = (
+        tmp_path / f"112233445566-{(today - timedelta(days=9)).isoformat()}.csv"
+    )
+    for path in (expired, kept, other_device):
+        path.write_text("timestamp\n")
+    sink = export_module.RenogyExportSink(
+        _hass([]), ADDRESS, "csv", retention_days=2, directory=str(tmp_path)
+    )
+
+    sink.async_add({"battery_voltage": 12.5, "pv_power": 100})
+    asyncio.run(sink.async_flush())
+    # Keys added later do not change the header of the file
+    sink.async_add({"battery_voltage": 12.6, "pv_power": 90, "load_power": 5})
+    asyncio.run(sink.async_flush())
+
+    path = tmp_path / f"aabbccddeeff-{today.isoformat()}.csv"
+    with open(path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert list(rows[0]) == ["timestamp", "address", "battery_voltage", "pv_power"]
+    assert [row["battery_voltage"] for row in rows] == ["12.5", "12.6"]
+    assert not expired.exists()
+    assert kept.exists() and other_device.exists()
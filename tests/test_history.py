@@ -0,0 +1,80 @@
+"""Tests for the Renogy BLE sample history."""
+
+import asyncio
+import math
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from tests.test_ble import _load_ble_module
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+def test_history_keeps_the_last_samples_in_fixed_columns():
+    """Ensure the ring buffer wraps around and keeps only numeric values."""
+    _load_ble_module()
+    history_module = sys.modules["custom_components.renogy.history"]
+    now = [100.0]
+    history = history_module.RenogySampleHistory(depth=3, clock=lambda: now[0])
+
+    for second, voltage in enumerate((12.5, 12.6, 12.7, 12.8)):
+        now[0] = 100.0 + second
+        sample = {"battery_voltage": voltage, "model": "RNG-CTRL-RVR40"}
+        if second == 3:
+            sample["pv_power"] = 120
+        history.record(sample)
+
+    samples = history.samples()
+    assert [sample["battery_voltage"] for sample in samples] == [12.6, 12.7, 12.8]
+    # Keys missing from a sample are left out, text values are not kept
+    assert "pv_power" not in samples[0]
+    assert samples[-1]["pv_power"] == 120
+    assert all("model" not in sample for sample in samples)
+    (recent,) = history.samples(keys=["pv_power"], seconds=0.5)
+    assert set(recent) == {"timestamp", "pv_power"} and recent["pv_power"] == 120
+    assert math.isnan(history._columns["pv_power"][1])
+
+    stats = history.async_get_stats()
+    assert stats["samples"] == 3 and stats["recorded"] == 4
+    assert stats["keys"] == ["battery_voltage", "pv_power"]
+    assert stats["bytes"] == 3 * 8 * 3
+
+
+def test_get_history_service_returns_the_samples_of_a_device():
+    """Ensure polls are recorded and returned by the get_history service."""
+    ble_module = _load_ble_module()
+    services_module = sys.modules["custom_components.renogy.services"]
+    hass = MagicMock()
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=hass, logger=MagicMock(), address=ADDRESS, history_depth=10
+    )
+    service_info = ble_module.BluetoothServiceInfoBleak(
+        address=ADDRESS, name="BT-TH-12345", rssi=-60
+    )
+
+    async def read_device(device):
+        device.parsed_data = {"battery_voltage": 12.8, "pv_power": 120}
+        return MagicMock(success=True, error=None)
+
+    coordinator._ble_client.read_device = read_device
+    asyncio.run(coordinator._read_device_data(service_info))
+
+    hass.data = {"renogy": {"entry-1": {"coordinator": coordinator}}}
+    device_registry = services_module.dr
+    device_registry.async_get.return_value.async_get.side_effect = lambda device_id: (
+        MagicMock(config_entries={"entry-1"}) if device_id == "device-1" else None
+    )
+    call = services_module.ServiceCall(
+        hass, "renogy", "get_history", {"device_id": "device-1", "keys": ["pv_power"]}
+    )
+
+    response = asyncio.run(services_module._async_get_history(call))
+
+    assert [sample["pv_power"] for sample in response["samples"]] == [120]
+    assert "battery_voltage" not in response["samples"][0]
+
+    call.data = {"device_id": "unknown"}
+    with pytest.raises(services_module.ServiceValidationError):
+        asyncio.run(services_module._async_get_history(call))
@@ -0,0 +1,75 @@
+"""Tests for the Renogy BLE device identity cache."""
+
+import asyncio
+import sys
+from unittest.mock import MagicMock
+
+from tests.mocks import ha_storage
+from tests.test_ble import _load_ble_module
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+def _coordinator(ble_module, identity_cache):
+    """Create a DCC coordinator using ``identity_cache``."""
+    return ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address=ADDRESS,
+        device_type="dcc",
+        identity_cache=identity_cache,
+    )
+
+
+def test_identity_is_learned_and_restored_without_a_poll():
+    """Ensure a restart gets the device name and model from the cache."""
+    ble_module = _load_ble_module()
+    ha_storage.STORAGE.clear()
+    identity_module = sys.modules["custom_components.renogy.identity"]
+    service_info = ble_module.BluetoothServiceInfoBleak(
+        address=ADDRESS, name="BT-TH-12345", rssi=-60
+    )
+
+    async def read_device(device):
+        device.parsed_data = {
+            "model": "RBC50D1S-G1",
+            "device_id": 97,
+            "firmware_version": "V1.2",
+        }
+        return MagicMock(success=True, error=None)
+
+    async def _exercise():
+        cache = identity_module.RenogyIdentityCache(MagicMock())
+        await cache.async_load()
+        coordinator = _coordinator(ble_module, cache)
+        coordinator._ble_client.read_device = read_device
+        assert await coordinator._read_device_data(service_info)
+
+        # Home Assistant restarted, nothing advertised or polled yet
+        restarted = identity_module.RenogyIdentityCache(MagicMock())
+        await restarted.async_load()
+        return restarted
+
+    restarted = asyncio.run(_exercise())
+
+    assert restarted.get(ADDRESS) == {
+        "name": "BT-TH-12345",
+        "model": "RBC50D1S-G1",
+        "device_id": 97,
+        "device_type": "dcc",
+        "firmware": "V1.2",
+    }
+
+    # Without a BLE device known to Home Assistant the identity can't be used
+    ble_module.bluetooth.async_ble_device_from_address.return_value = None
+    coordinator = _coordinator(ble_module, restarted)
+    assert not coordinator.async_restore_identity()
+    assert coordinator.device is None
+
+    ble_device = MagicMock(address=ADDRESS)
+    ble_device.name = None
+    ble_module.bluetooth.async_ble_device_from_address.return_value = ble_device
+    assert coordinator.async_restore_identity()
+    assert coordinator.device.name == "BT-TH-12345"
+    assert coordinator.device.parsed_data == {}
+    assert coordinator.data == {"model": "RBC50D1S-G1", "device_id": 97}
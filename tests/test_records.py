@@ -0,0 +1,111 @@
+"""Tests for the Renogy BLE data records."""
+
+import asyncio
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+from tests.test_ble import _load_ble_module
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+def test_record_is_an_immutable_mapping_with_stable_positions():
+    """Ensure records read like dicts and keep their field positions."""
+    _load_ble_module()
+    records = sys.modules["custom_components.renogy.records"]
+    index = records.RenogyFieldIndex("controller", ("battery_voltage", "pv_power"))
+    record = records.RenogyDataRecord.from_mapping(
+        index, {"pv_power": 120, "model": "RNG-CTRL-RVR40"}
+    )
+
+    assert record == {"pv_power": 120, "model": "RNG-CTRL-RVR40"}
+    assert "battery_voltage" not in record
+    assert record.get("battery_voltage", 0) == 0
+    assert len(record) == 2
+    # Unknown fields are appended, known ones keep their position
+    assert index.fields == ("battery_voltage", "pv_power", "model")
+    assert record.value_at(index.position("pv_power")) == 120
+    assert record.value_at(0) is None
+    assert not hasattr(record, "__dict__")
+
+    updated = record.replace({"battery_voltage": 12.8, "pv_power": 120})
+    assert record.get("battery_voltage") is None
+    assert updated.changed_keys(record) == {"battery_voltage"}
+    assert record.changed_keys(updated) == {"battery_voltage"}
+    assert updated.changed_keys({"pv_power": 0}) == {
+        "battery_voltage",
+        "pv_power",
+        "model",
+    }
+
+
+def test_value_plans_read_records_by_field_position(monkeypatch):
+    """Ensure plans resolve their fields once and read records by position."""
+    _load_ble_module()
+    records = sys.modules["custom_components.renogy.records"]
+    plans_module = sys.modules["custom_components.renogy.plans"]
+    index = records.RenogyFieldIndex("controller", ("battery_voltage",))
+    plans = plans_module.RenogyValuePlans()
+    voltage = plans.register(
+        plans_module.RenogyValuePlan("voltage", field="battery_voltage", numeric=True)
+    )
+    power = plans.register(
+        plans_module.RenogyValuePlan("power", field="pv_power", scale=0.5)
+    )
+
+    record = records.RenogyDataRecord.from_mapping(
+        index, {"battery_voltage": "12.8", "model": "RNG-CTRL-RVR40"}
+    )
+    plans.evaluate(record)
+    # Fields the device never reported get a position too
+    assert index.position("pv_power") is not None
+    assert plans.value(voltage) == 12.8
+    assert plans.value(power) is None
+
+    # The positions stay bound, no lookup by key is needed
+    updated = record.replace({"pv_power": 240})
+    monkeypatch.setattr(
+        records.RenogyDataRecord,
+        "get",
+        MagicMock(side_effect=AssertionError("read by key")),
+    )
+    plans.evaluate(updated, {"pv_power"})
+    assert plans.value(voltage) == 12.8
+    assert plans.value(power) == 120.0
+
+
+def test_coordinator_publishes_one_record_per_poll():
+    """Ensure a poll publishes one record, shared with listeners and snapshot."""
+    ble_module = _load_ble_module()
+    records = sys.modules["custom_components.renogy.records"]
+    snapshot = MagicMock()
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address=ADDRESS,
+        device_type="controller",
+        data_snapshot=snapshot,
+    )
+    service_info = ble_module.BluetoothServiceInfoBleak(
+        address=ADDRESS, name="BT-TH-12345", rssi=-60
+    )
+
+    async def read_device(device):
+        device.parsed_data = {"battery_voltage": 12.8, "pv_power": 120}
+        return MagicMock(success=True, error=None)
+
+    coordinator._ble_client.read_device = read_device
+    coordinator.device_data_callback = AsyncMock()
+
+    data = asyncio.run(coordinator._async_poll_device_data(service_info))
+
+    assert isinstance(data, records.RenogyDataRecord)
+    assert data is coordinator.data
+    assert data == {"battery_voltage": 12.8, "pv_power": 120}
+    snapshot.async_update.assert_called_once_with(data)
+    # The library keeps mutating its own dict, the published record doesn't move
+    coordinator.device.parsed_data["pv_power"] = 0
+    assert data["pv_power"] == 120
+
+    coordinator._async_notify_data_changes()
+    assert coordinator._notified_data is data
@@ -0,0 +1,125 @@
+"""Tests for the Renogy BLE connection scheduler."""
+
+import asyncio
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+from tests.test_ble import _FakeGattClient, _load_ble_module, _session_device
+
+
+def _load_scheduler_module():
+    """Load the scheduler module with stubs in place."""
+    _load_ble_module()
+    return sys.modules["custom_components.renogy.scheduler"]
+
+
+def test_scheduler_limits_concurrent_slots_per_adapter():
+    """Ensure no more than the configured slots are held on one adapter."""
+    scheduler_module = _load_scheduler_module()
+    scheduler = scheduler_module.RenogyConnectionScheduler(max_connections=2)
+    active = 0
+    peak = 0
+
+    async def _poll(address):
+        nonlocal active, peak
+        async with scheduler.async_slot("proxy-1", address):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    async def _exercise():
+        await asyncio.gather(*(_poll(f"AA:{i:02d}") for i in range(6)))
+
+    asyncio.run(_exercise())
+
+    stats = scheduler.async_get_stats()["proxy-1"]
+    assert peak == 2
+    assert stats["active"] == 0
+    assert stats["queued"] == 0
+    assert stats["total_slots"] == 6
+    assert stats["wait_time_max"] > 0
+
+
+def test_scheduler_serves_waiters_in_order_and_isolates_adapters():
+    """Ensure waiters are served FIFO and adapters do not block each other."""
+    scheduler_module = _load_scheduler_module()
+    scheduler = scheduler_module.RenogyConnectionScheduler()
+    scheduler.async_set_max_connections(1)
+    order = []
+
+    async def _poll(source, address):
+        async with scheduler.async_slot(source, address):
+            order.append(address)
+            await asyncio.sleep(0.01)
+
+    async def _exercise():
+        first = asyncio.create_task(_poll("hci0", "first"))
+        await asyncio.sleep(0)
+        await asyncio.gather(
+            first,
+            _poll("hci0", "second"),
+            _poll("hci0", "third"),
+            _poll("proxy-2", "other"),
+        )
+
+    asyncio.run(_exercise())
+
+    assert [address for address in order if address != "other"] == [
+        "first",
+        "second",
+        "third",
+    ]
+    assert order.index("other") < order.index("second")
+    assert scheduler.max_connections == 1
+
+
+def test_persistent_sessions_hold_their_slot_until_another_device_waits():
+    """Ensure open connections count against the limit and idle ones yield."""
+    ble_module = _load_ble_module()
+    session_module = sys.modules["custom_components.renogy.session"]
+    scheduler = ble_module.RenogyConnectionScheduler(max_connections=1)
+    hass = MagicMock()
+    hass.async_create_task = asyncio.ensure_future
+
+    def _coordinator(address):
+        coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+            hass=hass,
+            logger=MagicMock(),
+            address=address,
+            persistent_session=True,
+            connection_scheduler=scheduler,
+        )
+        coordinator.connection_source = "hci0"
+        return coordinator
+
+    first = _coordinator("AA:BB:CC:DD:EE:01")
+    second = _coordinator("AA:BB:CC:DD:EE:02")
+    session_module.establish_connection = AsyncMock(
+        side_effect=lambda *args, **kwargs: _FakeGattClient(session_module.modbus_crc)
+    )
+
+    async def _transaction(coordinator):
+        async with coordinator._async_connection_slot():
+            await coordinator._ble_client._async_ensure_connected(
+                _session_device(ble_module)
+            )
+            await coordinator._ble_client._async_end_transaction()
+
+    async def _exercise():
+        await _transaction(first)
+        # The open connection keeps its slot between transactions
+        held = dict(scheduler.async_get_stats()["hci0"])
+        await _transaction(first)
+        # Another device waiting closes the idle connection to get the slot
+        await asyncio.wait_for(_transaction(second), 1)
+        return held
+
+    held = asyncio.run(_exercise())
+
+    assert held["active"] == 1 and held["idle"] == 1
+    assert not first._ble_client.is_connected
+    assert first._held_slot_source is None
+    assert second._held_slot_source == "hci0"
+    stats = scheduler.async_get_stats()["hci0"]
+    assert stats["active"] == 1 and stats["total_slots"] == 2
@@ -1,5 +1,10 @@
 """Tests for Renogy sensor functionality."""
 
+import sys
+import types
+from datetime import datetime
+from enum import Enum
+from typing import Any, cast
 from unittest.mock import MagicMock
 
 import pytest
@@ -21,6 +26,153 @@ LOAD_STATUS = "load_status"
 CONTROLLER_TEMPERATURE = "controller_temperature"
 
 
+def _install_module_stubs() -> None:
+    """Install minimal Home Assistant module stubs to import the sensor module."""
+    from tests.mocks import ha_sensor, ha_services, ha_storage
+
+    sys.modules["homeassistant"] = cast(Any, types.ModuleType("homeassistant"))
+    sys.modules["homeassistant.components"] = cast(
+        Any, types.ModuleType("homeassistant.components")
+    )
+    sys.modules["homeassistant.components.bluetooth"] = cast(
+        Any, types.ModuleType("homeassistant.components.bluetooth")
+    )
+
+    passive_module = cast(
+        Any,
+        types.ModuleType(
+            "homeassistant.components.bluetooth.passive_update_coordinator"
+        ),
+    )
+
+    class PassiveBluetoothCoordinatorEntity:
+        """Stub PassiveBluetoothCoordinatorEntity for testing."""
+
+        def __init__(self, coordinator: Any, context: Any = None) -> None:
+            self.coordinator = coordinator
+            self.coordinator_context = context
+
+        @property
+        def name(self) -> Any:
+            return getattr(self, "_attr_name", None)
+
+        @property
+        def device_class(self) -> Any:
+            return self.entity_description.device_class
+
+        def async_write_ha_state(self) -> None:
+            """Record nothing, tests patch this when needed."""
+
+    passive_module.PassiveBluetoothCoordinatorEntity = PassiveBluetoothCoordinatorEntity
+    sys.modules["homeassistant.components.bluetooth.passive_update_coordinator"] = (
+        passive_module
+    )
+
+    sensor_module = cast(Any, types.ModuleType("homeassistant.components.sensor"))
+    sensor_module.SensorDeviceClass = ha_sensor.SensorDeviceClass
+    sensor_module.SensorEntityDescription = ha_sensor.SensorEntityDescription
+    sensor_module.SensorStateClass = ha_sensor.SensorStateClass
+
+    class SensorEntity:
+        """Stub SensorEntity for testing."""
+
+    sensor_module.SensorEntity = SensorEntity
+    sys.modules["homeassistant.components.sensor"] = sensor_module
+
+    config_entries_module = cast(Any, types.ModuleType("homeassistant.config_entries"))
+    config_entries_module.ConfigEntry = object
+    sys.modules["homeassistant.config_entries"] = config_entries_module
+
+    const_module = cast(Any, types.ModuleType("homeassistant.const"))
+    const_module.CONF_ADDRESS = "address"
+    const_module.PERCENTAGE = "%"
+
+    class Platform(str, Enum):
+        """Stub Platform enum for testing."""
+
+        SENSOR = "sensor"
+        NUMBER = "number"
+        SELECT = "select"
+        SWITCH = "switch"
+
+    class UnitOfElectricCurrent(str, Enum):
+        AMPERE = "A"
+
+    class UnitOfElectricPotential(str, Enum):
+        VOLT = "V"
+
+    class UnitOfEnergy(str, Enum):
+        KILO_WATT_HOUR = "kWh"
+        WATT_HOUR = "Wh"
+
+    class UnitOfPower(str, Enum):
+        WATT = "W"
+
+    class UnitOfTemperature(str, Enum):
+        CELSIUS = "°C"
+
+    class UnitOfTime(str, Enum):
+        MILLISECONDS = "ms"
+
+    const_module.Platform = Platform
+    const_module.UnitOfElectricCurrent = UnitOfElectricCurrent
+    const_module.UnitOfElectricPotential = UnitOfElectricPotential
+    const_module.UnitOfEnergy = UnitOfEnergy
+    const_module.UnitOfPower = UnitOfPower
+    const_module.UnitOfTemperature = UnitOfTemperature
+    const_module.UnitOfTime = UnitOfTime
+    sys.modules["homeassistant.const"] = const_module
+
+    core_module = cast(Any, types.ModuleType("homeassistant.core"))
+    core_module.HomeAssistant = object
+    core_module.callback = lambda func: func
+    ha_services.install(core_module)
+    sys.modules["homeassistant.core"] = core_module
+
+    sys.modules["homeassistant.helpers"] = cast(
+        Any, types.ModuleType("homeassistant.helpers")
+    )
+    device_registry_module = cast(
+        Any, types.ModuleType("homeassistant.helpers.device_registry")
+    )
+    device_registry_module.DeviceInfo = dict
+    device_registry_module.async_get = MagicMock()
+    sys.modules["homeassistant.helpers.device_registry"] = device_registry_module
+    sys.modules["homeassistant.helpers.storage"] = ha_storage
+    entity_registry_module = cast(
+        Any, types.ModuleType("homeassistant.helpers.entity_registry")
+    )
+    entity_registry_module.async_get = MagicMock()
+    sys.modules["homeassistant.helpers.entity_registry"] = entity_registry_module
+    entity_module = cast(Any, types.ModuleType("homeassistant.helpers.entity"))
+    entity_module.EntityCategory = ha_sensor.EntityCategory
+    sys.modules["homeassistant.helpers.entity"] = entity_module
+    entity_platform_module = cast(
+        Any, types.ModuleType("homeassistant.helpers.entity_platform")
+    )
+    entity_platform_module.AddEntitiesCallback = object
+    sys.modules["homeassistant.helpers.entity_platform"] = entity_platform_module
+    event_module = cast(Any, types.ModuleType("homeassistant.helpers.event"))
+    event_module.async_call_later = MagicMock()
+    sys.modules["homeassistant.helpers.event"] = event_module
+
+    ble_module = cast(Any, types.ModuleType("custom_components.renogy.ble"))
+    ble_module.RenogyActiveBluetoothCoordinator = object
+    ble_module.RenogyBLEDevice = object
+    sys.modules["custom_components.renogy.ble"] = ble_module
+
+
+def _load_sensor_module():
+    """Load the sensor module with stubs in place."""
+    _install_module_stubs()
+    sys.modules.pop("custom_components.renogy.sensor", None)
+    sys.modules.pop("custom_components.renogy", None)
+
+    import importlib
+
+    return importlib.import_module("custom_components.renogy.sensor")
+
+
 @pytest.fixture
 def mock_sensor_data():
     """Create mock sensor data."""
@@ -193,3 +345,317 @@ def test_load_status_mapping(mock_sensor_data):
         # In the actual code, this would use the mapping functions
         # We're just testing that the codes are recognized
         assert code in range(2)
+
+
+def test_sensor_skips_state_write_when_unchanged(mock_device, mock_coordinator):
+    """Ensure unchanged values do not trigger a new state write."""
+    sensor_module = _load_sensor_module()
+    description = next(
+        desc
+        for desc in sensor_module.BATTERY_SENSORS
+        if desc.key == sensor_module.KEY_BATTERY_VOLTAGE
+    )
+    mock_device.parsed_data = {BATTERY_VOLTAGE: 12.6}
+    mock_device.rssi = -60
+    mock_coordinator.device = mock_device
+    mock_coordinator.suppressed_state_writes = 0
+    sensor = sensor_module.RenogyBLESensor(
+        mock_coordinator, mock_device, description, device_type="controller"
+    )
+    sensor.async_write_ha_state = MagicMock()
+
+    sensor._handle_coordinator_update()
+    mock_device.rssi = -70
+    sensor._handle_coordinator_update()
+
+    assert sensor.async_write_ha_state.call_count == 1
+    assert sensor.suppressed_writes == 1
+    assert mock_coordinator.suppressed_state_writes == 1
+
+    mock_device.parsed_data[BATTERY_VOLTAGE] = 12.7
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
+    assert sensor.native_value == 12.7
+
+    mock_coordinator.last_update_success = False
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 3
+
+
+def test_poll_timing_sensors_report_phase_percentiles(mock_device, mock_coordinator):
+    """Ensure poll timing sensors expose the p95 and listen to every update."""
+    sensor_module = _load_sensor_module()
+    timing_module = sys.modules["custom_components.renogy.timing"]
+    mock_coordinator.poll_timings = timing_module.RenogyPollTimings()
+
+    entities = sensor_module.create_entities_helper(
+        mock_coordinator, mock_device, "controller"
+    )
+    timing_sensors = {
+        entity.entity_description.phase: entity
+        for entity in entities
+        if isinstance(entity, sensor_module.RenogyPollTimingSensor)
+    }
+    assert set(timing_sensors) == set(timing_module.POLL_PHASES)
+
+    sensor = timing_sensors["total"]
+    assert sensor.coordinator_context is None
+    assert sensor.entity_description.entity_registry_enabled_default
+    assert not timing_sensors[
+        "connect"
+    ].entity_description.entity_registry_enabled_default
+    assert not sensor.available
+
+    for duration in (0.1, 0.2, 0.3):
+        mock_coordinator.poll_timings.record("total", duration)
+
+    assert sensor.available
+    assert sensor.native_value == 300.0
+    attributes = sensor.extra_state_attributes
+    assert attributes["p50_ms"] == 200.0
+    assert attributes["max_ms"] == 300.0
+    assert attributes["samples"] == 3
+
+
+def test_poll_failures_sensor_reports_stale_data(mock_device, mock_coordinator):
+    """Ensure the failed polls sensor tells when the other values are stale."""
+    sensor_module = _load_sensor_module()
+    mock_coordinator.consecutive_failures = 0
+    mock_coordinator.is_stale = False
+    mock_coordinator.failing_since = None
+
+    entities = sensor_module.create_entities_helper(
+        mock_coordinator, mock_device, "controller"
+    )
+    (sensor,) = [
+        entity
+        for entity in entities
+        if isinstance(entity, sensor_module.RenogyPollFailuresSensor)
+    ]
+    assert sensor.coordinator_context is None
+    assert sensor.native_value == 0
+    assert sensor.extra_state_attributes["stale"] is False
+
+    mock_coordinator.consecutive_failures = 2
+    mock_coordinator.is_stale = True
+    mock_coordinator.failing_since = datetime(2026, 1, 1, 12, 0)
+    mock_coordinator.last_update_success = False
+
+    assert sensor.available
+    assert sensor.native_value == 2
+    attributes = sensor.extra_state_attributes
+    assert attributes["stale"] is True
+    assert attributes["failing_since"] == "2026-01-01T12:00:00"
+
+
+def test_battery_cell_sensors_follow_reported_counts(mock_device, mock_coordinator):
+    """Ensure cell and probe sensors exist only for what the battery reports."""
+    sensor_module = _load_sensor_module()
+    registry = MagicMock()
+    registry.async_get_entity_id.side_effect = lambda platform, domain, unique_id: (
+        f"sensor.{unique_id}"
+    )
+    sys.modules[
+        "homeassistant.helpers.entity_registry"
+    ].async_get.return_value = registry
+    mock_device.parsed_data = {"cell_count": 4, "sensor_count": 2}
+
+    entities = sensor_module.create_entities_helper(
+        mock_coordinator, mock_device, "battery"
+    )
+    keys = {entity.entity_description.key for entity in entities}
+    assert {f"cell_voltage_{index}" for index in range(4)} <= keys
+    assert "cell_voltage_4" not in keys
+    assert {"temperature_0", "temperature_1"} <= keys
+    assert "temperature_2" not in keys
+
+    added = []
+    manager = sensor_module.RenogyCountedSensorManager(
+        MagicMock(), mock_coordinator, entities, added.extend, "battery"
+    )
+
+    # No count in the data, for example a poll that skipped the cell registers
+    mock_device.parsed_data = {"voltage": 13.2}
+    manager.async_handle_update()
+    assert not added
+    registry.async_remove.assert_not_called()
+
+    # A bad read reporting zero cells and probes
+    mock_device.parsed_data = {"cell_count": 0, "sensor_count": 0}
+    manager.async_handle_update()
+    assert not added
+    registry.async_remove.assert_not_called()
+
+    # A swapped battery with more cells and a single probe: new sensors are
+    # added right away, missing ones only after a few polls in a row
+    mock_device.parsed_data = {"cell_count": 8, "sensor_count": 1}
+    manager.async_handle_update()
+    assert [entity.entity_description.key for entity in added] == [
+        f"cell_voltage_{index}" for index in range(4, 8)
+    ]
+    registry.async_remove.assert_not_called()
+
+    # A poll reporting the old count again starts over
+    mock_device.parsed_data = {"cell_count": 8, "sensor_count": 2}
+    manager.async_handle_update()
+    for _ in range(sensor_module.DEFAULT_COUNT_DECREASE_POLLS - 1):
+        mock_device.parsed_data = {"cell_count": 8, "sensor_count": 1}
+        manager.async_handle_update()
+    registry.async_remove.assert_not_called()
+
+    mock_device.parsed_data = {"cell_count": 8, "sensor_count": 1}
+    manager.async_handle_update()
+    registry.async_remove.assert_called_once_with(
+        "sensor.AA:BB:CC:DD:EE:FF_temperature_1"
+    )
+    assert sorted(manager.sensor_keys) == sorted(
+        [f"cell_voltage_{index}" for index in range(8)] + ["temperature_0"]
+    )
+
+
+def test_lower_counts_remove_sensors_through_coordinator_updates():
+    """Ensure a lower count that stays the same still removes its sensors."""
+    from tests.benchmark import load_integration
+
+    loaded = load_integration()
+    registry = MagicMock()
+    registry.async_get_entity_id.side_effect = lambda platform, domain, unique_id: (
+        f"sensor.{unique_id}"
+    )
+    loaded.sensor.er.async_get.return_value = registry
+    coordinator = loaded.ble.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address="AA:BB:CC:DD:EE:FF",
+        device_type="battery",
+    )
+    coordinator.data = {"cell_count": 4, "sensor_count": 2}
+    entities = loaded.sensor.create_entities_helper(coordinator, None, "battery")
+    manager = loaded.sensor.RenogyCountedSensorManager(
+        MagicMock(), coordinator, entities, MagicMock(), "battery"
+    )
+    unsubscribe = manager.async_listen()
+    coordinator._async_notify_data_changes()
+
+    # One probe less, reported the same on every poll
+    for _ in range(loaded.sensor.DEFAULT_COUNT_DECREASE_POLLS):
+        registry.async_remove.assert_not_called()
+        coordinator.data = {"cell_count": 4, "sensor_count": 1}
+        coordinator._async_notify_data_changes()
+
+    registry.async_remove.assert_called_once_with(
+        "sensor.AA:BB:CC:DD:EE:FF_temperature_1"
+    )
+    assert "temperature_1" not in manager.sensor_keys
+    unsubscribe()
+
+
+def test_sensors_read_the_values_evaluated_by_the_coordinator(mock_coordinator):
+    """Ensure sensors read their plan slot, evaluated once per update."""
+    sensor_module = _load_sensor_module()
+    plans_module = sys.modules["custom_components.renogy.plans"]
+    plans = mock_coordinator.value_plans = plans_module.RenogyValuePlans()
+
+    entities = {
+        entity.entity_description.key: entity
+        for entity in sensor_module.create_entities_helper(
+            mock_coordinator, None, "controller"
+        )
+    }
+    data = {
+        BATTERY_VOLTAGE: 12,
+        BATTERY_PERCENTAGE: 140,
+        PV_POWER: "n/a",
+        "power_generation_total": 12345,
+    }
+    mock_coordinator.data = data
+    plans.evaluate(data)
+
+    # Sensors created again reuse the plan and slot of their key
+    registered = len(plans)
+    sensor_module.create_entities_helper(mock_coordinator, None, "controller")
+    assert len(plans) == registered
+    assert plans.get(BATTERY_VOLTAGE) is entities[BATTERY_VOLTAGE]._value_plan
+    # Plans are compiled once at import and shared by every device
+    other = {
+        entity.entity_description.key: entity
+        for entity in sensor_module.create_entities_helper(
+            MagicMock(), None, "controller"
+        )
+    }
+    assert other[BATTERY_VOLTAGE]._value_plan is plans.get(BATTERY_VOLTAGE)
+
+    assert entities[BATTERY_VOLTAGE].native_value == 12.0
+    assert isinstance(entities[BATTERY_VOLTAGE].native_value, float)
+    assert entities["power_generation_total"].native_value == 12.345
+    # Outside the 0-100 % of a state of charge, or not a number at all
+    assert entities[BATTERY_PERCENTAGE].native_value is None
+    assert entities[PV_POWER].native_value is None
+
+    # Only plans of changed fields are evaluated again
+    updated = dict(data, **{BATTERY_VOLTAGE: 12.8, PV_POWER: 51})
+    mock_coordinator.data = updated
+    plans.evaluate(updated, {BATTERY_VOLTAGE})
+    for entity in entities.values():
+        entity._attr_native_value = None
+    assert entities[BATTERY_VOLTAGE].native_value == 12.8
+    assert entities[PV_POWER].native_value is None
+
+    # Data the coordinator did not evaluate is read directly
+    mock_coordinator.data = dict(updated)
+    entities[PV_POWER]._attr_native_value = None
+    assert entities[PV_POWER].native_value == 51.0
+
+
+def test_publishing_policy_holds_back_small_and_frequent_changes(
+    mock_device, mock_coordinator
+):
+    """Ensure deadbands, the min interval and the heartbeat shape state writes."""
+    sensor_module = _load_sensor_module()
+    publishing_module = sys.modules["custom_components.renogy.publishing"]
+    call_later = sys.modules["homeassistant.helpers.event"].async_call_later
+    mock_coordinator.publish_settings = publishing_module.RenogyPublishSettings(
+        deadband=True, min_interval=60, heartbeat=600
+    )
+    mock_coordinator.device = mock_device
+    mock_device.parsed_data = {BATTERY_VOLTAGE: 12.6}
+    description = next(
+        description
+        for description in sensor_module.BATTERY_SENSORS
+        if description.key == BATTERY_VOLTAGE
+    )
+    sensor = sensor_module.RenogyBLESensor(
+        mock_coordinator, mock_device, description, "Battery", "controller"
+    )
+    sensor.hass = MagicMock()
+    sensor.async_write_ha_state = MagicMock()
+
+    def _update(value):
+        mock_device.parsed_data[BATTERY_VOLTAGE] = value
+        sensor._handle_coordinator_update()
+
+    _update(12.6)
+    assert sensor.async_write_ha_state.call_count == 1
+    assert call_later.call_args.args[1] == 600  # heartbeat
+
+    # Jitter within the 0.1 V deadband of voltages is not written
+    _update(12.65)
+    assert sensor.async_write_ha_state.call_count == 1
+
+    # A real change waits for the min interval, then gets written
+    _update(12.9)
+    assert sensor.async_write_ha_state.call_count == 1
+    assert 59 < call_later.call_args.args[1] <= 60
+    call_later.call_args.args[2](None)
+    assert sensor.async_write_ha_state.call_count == 2
+    assert sensor._last_published_state[0] == 12.9
+
+    sensor._last_write_time -= 61
+    _update(13.5)
+    assert sensor.async_write_ha_state.call_count == 3
+
+    # Availability changes are written right away
+    mock_coordinator.last_update_success = False
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 4
+    assert sensor.suppressed_writes == 2
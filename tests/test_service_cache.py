@@ -0,0 +1,141 @@
+"""Tests for the Renogy BLE GATT service cache."""
+
+import asyncio
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+from tests.mocks import ha_storage
+from tests.test_ble import _FakeGattClient, _load_ble_module, _session_device
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+def _load_service_cache_module():
+    """Load the service cache module with stubs in place."""
+    _load_ble_module()
+    ha_storage.STORAGE.clear()
+    return sys.modules["custom_components.renogy.service_cache"]
+
+
+def _services():
+    """Return a resolved service collection with the Renogy characteristics."""
+    return [
+        MagicMock(
+            characteristics=[
+                MagicMock(uuid="read-char", handle=16),
+                MagicMock(uuid="write-char", handle=19),
+            ]
+        )
+    ]
+
+
+def test_service_cache_persists_identity_and_invalidations():
+    """Ensure identity changes invalidate services, also after a restart."""
+    cache_module = _load_service_cache_module()
+    services = _services()
+
+    async def _exercise():
+        cache = cache_module.RenogyGattServiceCache(MagicMock())
+        await cache.async_load()
+        cache.async_set_services(ADDRESS, services)
+        cache.async_set_identity(ADDRESS, "BT-TH-12345", "RNG-CTRL-RVR40")
+        assert cache.get_services(ADDRESS) is services
+
+        # After a restart only the record is known, services are resolved again
+        restarted = cache_module.RenogyGattServiceCache(MagicMock())
+        await restarted.async_load()
+        assert restarted.get_services(ADDRESS) is None
+        assert restarted.is_trusted(ADDRESS)
+        info = restarted.async_get_device_info(ADDRESS)
+        assert info["characteristics"] == {"read-char": 16, "write-char": 19}
+        assert info["model"] == "RNG-CTRL-RVR40"
+
+        # A different model means different firmware, don't trust the services
+        restarted.async_set_services(ADDRESS, services)
+        restarted.async_set_identity(ADDRESS, "BT-TH-12345", "RNG-CTRL-RVR60")
+        assert restarted.get_services(ADDRESS) is None
+
+        reloaded = cache_module.RenogyGattServiceCache(MagicMock())
+        await reloaded.async_load()
+        return restarted, reloaded
+
+    restarted, reloaded = asyncio.run(_exercise())
+
+    assert not reloaded.is_trusted(ADDRESS)
+    assert reloaded.async_get_device_info(ADDRESS)["model"] == "RNG-CTRL-RVR60"
+    assert restarted.async_get_stats()["invalidations"] == 1
+
+
+class _CachingGattClient(_FakeGattClient):
+    """Fake BLE client with resolved services and a backend cache."""
+
+    def __init__(self, crc, fail_writes=False):
+        super().__init__(crc)
+        self.services = _services()
+        self.clear_cache = AsyncMock(return_value=True)
+        self._fail_writes = fail_writes
+
+    async def write_gatt_char(self, uuid, request):
+        if self._fail_writes:
+            raise sys.modules["bleak"].BleakError("link lost")
+        await super().write_gatt_char(uuid, request)
+
+
+def test_session_reuses_cached_services_and_drops_them_on_failure():
+    """Ensure reconnects reuse services until a failure invalidates them."""
+    ble_module = _load_ble_module()
+    cache_module = _load_service_cache_module()
+    session_module = sys.modules["custom_components.renogy.session"]
+    crc = session_module.modbus_crc
+    clients = [
+        _CachingGattClient(crc),
+        _CachingGattClient(crc),
+        _CachingGattClient(crc, fail_writes=True),
+        _CachingGattClient(crc),
+    ]
+    connect_kwargs = []
+
+    async def establish_connection(
+        client_class,
+        device,
+        name,
+        disconnected_callback=None,
+        max_attempts=3,
+        cached_services=None,
+        use_services_cache=True,
+        **kwargs,
+    ):
+        connect_kwargs.append(
+            {
+                "cached_services": cached_services,
+                "use_services_cache": use_services_cache,
+            }
+        )
+        return clients[len(connect_kwargs) - 1]
+
+    session_module.establish_connection = establish_connection
+    cache = cache_module.RenogyGattServiceCache(MagicMock())
+    session = session_module.RenogyBleSession(
+        MagicMock(), MagicMock(), keep_alive=False, service_cache=cache
+    )
+    device = _session_device(ble_module)
+
+    async def _exercise():
+        first = await session.read_device(device)
+        second = await session.read_device(device)
+        # The third connection fails, the retry has to discover services again
+        third = await session.read_device(device)
+        return first, second, third
+
+    first, second, third = asyncio.run(_exercise())
+
+    assert first.success and second.success and third.success
+    assert connect_kwargs[0]["cached_services"] is None
+    assert connect_kwargs[1]["cached_services"] is clients[0].services
+    assert connect_kwargs[2]["cached_services"] is clients[1].services
+    assert connect_kwargs[3] == {"cached_services": None, "use_services_cache": False}
+    clients[2].clear_cache.assert_awaited_once()
+    # Fresh services are trusted again and every transaction disconnected
+    assert cache.is_trusted(ADDRESS)
+    assert cache.get_services(ADDRESS) is clients[3].services
+    assert not session.is_connected
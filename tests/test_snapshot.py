@@ -0,0 +1,85 @@
+"""Tests for the persisted Renogy BLE data snapshot."""
+
+import asyncio
+import sys
+from unittest.mock import MagicMock
+
+from tests.mocks import ha_storage
+from tests.test_ble import _load_ble_module
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+def _coordinator(ble_module, snapshot):
+    """Create a coordinator whose reads return a fixed battery voltage."""
+    coordinator = ble_module.RenogyActiveBluetoothCoordinator(
+        hass=MagicMock(),
+        logger=MagicMock(),
+        address=ADDRESS,
+        data_snapshot=snapshot,
+    )
+
+    async def read_device(device):
+        device.parsed_data = {"battery_voltage": 13.4, "model": "RNG-CTRL-RVR40"}
+        return MagicMock(success=True, error=None)
+
+    coordinator._ble_client.read_device = read_device
+    return coordinator
+
+
+def test_snapshot_restores_last_data_until_a_live_poll():
+    """Ensure the last polled data survives a restart, marked as restored."""
+    ble_module = _load_ble_module()
+    ha_storage.STORAGE.clear()
+    snapshot_module = sys.modules["custom_components.renogy.snapshot"]
+    service_info = ble_module.BluetoothServiceInfoBleak(
+        address=ADDRESS, name="BT-TH-12345", rssi=-60
+    )
+
+    async def _exercise():
+        snapshot = snapshot_module.RenogyDataSnapshot(MagicMock(), "entry-1")
+        assert await snapshot.async_load() is None
+        coordinator = _coordinator(ble_module, snapshot)
+        assert await coordinator._read_device_data(service_info)
+        # The polled record is kept without a copy and saved as a plain dict
+        assert snapshot._data is coordinator.data
+        assert type(ha_storage.STORAGE["renogy.entry-1.last_data"]["data"]) is dict
+
+        # Home Assistant restarted
+        restarted = snapshot_module.RenogyDataSnapshot(MagicMock(), "entry-1")
+        restored = await restarted.async_load()
+        assert restored is not None
+        coordinator = _coordinator(ble_module, restarted)
+        coordinator.async_restore_data(*restored)
+        seeded = (dict(coordinator.data), coordinator.is_restored, coordinator.is_stale)
+
+        assert await coordinator._read_device_data(service_info)
+        return restored, seeded, coordinator
+
+    restored, seeded, coordinator = asyncio.run(_exercise())
+
+    data, polled_at = restored
+    assert data == {"battery_voltage": 13.4, "model": "RNG-CTRL-RVR40"}
+    assert polled_at is not None
+    assert seeded == (data, True, True)
+    assert not coordinator.is_restored
+    assert not coordinator.is_stale
+
+
+def test_snapshot_ignores_invalid_data_and_is_removed_with_the_entry():
+    """Ensure a corrupt snapshot is ignored and removal deletes it."""
+    _load_ble_module()
+    ha_storage.STORAGE.clear()
+    snapshot_module = sys.modules["custom_components.renogy.snapshot"]
+    ha_storage.STORAGE["renogy.entry-1.last_data"] = {"saved_at": "x", "data": {}}
+
+    async def _exercise():
+        snapshot = snapshot_module.RenogyDataSnapshot(MagicMock(), "entry-1")
+        assert await snapshot.async_load() is None
+        snapshot.async_update({"battery_voltage": 12.9})
+        assert "renogy.entry-1.last_data" in ha_storage.STORAGE
+        await snapshot.async_remove()
+
+    asyncio.run(_exercise())
+
+    assert "renogy.entry-1.last_data" not in ha_storage.STORAGE
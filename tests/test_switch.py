@@ -8,11 +8,13 @@ import types
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, cast
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 
 def _install_module_stubs() -> None:
     """Install minimal Home Assistant module stubs to import the switch module."""
+    from tests.mocks import ha_storage
+
     homeassistant_module = cast(Any, types.ModuleType("homeassistant"))
     sys.modules["homeassistant"] = homeassistant_module
 
@@ -54,8 +56,9 @@ def _install_module_stubs() -> None:
     class PassiveBluetoothCoordinatorEntity:
         """Stub PassiveBluetoothCoordinatorEntity for testing."""
 
-        def __init__(self, coordinator: Any) -> None:
+        def __init__(self, coordinator: Any, context: Any = None) -> None:
             self.coordinator = coordinator
+            self.coordinator_context = context
 
     passive_module.PassiveBluetoothCoordinatorEntity = PassiveBluetoothCoordinatorEntity
     sys.modules["homeassistant.components.bluetooth.passive_update_coordinator"] = (
@@ -94,6 +97,7 @@ def _install_module_stubs() -> None:
     device_registry_module.DeviceInfo = DeviceInfo
     device_registry_module.async_get = MagicMock()
     sys.modules["homeassistant.helpers.device_registry"] = device_registry_module
+    sys.modules["homeassistant.helpers.storage"] = ha_storage
 
     entity_platform_module = cast(
         Any, types.ModuleType("homeassistant.helpers.entity_platform")
@@ -194,3 +198,25 @@ def test_switch_setup_adds_controller_switch() -> None:
     entities = async_add_entities.call_args[0][0]
     assert len(entities) == 1
     assert isinstance(entities[0], switch_module.RenogyLoadSwitch)
+
+
+def test_switch_setup_waits_for_coordinator_readiness() -> None:
+    """Ensure setup waits on the coordinator instead of sleeping."""
+    switch_module = _load_switch_module()
+    coordinator = MagicMock()
+    coordinator.device = None
+    coordinator.async_wait_ready = AsyncMock(return_value=False)
+
+    hass = MagicMock()
+    hass.data = {switch_module.DOMAIN: {"entry-1": {"coordinator": coordinator}}}
+    config_entry = MagicMock()
+    config_entry.entry_id = "entry-1"
+    config_entry.data = {
+        switch_module.CONF_DEVICE_TYPE: switch_module.DeviceType.CONTROLLER.value
+    }
+    async_add_entities = MagicMock()
+
+    asyncio.run(switch_module.async_setup_entry(hass, config_entry, async_add_entities))
+
+    coordinator.async_wait_ready.assert_awaited_once()
+    async_add_entities.assert_called_once()